@@ -38,6 +38,8 @@ comp_tasks = sa.Table(
         nullable=False,
         server_default=StateType.NOT_STARTED.value,
     ),
+    # number of predecessors that did not succeed yet, the task is ready when it reaches 0
+    sa.Column("remaining_dependencies", sa.Integer, nullable=True),
     # utc timestamps for submission/start/end
     sa.Column("submit", sa.DateTime),
     sa.Column("start", sa.DateTime),
@@ -137,3 +137,20 @@ async def test_listen_query(
         assert (
             tasks[n]["data"]["outputs"] == output
         ), f"the data received from the database is {tasks[n]}, expected new output is {output}"
+
+
+@pytest.mark.parametrize("task_class", [(NodeClass.COMPUTATIONAL)])
+async def test_remaining_dependencies_do_not_trigger(
+    db_notification_queue: asyncio.Queue,
+    db_connection: SAConnection,
+    task: Dict,
+):
+    await _update_comp_task_with(db_connection, task, remaining_dependencies=2)
+    result = await db_connection.execute(
+        comp_tasks.update()
+        .values(remaining_dependencies=comp_tasks.c.remaining_dependencies - 1)
+        .where(comp_tasks.c.task_id == task["task_id"])
+        .returning(comp_tasks.c.remaining_dependencies)
+    )
+    assert await result.scalar() == 1
+    await _assert_notification_queue_status(db_notification_queue, 0)
@@ -204,6 +204,26 @@ class S3Client:
 
         return ""
 
+    def create_presigned_upload_part_url(
+        self, bucket_name, object_name, upload_id, part_number, dt=timedelta(days=3)
+    ):
+        try:
+            return self.client.presigned_url(
+                "PUT",
+                bucket_name,
+                object_name,
+                expires=dt,
+                extra_query_params={
+                    "uploadId": upload_id,
+                    "partNumber": str(part_number),
+                },
+            )
+
+        except ResponseError as _err:
+            logging.exception("Could create presigned upload part url")
+
+        return ""
+
     def create_presigned_get_url(self, bucket_name, object_name, dt=timedelta(days=3)):
         try:
             return self.client.presigned_get_object(
@@ -1,6 +1,8 @@
 """Takes care of the configurations.
 """
 import os
+import tempfile
+from pathlib import Path
 from typing import Dict, Type
 
 # required configurations
@@ -18,6 +20,11 @@ POSTGRES_USER: str = os.environ.get("POSTGRES_USER", "simcore")
 # overridable required configurations
 STORE: str = os.environ.get("STORAGE_STORE_LOCATION_NAME", default="simcore.s3")
 BUCKET: str = os.environ.get("S3_BUCKET_NAME", default="simcore")
+# where the input files are downloaded to
+DOWNLOAD_FOLDER: str = os.environ.get(
+    "SIMCORE_NODE_PORTS_DOWNLOAD_FOLDER",
+    default=str(Path(tempfile.gettempdir(), "simcorefiles")),
+)
 
 
 # -------------------------------------------------------------------------
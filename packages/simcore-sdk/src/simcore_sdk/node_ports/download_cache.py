@@ -0,0 +1,159 @@
+""" Host-local cache of the files downloaded from the storage
+
+    - entries are content-addressed, i.e. keyed by the stored object and its ETag,
+      so a modified object is never served from the cache
+    - files are hard-linked in and out of the cache (copied only when the cache
+      is on another filesystem)
+    - bounded in size, the least recently used entries are evicted first
+    - the cache folder can be shared by several processes of the same host
+
+    NOTE: a hard-linked file shares its content with the cache entry and with the files
+    of the other tasks linked to it. The entries are read-only, yet a process that
+    may ignore the permissions (e.g. root in a container) can still modify them in place.
+    Such a modification is only detected on the next lookup of the entry.
+    NOTE: the cached files keep the modification time _CACHED_FILE_MTIME_NS (1970)
+"""
+import asyncio
+import errno
+import hashlib
+import logging
+import os
+import shutil
+import stat
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+log = logging.getLogger(__name__)
+
+# the cached files get this modification time, any later in-place modification of a
+# hard-linked copy (i.e. of the cached file itself) is detected and the entry dropped
+_CACHED_FILE_MTIME_NS = 0
+_CACHED_FILE_MODE = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def _now_ns() -> int:
+    return int(time.time() * 1e9)
+
+
+def link_or_copy(src: Path, dst: Path) -> bool:
+    """Hard-links src to dst, copies it if they are not on the same filesystem
+
+    :return: True if dst was hard-linked
+    """
+    try:
+        os.link(src, dst)
+        return True
+    except OSError as err:
+        if err.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+            raise
+    shutil.copy(str(src), str(dst))
+    return False
+
+
+class DownloadCache:
+    def __init__(self, folder: Path, max_size: int):
+        self.folder = Path(folder)
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.hit_bytes = 0
+
+    @staticmethod
+    def make_key(stored_object: str, e_tag: str) -> str:
+        return hashlib.sha256(f"{stored_object}:{e_tag}".encode("utf-8")).hexdigest()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_bytes": self.hit_bytes,
+        }
+
+    def _entry_path(self, key: str) -> Path:
+        return self.folder / key
+
+    def _entries(self) -> List[Tuple[Path, os.stat_result]]:
+        entries = []
+        for path in self.folder.iterdir():
+            if path.name.startswith("."):
+                continue
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                # evicted by another process
+                continue
+        return entries
+
+    def _get(self, key: str, file_path: Path) -> bool:
+        entry_path = self._entry_path(key)
+        try:
+            entry_stat = entry_path.stat()
+            if entry_stat.st_mtime_ns != _CACHED_FILE_MTIME_NS:
+                log.warning("Cached file %s was modified, dropping it", entry_path)
+                entry_path.unlink()
+                raise FileNotFoundError(entry_path)
+            if file_path.exists():
+                file_path.unlink()
+            link_or_copy(entry_path, file_path)
+            # the access time orders the entries for eviction
+            os.utime(entry_path, ns=(_now_ns(), _CACHED_FILE_MTIME_NS))
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+
+        self.hits += 1
+        self.hit_bytes += entry_stat.st_size
+        return True
+
+    def _put(self, key: str, file_path: Path) -> None:
+        self.folder.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(key)
+        # entries appear atomically to the other processes
+        tmp_entry_path = self.folder / f".{key}.{uuid.uuid4()}.tmp"
+        link_or_copy(file_path, tmp_entry_path)
+        # the entry is shared by all the tasks linked to it
+        os.chmod(tmp_entry_path, _CACHED_FILE_MODE)
+        os.utime(tmp_entry_path, ns=(_now_ns(), _CACHED_FILE_MTIME_NS))
+        tmp_entry_path.replace(entry_path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total_size = sum(entry_stat.st_size for _, entry_stat in entries)
+        for path, entry_stat in sorted(entries, key=lambda entry: entry[1].st_atime_ns):
+            if total_size <= self.max_size:
+                break
+            try:
+                path.unlink()
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total_size -= entry_stat.st_size
+
+    async def get(self, key: str, file_path: Path) -> bool:
+        """Creates file_path from the cached entry
+
+        :return: False if the entry is not in the cache
+        """
+        return await asyncio.get_event_loop().run_in_executor(
+            None, self._get, key, file_path
+        )
+
+    async def put(self, key: str, file_path: Path) -> None:
+        """ Adds the file to the cache and evicts the least recently used entries if it is too big """
+        try:
+            await asyncio.get_event_loop().run_in_executor(
+                None, self._put, key, file_path
+            )
+        except OSError:
+            # the download succeeded anyway
+            log.warning("Failed to cache %s", file_path, exc_info=True)
+
+
+__all__ = ["DownloadCache", "link_or_copy"]
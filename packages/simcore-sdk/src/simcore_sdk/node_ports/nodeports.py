@@ -2,9 +2,11 @@
     data going to following nodes
 
 """
+import asyncio
 import logging
+from collections import defaultdict
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from . import data_items_utils, dbmanager, exceptions, serialization
 from ._data_items_list import DataItemsList
@@ -60,6 +62,17 @@ class Nodeports:
         self.autoread = False
         self.autowrite = False
 
+        # serializes the reads/writes of the whole configuration in the DB
+        self._db_lock = asyncio.Lock()
+        # serializes the sets outside of a write batch and the write batches, since
+        # each of them reads and writes the whole configuration
+        self._config_lock = asyncio.Lock()
+        # serializes the sets of the same port within a write batch
+        self._port_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # in a write batch, the configuration is read once and written once at the end
+        self._batch_depth = 0
+        self._batch_modified = False
+
         log.debug(
             "Initialised Nodeports object with version %s, inputs %s and outputs %s",
             version,
@@ -95,7 +108,7 @@ class Nodeports:
     @property
     async def inputs(self) -> ItemsList:
         log.debug("Getting inputs with autoread: %s", self.autoread)
-        if self.autoread:
+        if self.autoread and not self._batch_depth:
             await self._update_from_json()
         return self._inputs
 
@@ -108,7 +121,7 @@ class Nodeports:
     @property
     async def outputs(self) -> ItemsList:
         log.debug("Getting outputs with autoread: %s", self.autoread)
-        if self.autoread:
+        if self.autoread and not self._batch_depth:
             await self._update_from_json()
         return self._outputs
 
@@ -127,44 +140,66 @@ class Nodeports:
         # if this fails it will raise an exception
         return await (await self.outputs)[item_key].get()
 
+    def _set_lock(self, item_key: str) -> asyncio.Lock:
+        return self._port_locks[item_key] if self._batch_depth else self._config_lock
+
     async def set(self, item_key: str, item_value):
-        try:
-            await (await self.inputs)[item_key].set(item_value)
-        except exceptions.UnboundPortError:
-            # not available try outputs
-            pass
-        # if this fails it will raise an exception
-        return await (await self.outputs)[item_key].set(item_value)
+        async with self._set_lock(item_key):
+            try:
+                await (await self.inputs)[item_key].set(item_value)
+            except exceptions.UnboundPortError:
+                # not available try outputs
+                pass
+            # if this fails it will raise an exception
+            return await (await self.outputs)[item_key].set(item_value)
 
     async def set_file_by_keymap(self, item_value: Path):
         for output in await self.outputs:
             if data_items_utils.is_file_type(output.type):
                 if output.fileToKeyMap:
                     if item_value.name in output.fileToKeyMap:
-                        await output.set(item_value)
+                        async with self._set_lock(output.key):
+                            await output.set(item_value)
                         return
         raise exceptions.PortNotFound(
             msg="output port for item {item} not found".format(item=str(item_value))
         )
 
+    def write_batch(self) -> "WriteBatch":
+        """ Concurrent sets within the batch are written to the DB once, when the batch ends
+
+            Outside of a batch, the sets through Nodeports are serialized since each
+            one reads and writes the whole configuration.
+
+            async with PORTS.write_batch():
+                await asyncio.gather(*[PORTS.set_file_by_keymap(f) for f in files])
+        """
+        return WriteBatch(self)
+
     async def _update_from_json(self):
         # pylint: disable=protected-access
         log.debug("Updating json configuration")
         if not self.db_mgr:
             raise exceptions.NodeportsException("db manager is not initialised")
-        upd_node = await serialization.create_from_json(self.db_mgr)
-        # copy from updated nodeports
-        self._copy_schemas_payloads(
-            upd_node._input_schemas,
-            upd_node._output_schemas,
-            upd_node._inputs_payloads,
-            upd_node._outputs_payloads,
-        )
+        async with self._db_lock:
+            upd_node = await serialization.create_from_json(self.db_mgr)
+            # copy from updated nodeports
+            self._copy_schemas_payloads(
+                upd_node._input_schemas,
+                upd_node._output_schemas,
+                upd_node._inputs_payloads,
+                upd_node._outputs_payloads,
+            )
         log.debug("Updated json configuration")
 
     async def _save_to_json(self):
+        if self._batch_depth:
+            log.debug("Deferring saving Nodeports object to the end of the batch")
+            self._batch_modified = True
+            return
         log.info("Saving Nodeports object to json")
-        await serialization.save_to_json(self)
+        async with self._db_lock:
+            await serialization.save_to_json(self)
 
     async def _get_node_from_node_uuid(self, node_uuid: str):
         if not self.db_mgr:
@@ -172,6 +207,46 @@ class Nodeports:
         return await serialization.create_nodeports_from_uuid(self.db_mgr, node_uuid)
 
 
+class WriteBatch:
+    """ The configuration is read once when entering the batch and not re-read until
+        it ends, so that concurrent sets do not overwrite each other.
+        Nested batches are written when the outermost one ends.
+
+        NOTE: only the sets through the Nodeports object are guarded, setting an item
+        obtained before the batch started is not.
+    """
+
+    def __init__(self, nodeports: Nodeports):
+        self._nodeports = nodeports
+
+    async def __aenter__(self) -> Nodeports:
+        # pylint: disable=protected-access
+        if not self._nodeports._batch_depth:
+            # waits for the sets outside of a batch
+            await self._nodeports._config_lock.acquire()
+            try:
+                if self._nodeports.autoread:
+                    await self._nodeports._update_from_json()
+            except Exception:
+                self._nodeports._config_lock.release()
+                raise
+        self._nodeports._batch_depth += 1
+        return self._nodeports
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # pylint: disable=protected-access
+        self._nodeports._batch_depth -= 1
+        if self._nodeports._batch_depth:
+            return
+        try:
+            if self._nodeports._batch_modified:
+                # also saves what was set before a failure
+                self._nodeports._batch_modified = False
+                await self._nodeports._save_to_json()
+        finally:
+            self._nodeports._config_lock.release()
+
+
 async def ports(db_manager: Optional[dbmanager.DBManager] = None) -> Nodeports:
     # FIXME: warning every dbmanager create a new db engine!
     if db_manager is None:  # NOTE: keeps backwards compatibility
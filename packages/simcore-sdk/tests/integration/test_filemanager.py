@@ -4,6 +4,8 @@
 # pylint:disable=too-many-arguments
 
 import filecmp
+import os
+import time
 from pathlib import Path
 
 import pytest
@@ -106,3 +108,71 @@ async def test_invalid_store(
         await filemanager.download_file_from_s3(
             store_name=store, s3_object=file_id, local_folder=download_folder
         )
+
+
+@pytest.mark.parametrize(
+    "file_size",
+    [
+        pytest.param(filemanager.MULTIPART_THRESHOLD, id="single_transfer"),
+        pytest.param(3 * filemanager.MULTIPART_THRESHOLD + 1, id="multipart_transfer"),
+    ],
+)
+async def test_upload_download_throughput(
+    tmpdir, bucket, filemanager_cfg, user_id, file_uuid, s3_simcore_location, file_size
+):
+    file_path = Path(tmpdir) / "big_file.bin"
+    with file_path.open("wb") as fp:
+        for _ in range(file_size // (1024 * 1024)):
+            fp.write(os.urandom(1024 * 1024))
+        fp.write(os.urandom(file_size % (1024 * 1024)))
+    assert file_path.stat().st_size == file_size
+
+    file_id = file_uuid(file_path)
+    store = s3_simcore_location
+    start = time.perf_counter()
+    await filemanager.upload_file(
+        store_id=store, s3_object=file_id, local_file_path=file_path
+    )
+    upload_time = time.perf_counter() - start
+
+    download_folder = Path(tmpdir) / "downloads"
+    start = time.perf_counter()
+    download_file_path = await filemanager.download_file_from_s3(
+        store_id=store, s3_object=file_id, local_folder=download_folder
+    )
+    download_time = time.perf_counter() - start
+
+    assert filecmp.cmp(download_file_path, file_path, shallow=False)
+    size_mb = file_size / (1024 * 1024)
+    print(
+        f"\n{size_mb:.0f}MB uploaded at {size_mb / upload_time:.1f}MB/s, "
+        f"downloaded at {size_mb / download_time:.1f}MB/s"
+    )
+
+
+async def test_get_download_links(
+    tmpdir, bucket, filemanager_cfg, user_id, file_uuid, s3_simcore_location
+):
+    store = s3_simcore_location
+    file_ids = {}
+    for n in range(3):
+        file_path = Path(tmpdir) / f"test{n}.test"
+        file_path.write_text(f"I am test file {n}")
+        file_id = file_uuid(file_path)
+        file_ids[file_id] = file_path
+        await filemanager.upload_file(
+            store_id=store, s3_object=file_id, local_file_path=file_path
+        )
+
+    links = await filemanager.get_download_links(
+        store_id=store, s3_objects=list(file_ids.keys())
+    )
+    assert set(links.keys()) == set(file_ids.keys())
+
+    download_folder = Path(tmpdir) / "downloads"
+    download_folder.mkdir()
+    for file_id, file_path in file_ids.items():
+        download_file_path = await filemanager.download_file_from_link(
+            links[file_id], download_folder
+        )
+        assert filecmp.cmp(download_file_path, file_path)
@@ -0,0 +1,99 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from yarl import URL
+
+from simcore_sdk.node_ports import filemanager
+from simcore_sdk.node_ports.download_cache import DownloadCache
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> DownloadCache:
+    return DownloadCache(tmp_path / "cache", max_size=100)
+
+
+def _create_file(folder: Path, name: str, size: int) -> Path:
+    folder.mkdir(parents=True, exist_ok=True)
+    file_path = folder / name
+    file_path.write_bytes(b"x" * size)
+    return file_path
+
+
+async def test_files_are_hard_linked(loop, cache: DownloadCache, tmp_path: Path):
+    key = cache.make_key("0/some/file.txt", '"etag"')
+    assert not await cache.get(key, tmp_path / "file.txt")
+
+    downloaded_file = _create_file(tmp_path / "downloads", "file.txt", 10)
+    await cache.put(key, downloaded_file)
+
+    task_file = tmp_path / "task" / "file.txt"
+    task_file.parent.mkdir()
+    assert await cache.get(key, task_file)
+    assert task_file.read_bytes() == b"x" * 10
+    assert task_file.stat().st_ino == downloaded_file.stat().st_ino
+    # the shared file cannot be modified by the tasks
+    assert task_file.stat().st_mode & 0o777 == 0o444
+    assert cache.stats == {"hits": 1, "misses": 1, "evictions": 0, "hit_bytes": 10}
+
+    # another version of the file is another entry
+    assert not await cache.get(cache.make_key("0/some/file.txt", '"other"'), task_file)
+
+
+async def test_modified_entry_is_dropped(loop, cache: DownloadCache, tmp_path: Path):
+    key = cache.make_key("0/some/file.txt", '"etag"')
+    downloaded_file = _create_file(tmp_path / "downloads", "file.txt", 10)
+    await cache.put(key, downloaded_file)
+
+    # e.g. a service running as root modifying its input file in place
+    downloaded_file.chmod(0o644)
+    with downloaded_file.open("ab") as fp:
+        fp.write(b"modified")
+
+    assert not await cache.get(key, tmp_path / "file.txt")
+    assert not (cache.folder / key).exists()
+
+
+async def test_lru_eviction(loop, cache: DownloadCache, tmp_path: Path):
+    keys = [cache.make_key(f"0/file{n}", '"etag"') for n in range(3)]
+    for n, key in enumerate(keys[:2]):
+        await cache.put(key, _create_file(tmp_path / "downloads", f"file{n}", 40))
+    # file0 becomes the most recently used
+    assert await cache.get(keys[0], tmp_path / "file0")
+
+    await cache.put(keys[2], _create_file(tmp_path / "downloads", "file2", 40))
+
+    assert (cache.folder / keys[0]).exists()
+    assert not (cache.folder / keys[1]).exists()
+    assert (cache.folder / keys[2]).exists()
+    assert cache.evictions == 1
+
+
+async def test_download_served_from_cache(
+    loop, aiohttp_server, cache: DownloadCache, tmp_path: Path
+):
+    async def get_file(request: web.Request):
+        return web.Response(body=b"some content", headers={"ETag": '"some_etag"'})
+
+    app = web.Application()
+    app.router.add_get("/some_file.bin", get_file)
+    server = await aiohttp_server(app)
+    url = URL(str(server.make_url("/some_file.bin")))
+
+    filemanager.set_download_cache(cache)
+    try:
+        for n in range(2):
+            file_path = await filemanager.download_file_from_link(
+                url, tmp_path / f"task{n}", cached_object="0/some_file.bin"
+            )
+            assert file_path.read_bytes() == b"some content"
+    finally:
+        filemanager.set_download_cache(None)
+        await filemanager.close_shared_clients()
+
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
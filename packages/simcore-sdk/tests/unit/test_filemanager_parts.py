@@ -0,0 +1,103 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+import os
+import re
+from pathlib import Path
+
+import pytest
+import tenacity
+from aiohttp import web
+from yarl import URL
+
+from simcore_sdk.node_ports import exceptions, filemanager
+
+PART_SIZE = 1024
+FILE_SIZE = 10 * PART_SIZE + 10
+
+
+@pytest.fixture
+def small_parts(monkeypatch):
+    monkeypatch.setattr(filemanager, "MULTIPART_THRESHOLD", PART_SIZE)
+    monkeypatch.setattr(filemanager, "DOWNLOAD_PART_SIZE", PART_SIZE)
+    monkeypatch.setattr(filemanager, "WRITE_BUFFER_SIZE", 100)
+    monkeypatch.setattr(
+        filemanager._download_range_to_file.retry, "wait", tenacity.wait_none()
+    )
+
+
+@pytest.fixture
+def content() -> bytes:
+    return os.urandom(FILE_SIZE)
+
+
+@pytest.fixture
+async def file_server(loop, aiohttp_server, content: bytes):
+    server_state = {"requested_ranges": [], "failing_range_start": None}
+
+    async def get_file(request: web.Request):
+        headers = {"Accept-Ranges": "bytes", "ETag": '"some_etag"'}
+        match = re.match(r"bytes=(\d+)-(\d+)", request.headers.get("Range", ""))
+        if not match:
+            return web.Response(body=content, headers=headers)
+
+        start, end = int(match.group(1)), int(match.group(2))
+        server_state["requested_ranges"].append(start)
+        if start == server_state["failing_range_start"]:
+            raise web.HTTPServiceUnavailable()
+        return web.Response(status=206, body=content[start : end + 1], headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/some_file.bin", get_file)
+    server = await aiohttp_server(app)
+    server.state = server_state
+    return server
+
+
+async def test_download_in_parts(
+    small_parts, file_server, content: bytes, tmp_path: Path
+):
+    file_path = await filemanager.download_file_from_link(
+        URL(str(file_server.make_url("/some_file.bin"))), tmp_path
+    )
+
+    assert file_path.read_bytes() == content
+    assert len(file_server.state["requested_ranges"]) == 11
+    assert not list(tmp_path.glob("*.part"))
+    assert not list(tmp_path.glob("*.progress"))
+
+
+async def test_download_in_parts_resumes(
+    small_parts, file_server, content: bytes, tmp_path: Path
+):
+    url = URL(str(file_server.make_url("/some_file.bin")))
+    file_server.state["failing_range_start"] = 3 * PART_SIZE
+    with pytest.raises(exceptions.TransferError):
+        await filemanager.download_file_from_link(url, tmp_path)
+    assert (tmp_path / "some_file.bin.progress").exists()
+
+    # only the missing part is downloaded again
+    file_server.state["failing_range_start"] = None
+    file_server.state["requested_ranges"].clear()
+    file_path = await filemanager.download_file_from_link(url, tmp_path)
+
+    assert file_path.read_bytes() == content
+    assert file_server.state["requested_ranges"] == [3 * PART_SIZE]
+
+
+@pytest.mark.parametrize("in_parts", [False, True])
+async def test_downloaded_file_is_not_executable(
+    request, in_parts: bool, file_server, content: bytes, tmp_path: Path
+):
+    if in_parts:
+        request.getfixturevalue("small_parts")
+    file_path = await filemanager.download_file_from_link(
+        URL(str(file_server.make_url("/some_file.bin"))), tmp_path
+    )
+
+    assert file_path.read_bytes() == content
+    # same permissions as a file created with open(..., "wb")
+    umask = os.umask(0)
+    os.umask(umask)
+    assert file_path.stat().st_mode & 0o777 == 0o644 & ~umask
@@ -0,0 +1,51 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+from types import SimpleNamespace
+
+import pytest
+
+from simcore_sdk.node_ports import config, filemanager
+
+
+@pytest.fixture
+async def shared_clients(loop):
+    yield
+    await filemanager.close_shared_clients()
+
+
+async def test_shared_clients_are_reused(shared_clients, monkeypatch):
+    session, client = filemanager._get_shared_clients()
+    assert filemanager._get_shared_clients() == (session, client)
+    async with filemanager.ClientSessionContextManager() as active_session:
+        assert active_session is session
+    assert not session.closed
+
+    # another storage gets its own clients
+    monkeypatch.setattr(config, "STORAGE_ENDPOINT", "another_storage:8080")
+    other_session, other_client = filemanager._get_shared_clients()
+    assert other_session is not session
+    assert other_client.configuration.host == "http://another_storage:8080/v0"
+
+    await filemanager.close_shared_clients()
+    assert other_session.closed
+
+
+async def test_location_ids_are_cached(shared_clients):
+    num_calls = 0
+
+    class FakeUsersApi:
+        async def get_storage_locations(self, user_id):
+            nonlocal num_calls
+            num_calls += 1
+            return SimpleNamespace(
+                data=[{"name": "simcore.s3", "id": 0}, {"name": "datcore", "id": 1}],
+                error=None,
+            )
+
+    filemanager._get_shared_clients()
+    api = FakeUsersApi()
+    assert await filemanager._get_location_id_from_location_name("datcore", api) == 1
+    assert await filemanager._get_location_id_from_location_name("simcore.s3", api) == 0
+    assert num_calls == 1
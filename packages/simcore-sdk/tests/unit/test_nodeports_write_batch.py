@@ -0,0 +1,97 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+import asyncio
+import json
+from typing import Dict
+
+import pytest
+
+from simcore_sdk.node_ports import serialization
+
+NUMBER_OF_PORTS = 10
+
+
+class FakeDBManager:
+    def __init__(self, configuration: Dict):
+        self.configuration = configuration
+        self.num_writes = 0
+
+    async def get_ports_configuration_from_node_uuid(self, node_uuid: str) -> str:
+        await asyncio.sleep(0)
+        return json.dumps(self.configuration)
+
+    async def write_ports_configuration(self, json_configuration: str, node_uuid: str):
+        await asyncio.sleep(0)
+        self.num_writes += 1
+        self.configuration = json.loads(json_configuration)
+
+
+@pytest.fixture
+def db_manager() -> FakeDBManager:
+    return FakeDBManager(
+        {
+            "version": "0.1",
+            "schema": {
+                "inputs": {},
+                "outputs": {
+                    f"out_{n}": {
+                        "label": "an output",
+                        "description": "an integer output",
+                        "type": "integer",
+                        "displayOrder": n,
+                    }
+                    for n in range(NUMBER_OF_PORTS)
+                },
+            },
+            "inputs": {},
+            "outputs": {},
+        }
+    )
+
+
+async def test_concurrent_sets_in_write_batch(loop, db_manager: FakeDBManager):
+    PORTS = await serialization.create_from_json(
+        db_manager, auto_read=True, auto_write=True
+    )
+
+    async with PORTS.write_batch():
+        await asyncio.gather(
+            *[PORTS.set(f"out_{n}", n) for n in range(NUMBER_OF_PORTS)]
+        )
+        assert db_manager.num_writes == 0
+
+    # all values are written at once
+    assert db_manager.num_writes == 1
+    assert db_manager.configuration["outputs"] == {
+        f"out_{n}": n for n in range(NUMBER_OF_PORTS)
+    }
+
+
+async def test_write_batch_saves_on_error(loop, db_manager: FakeDBManager):
+    PORTS = await serialization.create_from_json(
+        db_manager, auto_read=True, auto_write=True
+    )
+
+    with pytest.raises(ValueError):
+        async with PORTS.write_batch():
+            await PORTS.set("out_0", 42)
+            raise ValueError("some output could not be uploaded")
+
+    assert db_manager.num_writes == 1
+    assert db_manager.configuration["outputs"] == {"out_0": 42}
+
+
+async def test_concurrent_sets_outside_write_batch(loop, db_manager: FakeDBManager):
+    PORTS = await serialization.create_from_json(
+        db_manager, auto_read=True, auto_write=True
+    )
+
+    await asyncio.gather(*[PORTS.set(f"out_{n}", n) for n in range(NUMBER_OF_PORTS)])
+
+    # each set is written, none is lost
+    assert db_manager.num_writes == NUMBER_OF_PORTS
+    assert db_manager.configuration["outputs"] == {
+        f"out_{n}": n for n in range(NUMBER_OF_PORTS)
+    }
@@ -0,0 +1,7 @@
+from fastapi.requests import Request
+
+from ...services.registry_cache import RegistryServicesCache
+
+
+def get_registry_cache(request: Request) -> RegistryServicesCache:
+    return request.app.state.registry_cache
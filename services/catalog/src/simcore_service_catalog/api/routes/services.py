@@ -1,9 +1,11 @@
+import hashlib
+import json
 import logging
 import urllib.parse
-from typing import List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
-# FIXME: too many DB calls
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
 from models_library.services import (
     KEY_RE,
     VERSION_RE,
@@ -11,29 +13,40 @@ from models_library.services import (
     ServiceMetaDataAtDB,
     ServiceType,
 )
-from pydantic import ValidationError, constr
+from pydantic import constr
 from pydantic.types import PositiveInt
 
 from ...db.repositories.groups import GroupsRepository
 from ...db.repositories.services import ServicesRepository
 from ...models.schemas.services import ServiceOut, ServiceUpdate
-from ...services.frontend_services import get_services as get_frontend_services
+from ...services.registry_cache import RegistryServicesCache
 from ..dependencies.database import get_repository
 from ..dependencies.director import DirectorApi, get_director_api
+from ..dependencies.registry_cache import get_registry_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _compute_etag(*args) -> str:
+    digest = hashlib.sha1(
+        json.dumps(jsonable_encoder(args), sort_keys=True).encode()
+    ).hexdigest()
+    return f'"{digest}"'
+
+
 @router.get("", response_model=List[ServiceOut])
 async def list_services(
     # pylint: disable=too-many-arguments
     user_id: PositiveInt,
+    response: Response,
     details: Optional[bool] = True,
     director_client: DirectorApi = Depends(get_director_api),
     groups_repository: GroupsRepository = Depends(get_repository(GroupsRepository)),
     services_repo: ServicesRepository = Depends(get_repository(ServicesRepository)),
     x_simcore_products_name: str = Header(...),
+    registry_cache: RegistryServicesCache = Depends(get_registry_cache),
+    if_none_match: Optional[str] = Header(None),
 ):
     # get user groups
     user_groups = await groups_repository.list_user_groups(user_id)
@@ -43,25 +56,21 @@ async def list_services(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You have unsufficient rights to access the services",
         )
-    # now get the executable services
-    executable_services: Set[Tuple[str, str]] = {
-        (service.key, service.version)
-        for service in await services_repo.list_services(
-            gids=[group.gid for group in user_groups],
-            execute_access=True,
-            product_name=x_simcore_products_name,
-        )
-    }
-    # get the writable services
-    _services = await services_repo.list_services(
+    # now get the executable and writable services, with their metadata
+    services_in_db: Dict[Tuple[str, str], ServiceMetaDataAtDB] = {}
+    for service in await services_repo.list_services(
+        gids=[group.gid for group in user_groups],
+        execute_access=True,
+        product_name=x_simcore_products_name,
+    ):
+        services_in_db[(service.key, service.version)] = service
+    for service in await services_repo.list_services(
         gids=[group.gid for group in user_groups],
         write_access=True,
         product_name=x_simcore_products_name,
-    )
-    writable_services: Set[Tuple[str, str]] = {
-        (service.key, service.version) for service in _services
-    }
-    visible_services = executable_services | writable_services
+    ):
+        services_in_db[(service.key, service.version)] = service
+    visible_services: Set[Tuple[str, str]] = set(services_in_db.keys())
     if not details:
         # only return a stripped down version
         services = [
@@ -80,57 +89,62 @@ async def list_services(
         ]
         return services
 
-    # get the services from the registry and filter them out
-    frontend_services = [s.dict(by_alias=True) for s in get_frontend_services()]
-    registry_services = await director_client.get("/services")
-    data = frontend_services + registry_services
-    services: List[ServiceOut] = []
-    for x in data:
-        try:
-            service = ServiceOut.parse_obj(x)
+    # get the access rights and the owners of all visible services at once
+    services_access_rights: Dict[
+        Tuple[str, str], List[ServiceAccessRightsAtDB]
+    ] = await services_repo.list_services_access_rights(
+        visible_services, product_name=x_simcore_products_name
+    )
+    services_owner_emails: Dict[
+        int, Optional[str]
+    ] = await groups_repository.list_user_emails_from_gids(
+        {s.owner for s in services_in_db.values() if s.owner}
+    )
 
-            if not (service.key, service.version) in visible_services:
-                # no access to that service
-                continue
+    # the response only changes with the registry and the db entries of the visible services
+    registry_services: Dict[
+        Tuple[str, str], ServiceOut
+    ] = await registry_cache.get_services(director_client)
+    etag = _compute_etag(
+        registry_cache.etag,
+        x_simcore_products_name,
+        [services_in_db[key_version] for key_version in sorted(services_in_db)],
+        [
+            sorted(services_access_rights[key_version], key=lambda r: r.gid)
+            for key_version in sorted(services_in_db)
+        ],
+        services_owner_emails,
+    )
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
 
-            # we have write access for that service, fill in the service rights
-            access_rights: List[
-                ServiceAccessRightsAtDB
-            ] = await services_repo.get_service_access_rights(
-                service.key, service.version, product_name=x_simcore_products_name
-            )
-            service.access_rights = {rights.gid: rights for rights in access_rights}
+    # filter out the services in the registry
+    services: List[ServiceOut] = []
+    for key, version in sorted(services_in_db):
+        service_in_db: ServiceMetaDataAtDB = services_in_db[(key, version)]
+        service: Optional[ServiceOut] = registry_services.get((key, version))
+        if not service:
+            # not in the registry (or has invalid fields)
+            continue
 
-            # access is allowed, override some of the values with what is in the db
-            service_in_db: Optional[
-                ServiceMetaDataAtDB
-            ] = await services_repo.get_service(service.key, service.version)
-            if not service_in_db:
-                logger.error(
-                    "The service %s:%s is not in the database",
-                    service.key,
-                    service.version,
-                )
-                continue
-            service = service.copy(
-                update=service_in_db.dict(exclude_unset=True, exclude={"owner"})
-            )
-            # the owner shall be converted to an email address
-            if service_in_db.owner:
-                service.owner = await groups_repository.get_user_email_from_gid(
-                    service_in_db.owner
-                )
+        # access is allowed, override some of the values with what is in the db
+        service = service.copy(
+            update=service_in_db.dict(exclude_unset=True, exclude={"owner"})
+        )
+        # we have write access for that service, fill in the service rights
+        access_rights: List[ServiceAccessRightsAtDB] = services_access_rights[
+            (key, version)
+        ]
+        service.access_rights = {rights.gid: rights for rights in access_rights}
 
-            services.append(service)
+        # the owner shall be converted to an email address
+        if service_in_db.owner:
+            service.owner = services_owner_emails.get(service_in_db.owner)
 
-        # services = parse_obj_as(List[ServiceOut], data) this does not work since if one service has an issue it fails
-        except ValidationError as exc:
-            logger.warning(
-                "skip service %s:%s that has invalid fields\n%s",
-                x["key"],
-                x["version"],
-                exc,
-            )
+        services.append(service)
 
     return services
 
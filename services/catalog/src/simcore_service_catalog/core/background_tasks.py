@@ -1,7 +1,7 @@
 """This background task does the following:
 1. gets the full list of services from the docker registry through the director
-2. gets the same list from the DB
-3. if services are missing from the DB, they are added with basic access rights
+2. gets the same list from the DB (only once, then the services added to the DB are tracked)
+3. if services are missing from the DB, they are added in bulk with basic access rights
 3.a. basic access rights are set as following:
     1. writable access allow the user to change meta data as well as access rights
     2. executable access allow the user to see/execute the service
@@ -23,14 +23,13 @@ from models_library.services import (
     ServiceDockerData,
     ServiceMetaDataAtDB,
 )
-from pydantic import ValidationError
 from pydantic.types import PositiveInt
 
 from ..api.dependencies.director import get_director_api
 from ..db.repositories.groups import GroupsRepository
 from ..db.repositories.projects import ProjectsRepository
 from ..db.repositories.services import ServicesRepository
-from ..services.frontend_services import get_services as get_frontend_services
+from ..services.registry_cache import RegistryServicesCache
 
 logger = logging.getLogger(__name__)
 
@@ -43,25 +42,9 @@ OLD_SERVICES_DATE: datetime = datetime(2020, 8, 19)
 async def _list_registry_services(
     app: FastAPI,
 ) -> Dict[Tuple[ServiceKey, ServiceVersion], ServiceDockerData]:
-    client = get_director_api(app)
-    data = await client.get("/services")
-    services: Dict[Tuple[ServiceKey, ServiceVersion], ServiceDockerData] = {
-        (s.key, s.version): s for s in get_frontend_services()
-    }
-    for x in data:
-        try:
-            service_data = ServiceDockerData.parse_obj(x)
-            services[(service_data.key, service_data.version)] = service_data
-        # services = parse_obj_as(List[ServiceDockerData], data)
-        except ValidationError as exc:
-            logger.warning(
-                "skip service %s:%s that has invalid fields\n%s",
-                x["key"],
-                x["version"],
-                exc,
-            )
-
-    return services
+    # refreshes the cache used by the API with the latest listing of the registry
+    registry_cache: RegistryServicesCache = app.state.registry_cache
+    return await registry_cache.refresh(get_director_api(app))
 
 
 async def _list_db_services(
@@ -74,48 +57,51 @@ async def _list_db_services(
     }
 
 
-async def _create_service_default_access_rights(
-    app: FastAPI, service: ServiceDockerData, connection: SAConnection
+async def _is_old_service(app: FastAPI, service: ServiceDockerData) -> bool:
+    # get service build date
+    client = get_director_api(app)
+    data = await client.get(
+        f"/service_extras/{quote_plus(service.key)}/{service.version}"
+    )
+    if not data or "build_date" not in data:
+        return True
+
+    logger.debug("retrieved service extras are %s", data)
+
+    service_build_data = datetime.strptime(data["build_date"], "%Y-%m-%dT%H:%M:%SZ")
+    return service_build_data < OLD_SERVICES_DATE
+
+
+def _is_frontend_service(service: ServiceDockerData) -> bool:
+    return "/frontend/" in service.key
+
+
+def _get_possible_owner_emails(service: ServiceDockerData) -> List[str]:
+    return [service.contact] + [author.email for author in service.authors]
+
+
+def _create_service_default_access_rights(
+    app: FastAPI,
+    service: ServiceDockerData,
+    is_old_service: bool,
+    everyone_gid: PositiveInt,
+    gids_from_emails: Dict[str, PositiveInt],
 ) -> Tuple[Optional[PositiveInt], List[ServiceAccessRightsAtDB]]:
     """Rationale as of 19.08.2020: all services that were put in oSparc before today
     will be visible to everyone.
     The services afterwards will be visible ONLY to his/her owner.
     """
-
-    async def _is_old_service(app: FastAPI, service: ServiceDockerData) -> bool:
-        # get service build date
-        client = get_director_api(app)
-        data = await client.get(
-            f"/service_extras/{quote_plus(service.key)}/{service.version}"
-        )
-        if not data or "build_date" not in data:
-            return True
-
-        logger.debug("retrieved service extras are %s", data)
-
-        service_build_data = datetime.strptime(data["build_date"], "%Y-%m-%dT%H:%M:%SZ")
-        return service_build_data < OLD_SERVICES_DATE
-
-    groups_repo = GroupsRepository(connection)
-    everyone_gid = (await groups_repo.get_everyone_group()).gid
     owner_gid = None
     reader_gids: List[PositiveInt] = []
 
-    def _is_frontend_service(service: ServiceDockerData) -> bool:
-        return "/frontend/" in service.key
-
-    if _is_frontend_service(service) or await _is_old_service(app, service):
+    if _is_frontend_service(service) or is_old_service:
         logger.debug("service %s:%s is old or frontend", service.key, service.version)
         # let's make that one available to everyone
         reader_gids.append(everyone_gid)
 
     # try to find the owner
-    possible_owner_email = [service.contact] + [
-        author.email for author in service.authors
-    ]
-
-    for user_email in possible_owner_email:
-        possible_gid = await groups_repo.get_user_gid_from_email(user_email)
+    for user_email in _get_possible_owner_emails(service):
+        possible_gid = gids_from_emails.get(user_email)
         if possible_gid:
             if not owner_gid:
                 owner_gid = possible_gid
@@ -146,30 +132,64 @@ async def _create_services_in_db(
     service_keys: Set[Tuple[ServiceKey, ServiceVersion]],
     services: Dict[Tuple[ServiceKey, ServiceVersion], ServiceDockerData],
 ) -> None:
+    new_services: List[ServiceDockerData] = [
+        services[key_version] for key_version in sorted(service_keys)
+    ]
 
-    services_repo = ServicesRepository(connection)
-    for service_key, service_version in service_keys:
-        service: ServiceDockerData = services[(service_key, service_version)]
+    # the build dates are requested to the director with bounded concurrency
+    semaphore = asyncio.Semaphore(app.state.settings.background_task_max_concurrency)
+
+    async def _is_old_service_bounded(service: ServiceDockerData) -> bool:
+        if _is_frontend_service(service):
+            return False
+        async with semaphore:
+            return await _is_old_service(app, service)
+
+    are_old_services: List[bool] = await asyncio.gather(
+        *[_is_old_service_bounded(service) for service in new_services]
+    )
+
+    groups_repo = GroupsRepository(connection)
+    everyone_gid = (await groups_repo.get_everyone_group()).gid
+    gids_from_emails: Dict[
+        str, PositiveInt
+    ] = await groups_repo.list_user_gids_from_emails(
+        {
+            email
+            for service in new_services
+            for email in _get_possible_owner_emails(service)
+        }
+    )
+
+    new_services_in_db: List[ServiceMetaDataAtDB] = []
+    new_services_access_rights: List[ServiceAccessRightsAtDB] = []
+    for service, is_old_service in zip(new_services, are_old_services):
         # find the service owner
-        owner_gid, service_access_rights = await _create_service_default_access_rights(
-            app, service, connection
+        owner_gid, service_access_rights = _create_service_default_access_rights(
+            app, service, is_old_service, everyone_gid, gids_from_emails
         )
-        # set the service in the DB
-        await services_repo.create_service(
-            ServiceMetaDataAtDB(**service.dict(), owner=owner_gid),
-            service_access_rights,
+        new_services_in_db.append(
+            ServiceMetaDataAtDB(
+                **service.dict(include=set(ServiceDockerData.__fields__)),
+                owner=owner_gid,
+            )
         )
+        new_services_access_rights.extend(service_access_rights)
+
+    # set the services in the DB
+    services_repo = ServicesRepository(connection)
+    await services_repo.create_services(new_services_in_db, new_services_access_rights)
 
 
 async def _ensure_registry_insync_with_db(
-    app: FastAPI, connection: SAConnection
+    app: FastAPI,
+    connection: SAConnection,
+    services_in_db: Set[Tuple[ServiceKey, ServiceVersion]],
 ) -> None:
+    """ services_in_db are the services known to be in the db, it is updated with the new ones """
     services_in_registry: Dict[
         Tuple[ServiceKey, ServiceVersion], ServiceDockerData
     ] = await _list_registry_services(app)
-    services_in_db: Set[Tuple[ServiceKey, ServiceVersion]] = await _list_db_services(
-        connection
-    )
 
     # check that the db has all the services at least once
     missing_services_in_db = set(services_in_registry.keys()) - services_in_db
@@ -182,6 +202,7 @@ async def _ensure_registry_insync_with_db(
         await _create_services_in_db(
             app, connection, missing_services_in_db, services_in_registry
         )
+        services_in_db.update(missing_services_in_db)
 
 
 async def _ensure_published_templates_accessible(
@@ -229,13 +250,17 @@ async def sync_registry_task(app: FastAPI) -> None:
     # get list of services from director
     default_product: str = app.state.settings.access_rights_default_product_name
     engine: Engine = app.state.engine
+    # services known to be in the db, only the new ones in the registry are processed
+    services_in_db: Optional[Set[Tuple[ServiceKey, ServiceVersion]]] = None
     while True:
         try:
             async with engine.acquire() as conn:
                 logger.debug("syncing services between registry and database...")
+                if services_in_db is None:
+                    services_in_db = await _list_db_services(conn)
 
                 # check that the list of services is in sync with the registry
-                await _ensure_registry_insync_with_db(app, conn)
+                await _ensure_registry_insync_with_db(app, conn, services_in_db)
 
                 # check that the published services are available to everyone
                 # (templates are published to GUESTs, so their services must be also accessible)
@@ -250,6 +275,8 @@ async def sync_registry_task(app: FastAPI) -> None:
 
         except Exception:  # pylint: disable=broad-except
             logger.exception("Error while processing services entry")
+            # the db is listed again in the next cycle
+            services_in_db = None
             # wait a bit before retrying, so it does not block everything until the director is up
             await asyncio.sleep(app.state.settings.background_task_wait_after_failure)
 
@@ -103,7 +103,11 @@ class AppSettings(BaseSettings):
     # BACKGROUND TASK
     background_task_rest_time: PositiveInt = 60
     background_task_wait_after_failure: PositiveInt = 5  # secs
+    background_task_max_concurrency: PositiveInt = 10
     access_rights_default_product_name: str = "osparc"
 
+    # REGISTRY CACHE
+    registry_cache_ttl: PositiveInt = 180  # secs
+
     class Config(_CommonConfig):
         env_prefix = ""
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 import sqlalchemy as sa
 from aiopg.sa.result import RowProxy
@@ -39,6 +39,21 @@ class GroupsRepository(BaseRepository):
             sa.select([users.c.primary_gid]).where(users.c.email == user_email)
         )
 
+    async def list_user_gids_from_emails(
+        self, user_emails: Iterable[EmailStr]
+    ) -> Dict[EmailStr, PositiveInt]:
+        user_emails = list(user_emails)
+        if not user_emails:
+            return {}
+        return {
+            row.email: row.primary_gid
+            async for row in self.connection.execute(
+                sa.select([users.c.email, users.c.primary_gid]).where(
+                    users.c.email.in_(user_emails)
+                )
+            )
+        }
+
     async def get_gid_from_affiliation(self, affiliation: str) -> Optional[PositiveInt]:
         return await self.connection.scalar(
             sa.select([groups.c.gid]).where(groups.c.name == affiliation)
@@ -48,3 +63,18 @@ class GroupsRepository(BaseRepository):
         return await self.connection.scalar(
             sa.select([users.c.email]).where(users.c.primary_gid == gid)
         )
+
+    async def list_user_emails_from_gids(
+        self, gids: Iterable[PositiveInt]
+    ) -> Dict[PositiveInt, Optional[EmailStr]]:
+        service_owners = {gid: None for gid in gids}
+        if not service_owners:
+            return service_owners
+
+        async for row in self.connection.execute(
+            sa.select([users.c.primary_gid, users.c.email]).where(
+                users.c.primary_gid.in_(service_owners.keys())
+            )
+        ):
+            service_owners[row.primary_gid] = row.email
+        return service_owners
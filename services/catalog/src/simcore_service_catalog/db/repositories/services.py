@@ -1,11 +1,12 @@
 import logging
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import sqlalchemy as sa
 from aiopg.sa.result import RowProxy
 from models_library.services import ServiceAccessRightsAtDB, ServiceMetaDataAtDB
 from psycopg2.errors import ForeignKeyViolation  # pylint: disable=no-name-in-module
-from sqlalchemy import literal_column
+from sqlalchemy import literal_column, tuple_
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql import and_, or_
 
@@ -14,6 +15,9 @@ from ._base import BaseRepository
 
 logger = logging.getLogger(__name__)
 
+# maximum number of rows per INSERT statement in bulk operations
+BULK_INSERT_CHUNK_SIZE = 500
+
 
 class ServicesRepository(BaseRepository):
     async def list_services(
@@ -111,6 +115,36 @@ class ServicesRepository(BaseRepository):
             await self.connection.execute(insert_stmt)
         return created_service
 
+    async def create_services(
+        self,
+        new_services: List[ServiceMetaDataAtDB],
+        new_services_access_rights: List[ServiceAccessRightsAtDB],
+        chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+    ) -> None:
+        """Bulk version of create_service, services already in the db are left untouched
+
+        Rows are written in a single transaction with chunked multi-row INSERT statements
+        """
+        if not new_services:
+            return
+        services_rows = [service.dict(by_alias=True) for service in new_services]
+        access_rights_rows = [
+            rights.dict(by_alias=True) for rights in new_services_access_rights
+        ]
+        async with self.connection.begin():
+            for i in range(0, len(services_rows), chunk_size):
+                await self.connection.execute(
+                    insert(services_meta_data)
+                    .values(services_rows[i : i + chunk_size])
+                    .on_conflict_do_nothing()
+                )
+            for i in range(0, len(access_rights_rows), chunk_size):
+                await self.connection.execute(
+                    insert(services_access_rights)
+                    .values(access_rights_rows[i : i + chunk_size])
+                    .on_conflict_do_nothing()
+                )
+
     async def update_service(
         self, patched_service: ServiceMetaDataAtDB
     ) -> ServiceMetaDataAtDB:
@@ -147,6 +181,30 @@ class ServicesRepository(BaseRepository):
                 services_in_db.append(ServiceAccessRightsAtDB(**row))
         return services_in_db
 
+    async def list_services_access_rights(
+        self,
+        key_versions: Iterable[Tuple[str, str]],
+        product_name: Optional[str] = None,
+    ) -> Dict[Tuple[str, str], List[ServiceAccessRightsAtDB]]:
+        """ Batch version of get_service_access_rights """
+        service_to_access_rights = defaultdict(list)
+        key_versions = list(key_versions)
+        if not key_versions:
+            return service_to_access_rights
+
+        query = sa.select([services_access_rights]).where(
+            tuple_(services_access_rights.c.key, services_access_rights.c.version).in_(
+                key_versions
+            )
+        )
+        if product_name:
+            query = query.where(services_access_rights.c.product_name == product_name)
+        async for row in self.connection.execute(query):
+            service_to_access_rights[(row.key, row.version)].append(
+                ServiceAccessRightsAtDB(**row)
+            )
+        return service_to_access_rights
+
     async def upsert_service_access_rights(
         self, new_access_rights: List[ServiceAccessRightsAtDB]
     ) -> None:
@@ -0,0 +1,122 @@
+""" In-process cache of the services listed in the docker registry
+
+    Keeps the validated ServiceOut of every (key, version) so that the registry listing
+    is not parsed again on every request. It is refreshed by the background sync task
+    and only the entries that changed in the registry are validated again.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from pydantic import ValidationError
+
+from ..models.schemas.services import ServiceOut
+from .director import DirectorApi
+from .frontend_services import get_services as get_frontend_services
+
+logger = logging.getLogger(__name__)
+
+ServiceKey = str
+ServiceVersion = str
+
+
+class RegistryServicesCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.etag: Optional[str] = None
+        self._frontend_services: Dict[Tuple[ServiceKey, ServiceVersion], ServiceOut] = {
+            (s.key, s.version): ServiceOut.parse_obj(s.dict(by_alias=True))
+            for s in get_frontend_services()
+        }
+        self._raw_services: Dict[Tuple[ServiceKey, ServiceVersion], Dict] = {}
+        self._services: Dict[Tuple[ServiceKey, ServiceVersion], ServiceOut] = dict(
+            self._frontend_services
+        )
+        self._updated_at: Optional[float] = None
+        # NOTE: created on first use, i.e. within the running event loop
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def is_expired(self) -> bool:
+        return (
+            self._updated_at is None or (time.monotonic() - self._updated_at) > self.ttl
+        )
+
+    @property
+    def services(self) -> Dict[Tuple[ServiceKey, ServiceVersion], ServiceOut]:
+        """ frontend and registry services. NOTE: the returned objects are shared, copy them before modifying """
+        return self._services
+
+    def update(self, registry_services: List[Dict]) -> None:
+        """ Replaces the cached services with the listing of the registry, only new or changed entries are validated """
+        raw_services: Dict[Tuple[ServiceKey, ServiceVersion], Dict] = {}
+        services: Dict[Tuple[ServiceKey, ServiceVersion], ServiceOut] = dict(
+            self._frontend_services
+        )
+        num_validated = 0
+        for x in registry_services:
+            key_version = (x.get("key"), x.get("version"))
+            if (
+                key_version in self._services
+                and self._raw_services.get(key_version) == x
+            ):
+                raw_services[key_version] = x
+                services[key_version] = self._services[key_version]
+                continue
+            try:
+                services[key_version] = ServiceOut.parse_obj(x)
+                raw_services[key_version] = x
+                num_validated += 1
+            # services = parse_obj_as(List[ServiceOut], data) this does not work since if one service has an issue it fails
+            except ValidationError as exc:
+                logger.warning(
+                    "skip service %s:%s that has invalid fields\n%s",
+                    x.get("key"),
+                    x.get("version"),
+                    exc,
+                )
+
+        self._raw_services = raw_services
+        self._services = services
+        self._updated_at = time.monotonic()
+        self.etag = hashlib.sha1(
+            json.dumps(
+                sorted(raw_services.values(), key=lambda s: (s["key"], s["version"])),
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+        logger.debug(
+            "registry cache updated with %d services, %d validated",
+            len(services),
+            num_validated,
+        )
+
+    async def refresh(
+        self, director_api: DirectorApi
+    ) -> Dict[Tuple[ServiceKey, ServiceVersion], ServiceOut]:
+        """ Lists the services in the registry and updates the cache """
+        self.update(await director_api.get("/services"))
+        return self.services
+
+    async def get_services(
+        self, director_api: DirectorApi
+    ) -> Dict[Tuple[ServiceKey, ServiceVersion], ServiceOut]:
+        """ Returns the cached services, the registry is only listed if the cache expired """
+        if self.is_expired:
+            if self._refresh_lock is None:
+                self._refresh_lock = asyncio.Lock()
+            async with self._refresh_lock:
+                # the requests waiting for a refresh reuse its result
+                if self.is_expired:
+                    return await self.refresh(director_api)
+        return self.services
+
+
+def setup_registry_cache(app: FastAPI) -> None:
+    app.state.registry_cache = RegistryServicesCache(
+        ttl=app.state.settings.registry_cache_ttl
+    )
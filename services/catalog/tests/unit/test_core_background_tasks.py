@@ -0,0 +1,73 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+from types import SimpleNamespace
+
+import pytest
+from models_library.services import ServiceDockerData, ServiceType
+
+from simcore_service_catalog.core import background_tasks
+
+EVERYONE_GID = 1
+OWNER_GID = 42
+
+
+@pytest.fixture
+def fake_app() -> SimpleNamespace:
+    return SimpleNamespace(
+        state=SimpleNamespace(
+            settings=SimpleNamespace(access_rights_default_product_name="osparc")
+        )
+    )
+
+
+@pytest.fixture
+def service() -> ServiceDockerData:
+    return ServiceDockerData(
+        key="simcore/services/comp/my_comp_service",
+        version="1.0.0",
+        type=ServiceType.COMPUTATIONAL,
+        name="my service",
+        description="a sleeping service",
+        authors=[{"name": "me", "email": "me@myself.com"}],
+        contact="me.myself@you.com",
+        inputs={},
+        outputs={},
+    )
+
+
+@pytest.mark.parametrize(
+    "is_old_service, gids_from_emails, expected_owner, expected_rights",
+    [
+        (True, {}, None, {EVERYONE_GID: False}),
+        (False, {}, None, {}),
+        (
+            False,
+            {"me@myself.com": OWNER_GID},
+            OWNER_GID,
+            {OWNER_GID: True},
+        ),
+        (
+            True,
+            {"me@myself.com": OWNER_GID},
+            OWNER_GID,
+            {EVERYONE_GID: False, OWNER_GID: True},
+        ),
+    ],
+)
+def test_create_service_default_access_rights(
+    fake_app,
+    service,
+    is_old_service,
+    gids_from_emails,
+    expected_owner,
+    expected_rights,
+):
+    owner_gid, access_rights = background_tasks._create_service_default_access_rights(
+        fake_app, service, is_old_service, EVERYONE_GID, gids_from_emails
+    )
+    assert owner_gid == expected_owner
+    assert {r.gid: r.write_access for r in access_rights} == expected_rights
+    assert all(r.execute_access for r in access_rights)
+    assert all(r.product_name == "osparc" for r in access_rights)
@@ -0,0 +1,102 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from simcore_service_catalog.services.frontend_services import (
+    get_services as get_frontend_services,
+)
+from simcore_service_catalog.services.registry_cache import RegistryServicesCache
+
+
+@pytest.fixture
+def registry_services() -> List[Dict]:
+    return [
+        {
+            "key": "simcore/services/comp/my_comp_service",
+            "version": f"1.0.{v}",
+            "type": "computational",
+            "name": f"my service {v}",
+            "description": f"a sleeping service version {v}",
+            "authors": [{"name": "me", "email": "me@myself.com"}],
+            "contact": "me.myself@you.com",
+            "inputs": {},
+            "outputs": {},
+        }
+        for v in range(10)
+    ]
+
+
+def test_registry_cache_update(registry_services: List[Dict]):
+    cache = RegistryServicesCache(ttl=60)
+    assert cache.is_expired
+    assert cache.etag is None
+    assert len(cache.services) == len(get_frontend_services())
+
+    cache.update(registry_services)
+    assert not cache.is_expired
+    assert len(cache.services) == len(get_frontend_services()) + len(registry_services)
+    first_etag = cache.etag
+    unchanged_service = cache.services[
+        ("simcore/services/comp/my_comp_service", "1.0.0")
+    ]
+
+    # unchanged entries are not validated again
+    registry_services[1] = dict(registry_services[1], name="renamed")
+    cache.update(registry_services)
+    assert cache.etag != first_etag
+    assert (
+        cache.services[("simcore/services/comp/my_comp_service", "1.0.0")]
+        is unchanged_service
+    )
+    assert (
+        cache.services[("simcore/services/comp/my_comp_service", "1.0.1")].name
+        == "renamed"
+    )
+
+    # invalid and removed entries are dropped
+    registry_services[2] = dict(registry_services[2], type="invalid")
+    del registry_services[3]
+    cache.update(registry_services)
+    assert ("simcore/services/comp/my_comp_service", "1.0.2") not in cache.services
+    assert ("simcore/services/comp/my_comp_service", "1.0.3") not in cache.services
+
+    # same listing, same etag
+    etag = cache.etag
+    cache.update(registry_services)
+    assert cache.etag == etag
+
+
+def test_registry_cache_expires(registry_services: List[Dict]):
+    cache = RegistryServicesCache(ttl=60)
+    cache.update(registry_services)
+    assert not cache.is_expired
+
+    cache._updated_at -= 61
+    assert cache.is_expired
+
+
+async def test_registry_cache_is_refreshed_once(loop, registry_services: List[Dict]):
+    class FakeDirectorApi:
+        num_calls = 0
+
+        async def get(self, path: str) -> List[Dict]:
+            self.num_calls += 1
+            await asyncio.sleep(0.1)
+            return registry_services
+
+    cache = RegistryServicesCache(ttl=60)
+    director_api = FakeDirectorApi()
+
+    # e.g. many requests when the cache expired
+    results = await asyncio.gather(
+        *[cache.get_services(director_api) for _ in range(10)]
+    )
+
+    assert director_api.num_calls == 1
+    assert all(services is results[0] for services in results)
+    assert len(results[0]) == len(get_frontend_services()) + len(registry_services)
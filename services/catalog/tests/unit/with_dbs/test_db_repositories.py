@@ -0,0 +1,164 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+
+import logging
+import time
+from typing import Dict, List, Tuple
+
+import pytest
+import sqlalchemy as sa
+from aiopg.sa import create_engine
+
+from simcore_service_catalog.db.repositories.groups import GroupsRepository
+from simcore_service_catalog.db.repositories.services import ServicesRepository
+from simcore_service_catalog.db.tables import (
+    groups,
+    services_access_rights,
+    services_meta_data,
+    users,
+)
+
+core_services = ["postgres"]
+ops_services = ["adminer"]
+
+logger = logging.getLogger(__name__)
+
+NUM_OWNERS = 10
+NUM_SERVICES = 200
+NUM_VERSIONS = 10
+
+
+@pytest.fixture
+def many_services_in_db(
+    postgres_db: sa.engine.Engine,
+) -> Tuple[int, List[Tuple[str, str]]]:
+    """Injects NUM_SERVICES x NUM_VERSIONS services owned by NUM_OWNERS users
+
+    and returns the gid of the everyone group and all (key, version)
+    """
+    with postgres_db.connect() as conn:
+        owner_gids = []
+        for n in range(NUM_OWNERS):
+            conn.execute(
+                users.insert().values(
+                    name=f"owner{n}",
+                    email=f"owner{n}@osparc.io",
+                    password_hash="secret",
+                )
+            )
+            owner_gids.append(
+                conn.execute(
+                    sa.select([users.c.primary_gid]).where(
+                        users.c.email == f"owner{n}@osparc.io"
+                    )
+                ).scalar()
+            )
+        everyone_gid = conn.execute(
+            sa.select([groups.c.gid]).where(groups.c.name == "Everyone")
+        ).scalar()
+
+        key_versions = [
+            (f"simcore/services/comp/service{s}", f"1.0.{v}")
+            for s in range(NUM_SERVICES)
+            for v in range(NUM_VERSIONS)
+        ]
+        conn.execute(
+            services_meta_data.insert(),
+            [
+                {
+                    "key": key,
+                    "version": version,
+                    "owner": owner_gids[i % NUM_OWNERS],
+                    "name": key,
+                    "description": f"{key}:{version}",
+                }
+                for i, (key, version) in enumerate(key_versions)
+            ],
+        )
+        conn.execute(
+            services_access_rights.insert(),
+            [
+                {
+                    "key": key,
+                    "version": version,
+                    "gid": gid,
+                    "execute_access": True,
+                    "write_access": gid != everyone_gid,
+                    "product_name": "osparc",
+                }
+                for i, (key, version) in enumerate(key_versions)
+                for gid in (everyone_gid, owner_gids[i % NUM_OWNERS])
+            ],
+        )
+
+    yield everyone_gid, key_versions
+
+    with postgres_db.connect() as conn:
+        conn.execute(services_meta_data.delete())
+        conn.execute(users.delete())
+
+
+@pytest.fixture
+async def connection(loop, postgres_dsn: Dict[str, str], postgres_db):
+    dsn = "postgresql://{user}:{password}@{host}:{port}/{database}".format(
+        **postgres_dsn
+    )
+    async with create_engine(dsn) as engine:
+        async with engine.acquire() as conn:
+            yield conn
+
+
+async def test_list_services_access_rights(
+    many_services_in_db: Tuple[int, List[Tuple[str, str]]], connection
+):
+    everyone_gid, key_versions = many_services_in_db
+    services_repo = ServicesRepository(connection)
+
+    start = time.perf_counter()
+    services_access_rights = await services_repo.list_services_access_rights(
+        key_versions, product_name="osparc"
+    )
+    logger.info(
+        "Batch fetch of access rights for %d services took %.3fs",
+        len(key_versions),
+        time.perf_counter() - start,
+    )
+
+    assert set(services_access_rights.keys()) == set(key_versions)
+    start = time.perf_counter()
+    for key, version in key_versions:
+        assert sorted(r.gid for r in services_access_rights[(key, version)]) == sorted(
+            r.gid
+            for r in await services_repo.get_service_access_rights(
+                key, version, product_name="osparc"
+            )
+        )
+    logger.info(
+        "Sequential fetch of access rights for %d services took %.3fs",
+        len(key_versions),
+        time.perf_counter() - start,
+    )
+
+    assert await services_repo.list_services_access_rights([]) == {}
+
+
+async def test_list_user_emails_from_gids(
+    many_services_in_db: Tuple[int, List[Tuple[str, str]]], connection
+):
+    everyone_gid, key_versions = many_services_in_db
+    services_repo = ServicesRepository(connection)
+    groups_repo = GroupsRepository(connection)
+
+    services = await services_repo.list_services(
+        gids=[everyone_gid], execute_access=True, product_name="osparc"
+    )
+    assert len(services) == len(key_versions)
+
+    owner_gids = {s.owner for s in services}
+    assert len(owner_gids) == NUM_OWNERS
+
+    emails = await groups_repo.list_user_emails_from_gids(owner_gids | {everyone_gid})
+    assert emails.pop(everyone_gid) is None
+    for gid, email in emails.items():
+        assert email == await groups_repo.get_user_email_from_gid(gid)
@@ -4,6 +4,7 @@ from typing import Coroutine, Dict, Tuple
 from aiohttp import web
 
 from simcore_service_director import config
+from simcore_service_director.registry_cache import get_or_fetch
 
 
 def cache_requests(func: Coroutine, no_cache: bool = False):
@@ -12,19 +13,16 @@ def cache_requests(func: Coroutine, no_cache: bool = False):
         app: web.Application, url: str, method: str, *args, **kwargs
     ) -> Tuple[Dict, Dict]:
         is_cache_enabled = config.DIRECTOR_REGISTRY_CACHING and method == "GET"
-        cache_key = f"{url}:{method}"
-        if is_cache_enabled and not no_cache:
-            cache_data = app[config.APP_REGISTRY_CACHE_DATA_KEY]
-            if cache_key in cache_data:
-                return cache_data[cache_key]
-
-        resp_data, resp_headers = await func(app, url, method, *args, **kwargs)
+        if not is_cache_enabled:
+            return await func(app, url, method, *args, **kwargs)
 
-        if is_cache_enabled:
-            cache_data = app[config.APP_REGISTRY_CACHE_DATA_KEY]
-            cache_data[cache_key] = (resp_data, resp_headers)
-
-        return (resp_data, resp_headers)
+        cache_key = f"{url}:{method}"
+        return await get_or_fetch(
+            app[config.APP_REGISTRY_CACHE_DATA_KEY],
+            cache_key,
+            lambda: func(app, url, method, *args, **kwargs),
+            no_cache=no_cache,
+        )
 
     return wrapped
 
@@ -38,6 +38,24 @@ DIRECTOR_REGISTRY_CACHING: bool = strtobool(
 DIRECTOR_REGISTRY_CACHING_TTL: int = int(
     os.environ.get("DIRECTOR_REGISTRY_CACHING_TTL", 15 * 60)
 )
+# stale entries are served while being refreshed during this time after the TTL
+DIRECTOR_REGISTRY_CACHING_STALE_TTL: int = int(
+    os.environ.get("DIRECTOR_REGISTRY_CACHING_STALE_TTL", 24 * 60 * 60)
+)
+DIRECTOR_REGISTRY_CACHING_MAX_SIZE: int = int(
+    os.environ.get("DIRECTOR_REGISTRY_CACHING_MAX_SIZE", 10000)
+)
+# limits the load on the registry while crawling it
+DIRECTOR_REGISTRY_MAX_CONNECTIONS: int = int(
+    os.environ.get("DIRECTOR_REGISTRY_MAX_CONNECTIONS", 50)
+)
+DIRECTOR_REGISTRY_MAX_CONNECTIONS_PER_HOST: int = int(
+    os.environ.get("DIRECTOR_REGISTRY_MAX_CONNECTIONS_PER_HOST", 20)
+)
+# retries of the requests answered with 429 or 5xx
+DIRECTOR_REGISTRY_MAX_RETRIES: int = int(
+    os.environ.get("DIRECTOR_REGISTRY_MAX_RETRIES", 5)
+)
 
 DIRECTOR_SERVICES_CUSTOM_CONSTRAINTS: str = os.environ.get(
     "DIRECTOR_SERVICES_CUSTOM_CONSTRAINTS", ""
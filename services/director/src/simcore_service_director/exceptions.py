@@ -70,6 +70,14 @@ class RegistryConnectionError(DirectorException):
         super().__init__(msg or "Unexpected connection error while accessing registry")
 
 
+class RegistryTemporaryError(RegistryConnectionError):
+    """The docker registry is overloaded or temporarily failing (429/5xx)"""
+
+    def __init__(self, msg: str, status: int):
+        super().__init__(msg)
+        self.status = status
+
+
 class ServiceStartTimeoutError(DirectorException):
     """The service was created but never run (time-out)"""
 
@@ -6,7 +6,12 @@ from aiohttp import web
 
 from servicelib.client_session import persistent_client_session
 from servicelib.tracing import setup_tracing
-from simcore_service_director import config, registry_cache_task, resources
+from simcore_service_director import (
+    config,
+    registry_cache_task,
+    registry_proxy,
+    resources,
+)
 from simcore_service_director.rest import routing
 from simcore_service_director.monitoring import setup_app_monitoring
 
@@ -30,6 +35,7 @@ def setup_app() -> web.Application:
 
     # NOTE: ensure client session is context is run first, then any further get_client_sesions will be correctly closed
     app.cleanup_ctx.append(persistent_client_session)
+    app.cleanup_ctx.append(registry_proxy.registry_client_session)
 
     registry_cache_task.setup(app)
 
@@ -0,0 +1,186 @@
+""" Cache of the responses of the docker registry
+
+    - bounded in size, the least recently used entries are evicted first
+    - entries are fresh during DIRECTOR_REGISTRY_CACHING_TTL, then served stale
+      while they get revalidated in the background (stale-while-revalidate) for
+      DIRECTOR_REGISTRY_CACHING_STALE_TTL more seconds
+    - a refreshed entry with the same manifest digest keeps its cached data
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Coroutine, Dict, List, Optional, Tuple
+
+from aiohttp import web
+from prometheus_client import Counter
+
+from . import config
+from .monitoring import kCOLLECTOR_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+DIGEST_HEADER: str = "Docker-Content-Digest"
+
+
+class CacheEntry:
+    __slots__ = ("data", "headers", "created_at")
+
+    def __init__(self, data: Dict, headers: Dict, created_at: Optional[float] = None):
+        self.data = data
+        self.headers = headers
+        self.created_at = created_at or time.time()
+
+    @property
+    def digest(self) -> Optional[str]:
+        return self.headers.get(DIGEST_HEADER)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+
+class RegistryCache:
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        stale_ttl: float,
+        collector_registry=None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._revalidations: Dict[str, asyncio.Future] = {}
+
+        self._requests_counter: Optional[Counter] = None
+        self._evictions_counter: Optional[Counter] = None
+        if collector_registry:
+            self._requests_counter = Counter(
+                name="director_registry_cache_requests_total",
+                documentation="Counts the lookups in the registry cache per result (hit, stale, miss)",
+                labelnames=["result"],
+                registry=collector_registry,
+            )
+            self._evictions_counter = Counter(
+                name="director_registry_cache_evictions_total",
+                documentation="Counts the entries evicted from the registry cache",
+                registry=collector_registry,
+            )
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> List[str]:
+        return list(self._entries.keys())
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age <= self.ttl
+
+    def _count(self, result: str) -> None:
+        if self._requests_counter:
+            self._requests_counter.labels(result=result).inc()
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            if self._evictions_counter:
+                self._evictions_counter.inc()
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """ Returns the local entry without affecting the eviction order nor the metrics """
+        return self._entries.get(key)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """ Returns the entry (fresh or stale) or None if it is missing or too old """
+        entry = self._entries.get(key)
+        if entry is None or entry.age > (self.ttl + self.stale_ttl):
+            self._entries.pop(key, None)
+            self._count("miss")
+            return None
+
+        self._entries.move_to_end(key)
+        self._count("hit" if self.is_fresh(entry) else "stale")
+        return entry
+
+    async def set(self, key: str, data: Dict, headers: Dict) -> CacheEntry:
+        entry = CacheEntry(data, headers)
+        previous_entry = self._entries.get(key)
+        if (
+            previous_entry
+            and previous_entry.digest
+            and previous_entry.digest == entry.digest
+        ):
+            # same manifest, only the freshness changes
+            previous_entry.created_at = entry.created_at
+            entry = previous_entry
+        self._store(key, entry)
+        return entry
+
+    def revalidate(self, key: str, fetch: Callable[[], Coroutine]) -> asyncio.Future:
+        """ Refreshes the entry in the background, concurrent revalidations of the same key are merged """
+        if key in self._revalidations:
+            return self._revalidations[key]
+
+        async def _revalidate():
+            try:
+                data, headers = await fetch()
+                await self.set(key, data, headers)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning(
+                    "Failed to revalidate %s, keeping stale entry", key, exc_info=True
+                )
+            finally:
+                self._revalidations.pop(key, None)
+
+        self._revalidations[key] = future = asyncio.ensure_future(_revalidate())
+        return future
+
+    async def close(self) -> None:
+        for future in list(self._revalidations.values()):
+            future.cancel()
+        await asyncio.gather(*self._revalidations.values(), return_exceptions=True)
+        self.clear()
+
+    def clear(self) -> None:
+        """ Clears all the entries """
+        self._entries.clear()
+
+
+async def registry_cache_ctx(app: web.Application) -> AsyncIterator[None]:
+    app[config.APP_REGISTRY_CACHE_DATA_KEY] = cache = RegistryCache(
+        max_size=config.DIRECTOR_REGISTRY_CACHING_MAX_SIZE,
+        ttl=config.DIRECTOR_REGISTRY_CACHING_TTL,
+        stale_ttl=config.DIRECTOR_REGISTRY_CACHING_STALE_TTL,
+        collector_registry=app.get(kCOLLECTOR_REGISTRY),
+    )
+
+    yield
+
+    await cache.close()
+
+
+async def get_or_fetch(
+    cache: RegistryCache,
+    key: str,
+    fetch: Callable[[], Coroutine],
+    no_cache: bool = False,
+) -> Tuple[Dict, Dict]:
+    entry = None if no_cache else await cache.get(key)
+    if entry is not None:
+        if not cache.is_fresh(entry):
+            cache.revalidate(key, fetch)
+        return (entry.data, entry.headers)
+
+    data, headers = await fetch()
+    entry = await cache.set(key, data, headers)
+    return (entry.data, entry.headers)
+
+
+__all__ = ["RegistryCache", "registry_cache_ctx", "get_or_fetch"]
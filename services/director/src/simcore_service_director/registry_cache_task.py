@@ -3,64 +3,68 @@ import logging
 
 from aiohttp import web
 
-from simcore_service_director import config, exceptions, registry_proxy
+from simcore_service_director import config, registry_proxy
 from simcore_service_director.config import APP_REGISTRY_CACHE_DATA_KEY
-from servicelib.utils import logged_gather
+from simcore_service_director.registry_cache import RegistryCache, registry_cache_ctx
 
 _logger = logging.getLogger(__name__)
 
 TASK_NAME: str = __name__ + "_registry_caching_task"
 
+# maximum number of requests to the registry while refreshing the cache
+MAX_CONCURRENT_REFRESHES: int = 20
+
+
+async def _refresh_cache(app: web.Application) -> None:
+    cache: RegistryCache = app[APP_REGISTRY_CACHE_DATA_KEY]
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REFRESHES)
+
+    async def _refresh(key: str) -> None:
+        path, method = key.rsplit(":", 1)
+        _logger.debug("refresh %s:%s", method, path)
+        async with semaphore:
+            await registry_proxy.registry_request(app, path, method, no_cache=True)
+
+    keys = cache.keys()
+    results = await asyncio.gather(
+        *[_refresh(key) for key in keys], return_exceptions=True
+    )
+    # if the registry is temporarily not available this might happen, the entries are kept stale
+    failed_keys = [key for key, r in zip(keys, results) if isinstance(r, Exception)]
+    if failed_keys:
+        _logger.warning(
+            "%s: %d/%d entries could not be refreshed, e.g. %s",
+            TASK_NAME,
+            len(failed_keys),
+            len(keys),
+            failed_keys[0],
+        )
+
 
 async def registry_caching_task(app: web.Application) -> None:
     try:
         _logger.info("%s: initializing cache...", TASK_NAME)
-        app[APP_REGISTRY_CACHE_DATA_KEY].clear()
         await registry_proxy.list_services(app, registry_proxy.ServiceType.ALL)
         _logger.info("%s: initialisation completed", TASK_NAME)
         while True:
-            _logger.info("%s: waking up, refreshing cache...", TASK_NAME)
-            try:
-                keys = []
-                refresh_tasks = []
-                for key in app[APP_REGISTRY_CACHE_DATA_KEY]:
-                    path, method = key.split(":")
-                    _logger.debug("refresh %s:%s", method, path)
-                    refresh_tasks.append(
-                        registry_proxy.registry_request(
-                            app, path, method, no_cache=True
-                        )
-                    )
-                keys = list(app[APP_REGISTRY_CACHE_DATA_KEY].keys())
-                results = await logged_gather(*refresh_tasks)
-
-                for key, result in zip(keys, results):
-                    app[APP_REGISTRY_CACHE_DATA_KEY][key] = result
-
-            except exceptions.DirectorException:
-                # if the registry is temporarily not available this might happen
-                _logger.exception(
-                    "%s: exception while refreshing cache, clean cache...", TASK_NAME
-                )
-                app[APP_REGISTRY_CACHE_DATA_KEY].clear()
-
             _logger.info(
-                "cache refreshed %s: sleeping for %ss...",
+                "%s: sleeping for %ss...",
                 TASK_NAME,
                 config.DIRECTOR_REGISTRY_CACHING_TTL,
             )
             await asyncio.sleep(config.DIRECTOR_REGISTRY_CACHING_TTL)
+            _logger.info("%s: waking up, refreshing cache...", TASK_NAME)
+            await _refresh_cache(app)
+            _logger.info("%s: cache refreshed", TASK_NAME)
     except asyncio.CancelledError:
         _logger.info("%s: cancelling task...", TASK_NAME)
     except Exception:  # pylint: disable=broad-except
         _logger.exception("%s: Unhandled exception while refreshing cache", TASK_NAME)
     finally:
-        _logger.info("%s: finished task...clearing cache...", TASK_NAME)
-        app[APP_REGISTRY_CACHE_DATA_KEY].clear()
+        _logger.info("%s: finished task...", TASK_NAME)
 
 
 async def setup_registry_caching_task(app: web.Application) -> None:
-    app[APP_REGISTRY_CACHE_DATA_KEY] = {}
     app[TASK_NAME] = asyncio.get_event_loop().create_task(registry_caching_task(app))
 
     yield
@@ -72,6 +76,7 @@ async def setup_registry_caching_task(app: web.Application) -> None:
 
 def setup(app: web.Application) -> None:
     if config.DIRECTOR_REGISTRY_CACHING:
+        app.cleanup_ctx.append(registry_cache_ctx)
         app.cleanup_ctx.append(setup_registry_caching_task)
 
 
@@ -4,22 +4,33 @@ import enum
 import json
 import logging
 import re
+from collections import OrderedDict
 from http import HTTPStatus
 from pprint import pformat
-from typing import Dict, List, Tuple
+from typing import AsyncIterator, Dict, List, Tuple
 
-from aiohttp import BasicAuth, ClientSession, client_exceptions, web
+import tenacity
+from aiohttp import BasicAuth, ClientSession, TCPConnector, client_exceptions, web
 from yarl import URL
 
 from simcore_service_director import config, exceptions
 from simcore_service_director.cache_request_decorator import cache_requests
+from simcore_service_director.registry_cache import DIGEST_HEADER, RegistryCache
 
-from .config import APP_CLIENT_SESSION_KEY
+from .config import APP_CLIENT_SESSION_KEY, APP_REGISTRY_CACHE_DATA_KEY
 
 DEPENDENCIES_LABEL_KEY: str = "simcore.service.dependencies"
 
 NUMBER_OF_RETRIEVED_REPOS: int = 50
 NUMBER_OF_RETRIEVED_TAGS: int = 50
+# number of repositories crawled at the same time
+MAX_CONCURRENT_REPOSITORIES: int = 10
+
+APP_REGISTRY_CLIENT_SESSION_KEY: str = __name__ + "_registry_client_session"
+
+# labels of the already parsed manifests (digests are content addressed and never change)
+MAX_NUMBER_OF_PARSED_MANIFESTS: int = 10000
+_labels_by_digest: "OrderedDict[str, Dict]" = OrderedDict()
 
 VERSION_REG = re.compile(
     r"^(0|[1-9]\d*)(\.(0|[1-9]\d*)){2}(-(0|[1-9]\d*|\d*[-a-zA-Z][-\da-zA-Z]*)(\.(0|[1-9]\d*|\d*[-a-zA-Z][-\da-zA-Z]*))*)?(\+[-\da-zA-Z]+(\.[-\da-zA-Z-]+)*)?$"
@@ -34,6 +45,36 @@ class ServiceType(enum.Enum):
     DYNAMIC: str = "dynamic"
 
 
+def _is_temporary_error(status: int) -> bool:
+    return status == HTTPStatus.TOO_MANY_REQUESTS or status >= 500
+
+
+def _get_registry_session(app: web.Application) -> ClientSession:
+    if APP_REGISTRY_CLIENT_SESSION_KEY in app:
+        return app[APP_REGISTRY_CLIENT_SESSION_KEY]
+    return app[APP_CLIENT_SESSION_KEY]
+
+
+async def registry_client_session(app: web.Application):
+    """ Dedicated client session, its connector limits the number of connections to the registry """
+    connector = TCPConnector(
+        limit=config.DIRECTOR_REGISTRY_MAX_CONNECTIONS,
+        limit_per_host=config.DIRECTOR_REGISTRY_MAX_CONNECTIONS_PER_HOST,
+    )
+    app[APP_REGISTRY_CLIENT_SESSION_KEY] = session = ClientSession(connector=connector)
+
+    yield
+
+    await session.close()
+
+
+@tenacity.retry(
+    retry=tenacity.retry_if_exception_type(exceptions.RegistryTemporaryError),
+    wait=tenacity.wait_exponential(multiplier=0.5, max=30),
+    stop=tenacity.stop_after_attempt(config.DIRECTOR_REGISTRY_MAX_RETRIES + 1),
+    before_sleep=tenacity.before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
 async def _basic_auth_registry_request(
     app: web.Application, path: str, method: str
 ) -> Tuple[Dict, Dict]:
@@ -52,7 +93,7 @@ async def _basic_auth_registry_request(
         else None
     )
 
-    session = app[APP_CLIENT_SESSION_KEY]
+    session = _get_registry_session(app)
     try:
         async with session.request(method.lower(), url, auth=auth) as response:
             if response.status == HTTPStatus.UNAUTHORIZED:
@@ -66,6 +107,9 @@ async def _basic_auth_registry_request(
                 logger.exception("Path to registry not found: %s", url)
                 raise exceptions.ServiceNotAvailableError(str(path))
 
+            elif _is_temporary_error(response.status):
+                raise exceptions.RegistryTemporaryError(str(response), response.status)
+
             elif response.status > 399:
                 logger.exception(
                     "Unknown error while accessing registry: %s", str(response)
@@ -116,6 +160,10 @@ async def _auth_registry_request(
             service=auth_details["service"], scope=auth_details["scope"]
         )
         async with session.get(token_url, auth=auth) as token_resp:
+            if _is_temporary_error(token_resp.status):
+                raise exceptions.RegistryTemporaryError(
+                    str(token_resp), token_resp.status
+                )
             if not token_resp.status == HTTPStatus.OK:
                 raise exceptions.RegistryConnectionError(
                     "Unknown error while authentifying with registry: {}".format(
@@ -130,6 +178,10 @@ async def _auth_registry_request(
                 if resp_wtoken.status == HTTPStatus.NOT_FOUND:
                     logger.exception("path to registry not found: %s", url)
                     raise exceptions.ServiceNotAvailableError(str(url))
+                if _is_temporary_error(resp_wtoken.status):
+                    raise exceptions.RegistryTemporaryError(
+                        str(resp_wtoken), resp_wtoken.status
+                    )
                 if resp_wtoken.status > 399:
                     logger.exception(
                         "Unknown error while accessing with token authorized registry: %s",
@@ -145,6 +197,10 @@ async def _auth_registry_request(
             if resp_wbasic.status == HTTPStatus.NOT_FOUND:
                 logger.exception("path to registry not found: %s", url)
                 raise exceptions.ServiceNotAvailableError(str(url))
+            if _is_temporary_error(resp_wbasic.status):
+                raise exceptions.RegistryTemporaryError(
+                    str(resp_wbasic), resp_wbasic.status
+                )
             if resp_wbasic.status > 399:
                 logger.exception(
                     "Unknown error while accessing with token authorized registry: %s",
@@ -159,15 +215,34 @@ async def _auth_registry_request(
     )
 
 
+def _is_manifest_path(path: str) -> bool:
+    return "/manifests/" in path
+
+
+async def _conditional_manifest_request(
+    app: web.Application, path: str, method: str
+) -> Tuple[Dict, Dict]:
+    """ Downloads a manifest only if its digest differs from the cached one """
+    cache: RegistryCache = app[APP_REGISTRY_CACHE_DATA_KEY]
+    cached_entry = cache.peek(f"{path}:{method}")
+    if cached_entry and cached_entry.digest:
+        _, headers = await _basic_auth_registry_request(app, path, "HEAD")
+        if headers.get(DIGEST_HEADER) == cached_entry.digest:
+            logger.debug("manifest %s is unchanged", path)
+            return (cached_entry.data, cached_entry.headers)
+    return await _basic_auth_registry_request(app, path, method)
+
+
 async def registry_request(
     app: web.Application, path: str, method: str = "GET", no_cache: bool = False
 ) -> Tuple[Dict, Dict]:
     logger.debug(
         "Request to registry: path=%s, method=%s. no_cache=%s", path, method, no_cache
     )
-    return await cache_requests(_basic_auth_registry_request, no_cache)(
-        app, path, method
-    )
+    request_func = _basic_auth_registry_request
+    if config.DIRECTOR_REGISTRY_CACHING and method == "GET" and _is_manifest_path(path):
+        request_func = _conditional_manifest_request
+    return await cache_requests(request_func, no_cache)(app, path, method)
 
 
 async def _list_repositories(app: web.Application) -> List[str]:
@@ -205,13 +280,23 @@ async def list_image_tags(app: web.Application, image_key: str) -> List[str]:
 async def get_image_labels(app: web.Application, image: str, tag: str) -> Dict:
     logger.debug("getting image labels of %s:%s", image, tag)
     path = f"/v2/{image}/manifests/{tag}"
-    request_result, _ = await registry_request(app, path)
+    request_result, headers = await registry_request(app, path)
+    digest = headers.get(DIGEST_HEADER)
+    if digest in _labels_by_digest:
+        _labels_by_digest.move_to_end(digest)
+        return dict(_labels_by_digest[digest])
+
     v1_compatibility_key = json.loads(request_result["history"][0]["v1Compatibility"])
     container_config = v1_compatibility_key.get(
         "container_config", v1_compatibility_key["config"]
     )
     labels = container_config["Labels"]
     logger.debug("retrieved labels of image %s:%s", image, tag)
+    if digest and labels is not None:
+        _labels_by_digest[digest] = labels
+        while len(_labels_by_digest) > MAX_NUMBER_OF_PARSED_MANIFESTS:
+            _labels_by_digest.popitem(last=False)
+        return dict(labels)
     return labels
 
 
@@ -252,7 +337,10 @@ async def get_repo_details(app: web.Application, image_key: str) -> List[Dict]:
     return repo_details
 
 
-async def list_services(app: web.Application, service_type: ServiceType) -> List[Dict]:
+async def iter_services(
+    app: web.Application, service_type: ServiceType
+) -> AsyncIterator[Dict]:
+    """ Crawls the registry and yields the services as soon as their repository is listed """
     logger.debug("getting list of services")
     repos = await _list_repositories(app)
     # get the services repos
@@ -265,15 +353,30 @@ async def list_services(app: web.Application, service_type: ServiceType) -> List
     logger.debug("retrieved list of repos : %s", repos)
 
     # only list as service if it actually contains the necessary labels
-    tasks = [get_repo_details(app, repo) for repo in repos]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    services = []
-    for repo_details in results:
-        if repo_details and isinstance(repo_details, list):
-            services.extend(repo_details)
-        elif isinstance(repo_details, Exception):
-            logger.error("Exception occured while listing services %s", repo_details)
-    return services
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REPOSITORIES)
+
+    async def _get_repo_details(repo: str) -> List[Dict]:
+        async with semaphore:
+            return await get_repo_details(app, repo)
+
+    tasks = [asyncio.ensure_future(_get_repo_details(repo)) for repo in repos]
+    try:
+        for next_completed in asyncio.as_completed(tasks):
+            try:
+                repo_details = await next_completed
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error("Exception occured while listing services %s", exc)
+                continue
+            for service in repo_details:
+                yield service
+    finally:
+        # the caller might stop consuming before the end
+        for task in tasks:
+            task.cancel()
+
+
+async def list_services(app: web.Application, service_type: ServiceType) -> List[Dict]:
+    return [service async for service in iter_services(app, service_type)]
 
 
 async def list_interactive_service_dependencies(
@@ -13,6 +13,7 @@ from aiohttp import ClientSession
 
 import simcore_service_director
 from simcore_service_director import config, resources
+from simcore_service_director.registry_cache import RegistryCache
 
 pytest_plugins = [
     "pytest_simcore.repository_paths",
@@ -96,7 +97,11 @@ async def aiohttp_mock_app(loop, mocker):
 
     mock_app_storage = {
         config.APP_CLIENT_SESSION_KEY: session,
-        config.APP_REGISTRY_CACHE_DATA_KEY: dict(),
+        config.APP_REGISTRY_CACHE_DATA_KEY: RegistryCache(
+            max_size=config.DIRECTOR_REGISTRY_CACHING_MAX_SIZE,
+            ttl=config.DIRECTOR_REGISTRY_CACHING_TTL,
+            stale_ttl=config.DIRECTOR_REGISTRY_CACHING_STALE_TTL,
+        ),
     }
 
     def _get_item(self, key):
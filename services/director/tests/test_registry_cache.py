@@ -0,0 +1,111 @@
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+import asyncio
+
+import pytest
+from prometheus_client.registry import CollectorRegistry
+
+from simcore_service_director.registry_cache import (
+    DIGEST_HEADER,
+    RegistryCache,
+    get_or_fetch,
+)
+
+
+@pytest.fixture
+def collector_registry() -> CollectorRegistry:
+    return CollectorRegistry(auto_describe=True)
+
+
+@pytest.fixture
+def cache(collector_registry) -> RegistryCache:
+    return RegistryCache(
+        max_size=3, ttl=10, stale_ttl=100, collector_registry=collector_registry
+    )
+
+
+def _get_counter(collector_registry, result: str) -> float:
+    return collector_registry.get_sample_value(
+        "director_registry_cache_requests_total", {"result": result}
+    )
+
+
+def _age(cache: RegistryCache, key: str, seconds: float):
+    cache._entries[key].created_at -= seconds
+
+
+async def test_lru_eviction(loop, cache: RegistryCache):
+    for n in range(3):
+        await cache.set(f"key{n}", {"n": n}, {})
+    # key0 becomes the most recently used
+    assert await cache.get("key0")
+    await cache.set("key3", {"n": 3}, {})
+
+    assert len(cache) == 3
+    assert "key1" not in cache
+    assert all(key in cache for key in ["key0", "key2", "key3"])
+
+
+async def test_stale_while_revalidate(
+    loop, cache: RegistryCache, collector_registry: CollectorRegistry
+):
+    num_fetches = 0
+
+    async def fetch():
+        nonlocal num_fetches
+        num_fetches += 1
+        await asyncio.sleep(0.1)
+        return {"n": num_fetches}, {}
+
+    data, _ = await get_or_fetch(cache, "key", fetch)
+    assert data == {"n": 1}
+    assert _get_counter(collector_registry, "miss") == 1
+
+    data, _ = await get_or_fetch(cache, "key", fetch)
+    assert data == {"n": 1}
+    assert num_fetches == 1
+    assert _get_counter(collector_registry, "hit") == 1
+
+    # stale entries are returned while being revalidated only once
+    _age(cache, "key", 11)
+    results = await asyncio.gather(
+        *[get_or_fetch(cache, "key", fetch) for _ in range(5)]
+    )
+    assert all(data == {"n": 1} for data, _ in results)
+    assert _get_counter(collector_registry, "stale") == 5
+    await asyncio.sleep(0.2)
+    assert num_fetches == 2
+    data, _ = await get_or_fetch(cache, "key", fetch)
+    assert data == {"n": 2}
+
+    # too old entries are fetched again
+    _age(cache, "key", 111)
+    data, _ = await get_or_fetch(cache, "key", fetch)
+    assert data == {"n": 3}
+
+
+async def test_failed_revalidation_keeps_entry(loop, cache: RegistryCache):
+    async def failing_fetch():
+        raise ValueError("registry is down")
+
+    await cache.set("key", {"some": "data"}, {})
+    _age(cache, "key", 11)
+    await cache.revalidate("key", failing_fetch)
+
+    entry = await cache.get("key")
+    assert entry.data == {"some": "data"}
+
+
+async def test_same_digest_keeps_entry(loop, cache: RegistryCache):
+    first = await cache.set("manifest", {"v": 1}, {DIGEST_HEADER: "sha256:1"})
+    _age(cache, "manifest", 11)
+    assert not cache.is_fresh(first)
+
+    entry = await cache.set("manifest", {"v": 1}, {DIGEST_HEADER: "sha256:1"})
+    assert entry is first
+    assert cache.is_fresh(entry)
+
+    entry = await cache.set("manifest", {"v": 2}, {DIGEST_HEADER: "sha256:2"})
+    assert entry is not first
+    assert entry.data == {"v": 2}
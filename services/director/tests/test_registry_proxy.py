@@ -1,6 +1,7 @@
 # pylint: disable=W0613, W0621
 # pylint: disable=unused-variable
 
+import asyncio
 import json
 import time
 
@@ -173,6 +174,43 @@ async def test_get_image_labels(
             assert "simcore.service.settings" in labels
 
 
+async def test_get_image_labels_unchanged_manifest(
+    aiohttp_mock_app,
+    docker_registry,
+    push_services,
+    configure_registry_access,
+    configure_schemas_location,
+    mocker,
+    monkeypatch,
+):
+    monkeypatch.setattr(config, "DIRECTOR_REGISTRY_CACHING", True)
+    images = await push_services(
+        number_of_computational_services=1, number_of_interactive_services=0
+    )
+    service_description = images[0]["service_description"]
+    labels = await registry_proxy.get_image_labels(
+        aiohttp_mock_app, service_description["key"], service_description["version"]
+    )
+
+    spy_request = mocker.spy(registry_proxy, "_basic_auth_registry_request")
+    # refreshing an unchanged manifest only needs a HEAD request
+    path = (
+        f"/v2/{service_description['key']}/manifests/{service_description['version']}"
+    )
+    await registry_proxy.registry_request(aiohttp_mock_app, path, no_cache=True)
+    assert spy_request.call_count == 1
+    assert spy_request.call_args[0][2] == "HEAD"
+
+    # and the labels are not parsed again
+    mocker.patch.object(registry_proxy.json, "loads", side_effect=AssertionError)
+    assert (
+        await registry_proxy.get_image_labels(
+            aiohttp_mock_app, service_description["key"], service_description["version"]
+        )
+        == labels
+    )
+
+
 def test_get_service_first_name():
     repo = "simcore/services/dynamic/myservice/modeler/my-sub-modeler"
     assert registry_proxy.get_service_first_name(repo) == "myservice"
@@ -272,6 +310,49 @@ async def test_get_services_performance(
     )
 
 
+async def test_iter_services_bounded_concurrency(aiohttp_mock_app, loop, monkeypatch):
+    repos = [f"simcore/services/comp/service_{n}" for n in range(30)]
+    running = 0
+    max_running = 0
+
+    async def _list_repositories(app):
+        return repos
+
+    async def get_repo_details(app, repo):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            running -= 1
+        if repo.endswith("_13"):
+            raise registry_proxy.exceptions.RegistryTemporaryError("busy", 503)
+        return [{"key": repo, "version": "1.0.0"}]
+
+    monkeypatch.setattr(registry_proxy, "_list_repositories", _list_repositories)
+    monkeypatch.setattr(registry_proxy, "get_repo_details", get_repo_details)
+
+    services = [
+        service
+        async for service in registry_proxy.iter_services(
+            aiohttp_mock_app, registry_proxy.ServiceType.ALL
+        )
+    ]
+    # the failing repository is skipped
+    assert len(services) == len(repos) - 1
+    assert max_running == registry_proxy.MAX_CONCURRENT_REPOSITORIES
+
+    # stopping early does not leave running requests behind
+    services_iterator = registry_proxy.iter_services(
+        aiohttp_mock_app, registry_proxy.ServiceType.ALL
+    )
+    await services_iterator.__anext__()
+    await services_iterator.aclose()
+    await asyncio.sleep(0.05)
+    assert running == 0
+
+
 async def test_generate_service_extras(
     aiohttp_mock_app,
     push_services,
@@ -1,10 +1,11 @@
-from celery.signals import worker_ready, worker_shutting_down
+from celery.signals import worker_process_shutdown, worker_ready, worker_shutting_down
 
 from .celery_configurator import create_celery_app
 from .celery_log_setup import get_task_logger
 from .celery_task_utils import cancel_task
-from .cli import run_sidecar
+from .cli import close_worker_connections, run_sidecar
 from .remote_debug import setup_remote_debugging
+from .utils import wrap_async_call
 
 setup_remote_debugging()
 
@@ -26,6 +27,11 @@ def worker_shutting_down_handler(
     cancel_task(run_sidecar)
 
 
+@worker_process_shutdown.connect
+def worker_process_shutdown_handler(*args, **kwargs):  # pylint: disable=unused-argument
+    wrap_async_call(close_worker_connections())
+
+
 @worker_ready.connect
 def worker_ready_handler(*args, **kwargs):  # pylint: disable=unused-argument
     log.info("!!!!!!!!!!!!!! Worker is READY now !!!!!!!!!!!!!!!!!!")
@@ -1,13 +1,13 @@
 from asyncio import CancelledError
-from pprint import pformat
-from typing import Optional
+from collections import defaultdict
+from typing import Dict, List, Optional
 
 from celery import Celery, states
 
 from .celery_log_setup import get_task_logger
 from .cli import run_sidecar
 from .config import CPU_QUEUE_NAME, GPU_QUEUE_NAME, MPI_QUEUE_NAME
-from .core import task_required_resources
+from .core import tasks_required_resources
 from .utils import wrap_async_call
 
 log = get_task_logger(__name__)
@@ -52,39 +52,52 @@ def _shared_task_dispatch(
         # the task may be aborted already...
         celery_request.update_state(state=states.SUCCESS)
 
-    if next_task_nodes:
-        for next_node in next_task_nodes:
-            log.debug("send next tasks: %s", pformat(next_node))
-            if not celery_request.is_aborted():
-                post_task_to_next_worker(app, user_id, project_id, next_node)
+    if next_task_nodes and not celery_request.is_aborted():
+        post_tasks_to_next_workers(app, user_id, project_id, next_task_nodes)
 
 
-def post_task_to_next_worker(
-    app: Celery, user_id: str, project_id: str, node_id: str
+def _get_queue_name(required_resources: Dict[str, bool]) -> str:
+    if required_resources["requires_mpi"]:
+        return MPI_QUEUE_NAME
+    if required_resources["requires_gpu"]:
+        return GPU_QUEUE_NAME
+    return CPU_QUEUE_NAME
+
+
+def post_tasks_to_next_workers(
+    app: Celery, user_id: str, project_id: str, node_ids: List[str]
 ) -> None:
-    """Uses the director's API to determineate where the service needs
-    to be dispacted and sends it to the appropriate queue"""
+    """Determines where the services need to be dispatched and sends them to
+    the appropriate queues
 
-    if node_id is None:
+    The resources of all the nodes are fetched at once and all the tasks are
+    published through the same broker connection.
+    """
+    node_ids = [node_id for node_id in node_ids if node_id is not None]
+    if not node_ids:
         log.error("No node_id provided for project_id %s, skipping", project_id)
         return
 
-    required_resources = wrap_async_call(task_required_resources(node_id))
-    if required_resources is None:
-        log.warning("No resources required for node %s... stopping here...", node_id)
-        return
-    log.info(
-        "Needed resources for node %s are %s, dispatching now...",
-        node_id,
-        required_resources,
-    )
-    next_queue_name = CPU_QUEUE_NAME
-    if required_resources["requires_mpi"]:
-        next_queue_name = MPI_QUEUE_NAME
-    elif required_resources["requires_gpu"]:
-        next_queue_name = GPU_QUEUE_NAME
+    required_resources = wrap_async_call(tasks_required_resources(project_id, node_ids))
+    node_ids_per_queue: Dict[str, List[str]] = defaultdict(list)
+    for node_id in node_ids:
+        if node_id not in required_resources:
+            log.warning(
+                "No resources required for node %s... stopping here...", node_id
+            )
+            continue
+        node_ids_per_queue[_get_queue_name(required_resources[node_id])].append(node_id)
 
-    app.send_task(
-        next_queue_name,
-        kwargs={"user_id": user_id, "project_id": project_id, "node_id": node_id},
-    )
+    with app.producer_or_acquire() as producer:
+        for queue_name, queue_node_ids in node_ids_per_queue.items():
+            log.info("Dispatching nodes %s to %s...", queue_node_ids, queue_name)
+            for node_id in queue_node_ids:
+                app.send_task(
+                    queue_name,
+                    kwargs={
+                        "user_id": user_id,
+                        "project_id": project_id,
+                        "node_id": node_id,
+                    },
+                    producer=producer,
+                )
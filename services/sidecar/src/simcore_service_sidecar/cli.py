@@ -3,12 +3,13 @@ import logging
 from typing import Callable, List, Optional
 
 import click
+from simcore_sdk.node_ports import filemanager
 
 from .celery_task_utils import cancel_task
 from .config import SIDECAR_INTERVAL_TO_CHECK_TASK_ABORTED_S
 from .core import inspect
-from .db import DBContextManager
-from .rabbitmq import RabbitMQ
+from .db import close_db_engine, get_db_engine
+from .rabbitmq import close_rabbitmq, get_rabbitmq
 from .utils import wrap_async_call
 
 log = logging.getLogger(__name__)
@@ -30,6 +31,15 @@ def main(
         return next_task_nodes
     except Exception:  # pylint: disable=broad-except
         log.exception("Uncaught exception")
+    finally:
+        wrap_async_call(close_worker_connections())
+
+
+async def close_worker_connections() -> None:
+    """ Closes the connections kept open across the tasks of a worker process """
+    await close_rabbitmq()
+    await close_db_engine()
+    await filemanager.close_shared_clients()
 
 
 async def perdiodicaly_check_if_aborted(is_aborted_cb: Callable[[], bool]) -> None:
@@ -64,19 +74,20 @@ async def run_sidecar(
         else None
     )
     try:
-        async with DBContextManager() as db_engine:
-            async with RabbitMQ() as rabbit_mq:
-                next_task_nodes: Optional[List[str]] = await inspect(
-                    db_engine, rabbit_mq, job_id, user_id, project_id, node_id=node_id
-                )
-                log.info(
-                    "COMPLETED task %s processing for user %s, project %s, node %s",
-                    job_id,
-                    user_id,
-                    project_id,
-                    node_id,
-                )
-                return next_task_nodes
+        # the connections are kept open across the tasks of this worker process
+        db_engine = await get_db_engine()
+        rabbit_mq = await get_rabbitmq()
+        next_task_nodes: Optional[List[str]] = await inspect(
+            db_engine, rabbit_mq, job_id, user_id, project_id, node_id=node_id
+        )
+        log.info(
+            "COMPLETED task %s processing for user %s, project %s, node %s",
+            job_id,
+            user_id,
+            project_id,
+            node_id,
+        )
+        return next_task_nodes
     except asyncio.CancelledError:
         if abortion_task:
             abortion_task.cancel()
@@ -28,6 +28,20 @@ SIDECAR_LOG_FOLDER: Path = Path(
     os.environ.get("SIDECAR_LOG_FOLDER", Path.home() / "log")
 )
 
+# the input files are downloaded (in a folder per task) and cached on the same volume
+# as the input folders, so that they are hard-linked instead of copied into the task
+# input folder
+SIDECAR_INPUT_DOWNLOAD_FOLDER: Path = Path(
+    os.environ.get("SIDECAR_INPUT_DOWNLOAD_FOLDER", SIDECAR_INPUT_FOLDER / ".downloads")
+)
+SIDECAR_INPUT_CACHE_FOLDER: Path = Path(
+    os.environ.get("SIDECAR_INPUT_CACHE_FOLDER", SIDECAR_INPUT_FOLDER / ".cache")
+)
+# 0 disables the cache
+SIDECAR_INPUT_CACHE_MAX_SIZE_BYTES: int = int(
+    os.environ.get("SIDECAR_INPUT_CACHE_MAX_SIZE_BYTES", 10 * pow(1024, 3))
+)
+
 SIDECAR_DOCKER_VOLUME_INPUT: str = os.environ.get(
     "SIDECAR_DOCKER_VOLUME_INPUT", f"{SWARM_STACK_NAME}_input"
 )
@@ -1,9 +1,10 @@
 import asyncio
 import traceback
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple
 
-import networkx as nx
+import sqlalchemy as sa
 from aiopg.sa import Engine, SAConnection
 from aiopg.sa.result import RowProxy
 from celery.utils.log import get_task_logger
@@ -13,53 +14,77 @@ from simcore_postgres_database.sidecar_models import (
     comp_tasks,
 )
 from simcore_sdk import node_ports
+from simcore_sdk.node_ports import filemanager
 from simcore_sdk.node_ports import log as node_port_log
+from simcore_sdk.node_ports.download_cache import DownloadCache
 from sqlalchemy import and_, literal_column
 
 from . import config, exceptions
-from .db import DBContextManager
+from .db import get_db_engine
 from .executor import Executor
 from .rabbitmq import RabbitMQ
-from .utils import execution_graph, find_entry_point, is_node_ready
+from .utils import ExecutionGraph, execution_graph, find_entry_point, is_node_ready
 
 log = get_task_logger(__name__)
 log.setLevel(config.SIDECAR_LOGLEVEL)
 node_port_log.setLevel(config.SIDECAR_LOGLEVEL)
 
+if config.SIDECAR_INPUT_CACHE_MAX_SIZE_BYTES > 0:
+    filemanager.set_download_cache(
+        DownloadCache(
+            config.SIDECAR_INPUT_CACHE_FOLDER,
+            config.SIDECAR_INPUT_CACHE_MAX_SIZE_BYTES,
+        )
+    )
+
+EXECUTION_GRAPHS_CACHE_MAX_SIZE: int = 128
+# project_id: (digest of the dag, graph), the least recently used are evicted first
+_execution_graphs: "OrderedDict[str, Tuple[str, ExecutionGraph]]" = OrderedDict()
+
 
-async def task_required_resources(node_id: str) -> Union[Dict[str, bool], None]:
-    """Checks if the comp_task's image field if it requires to use the GPU"""
+async def tasks_required_resources(
+    project_id: str, node_ids: List[str]
+) -> Dict[str, Dict[str, bool]]:
+    """Checks in a single query if the comp_tasks' image field requires to use the GPU, MPI
+
+    :return: the required resources per node_id, the tasks that were not found are missing
+    """
     try:
-        async with DBContextManager() as db_engine:
-            async with db_engine.acquire() as db_connection:
-                result = await db_connection.execute(
-                    query=comp_tasks.select().where(comp_tasks.c.node_id == node_id)
+        db_engine = await get_db_engine()
+        async with db_engine.acquire() as db_connection:
+            result = await db_connection.execute(
+                query=sa.select([comp_tasks.c.node_id, comp_tasks.c.image]).where(
+                    (comp_tasks.c.project_id == project_id)
+                    & (comp_tasks.c.node_id.in_(node_ids))
                 )
-                task = await result.fetchone()
-
-                if not task:
-                    log.warning("Task for node_id %s was not found", node_id)
-                    raise exceptions.TaskNotFound("Could not find a relative task")
-
-                # Image has to following format
-                # {"name": "simcore/services/comp/itis/sleeper", "tag": "1.0.0", "requires_gpu": false, "requires_mpi": false}
-                return {
-                    "requires_gpu": task["image"]["requires_gpu"],
-                    "requires_mpi": task["image"]["requires_mpi"],
-                }
+            )
+            tasks = await result.fetchall()
     except Exception:  # pylint: disable=broad-except
         log.error(
             "%s\nThe above exception ocurred because it could not be "
-            "determined if task requires GPU, MPI  MPI for node_id %s",
+            "determined if tasks require GPU, MPI for node_ids %s",
             traceback.format_exc(),
-            node_id,
+            node_ids,
         )
-        return None
+        return {}
+
+    # Image has to following format
+    # {"name": "simcore/services/comp/itis/sleeper", "tag": "1.0.0", "requires_gpu": false, "requires_mpi": false}
+    required_resources = {
+        task.node_id: {
+            "requires_gpu": task.image["requires_gpu"],
+            "requires_mpi": task.image["requires_mpi"],
+        }
+        for task in tasks
+    }
+    for node_id in set(node_ids) - set(required_resources):
+        log.warning("Task for node_id %s was not found", node_id)
+    return required_resources
 
 
 async def _try_get_task_from_db(
     db_connection: SAConnection,
-    graph: nx.DiGraph,
+    graph: ExecutionGraph,
     job_request_id: str,
     project_id: str,
     node_id: str,
@@ -85,7 +110,12 @@ async def _try_get_task_from_db(
         return
 
     # Check if node's dependecies are there
-    if not await is_node_ready(task, graph, db_connection, log):
+    if task.remaining_dependencies is None:
+        # the dependencies of pipelines started before they were counted
+        is_ready = await is_node_ready(task, graph, db_connection, log)
+    else:
+        is_ready = task.remaining_dependencies == 0
+    if not is_ready:
         log.debug("TASK %s NOT YET READY", task.internal_id)
         return
 
@@ -113,13 +143,21 @@ async def _try_get_task_from_db(
     return task
 
 
+def _dag_digest_column() -> sa.sql.ColumnElement:
+    # the digest identifies the version of the pipeline's dag
+    return sa.func.md5(sa.cast(comp_pipeline.c.dag_adjacency_list, sa.Text)).label(
+        "dag_digest"
+    )
+
+
 async def _get_pipeline_from_db(
     db_connection: SAConnection,
     project_id: str,
+    columns: List[sa.sql.ColumnElement],
 ) -> RowProxy:
     # get the pipeline
     result = await db_connection.execute(
-        comp_pipeline.select().where(comp_pipeline.c.project_id == project_id)
+        sa.select(columns).where(comp_pipeline.c.project_id == project_id)
     )
     if result.rowcount > 1:
         raise exceptions.DatabaseError(
@@ -133,39 +171,100 @@ async def _get_pipeline_from_db(
     return pipeline
 
 
+async def _get_execution_graph(
+    db_connection: SAConnection, project_id: str
+) -> ExecutionGraph:
+    """ Returns the cached graph of the pipeline, unless its dag changed """
+    cached = _execution_graphs.get(project_id)
+    if cached:
+        pipeline = await _get_pipeline_from_db(
+            db_connection, project_id, [_dag_digest_column()]
+        )
+        if pipeline.dag_digest == cached[0]:
+            _execution_graphs.move_to_end(project_id)
+            return cached[1]
+
+    pipeline = await _get_pipeline_from_db(
+        db_connection,
+        project_id,
+        [comp_pipeline.c.dag_adjacency_list, _dag_digest_column()],
+    )
+    graph = execution_graph(pipeline)
+    _execution_graphs[project_id] = (pipeline.dag_digest, graph)
+    _execution_graphs.move_to_end(project_id)
+    while len(_execution_graphs) > EXECUTION_GRAPHS_CACHE_MAX_SIZE:
+        _execution_graphs.popitem(last=False)
+    return graph
+
+
 async def _set_task_status(
-    db_engine: Engine, project_id: str, node_id: str, run_result
-):
+    db_engine: Engine,
+    project_id: str,
+    node_id: str,
+    run_result,
+    successors: Optional[List[str]] = None,
+) -> List[str]:
+    """Sets the task status, on success the successors have one dependency less
+
+    :return: the successors that are ready, or not counting their dependencies
+    """
     log.debug("setting task status of %s:%s to %s", project_id, node_id, run_result)
     async with db_engine.acquire() as connection:
-        await connection.execute(
-            # FIXME: E1120:No value for argument 'dml' in method call
-            # pylint: disable=E1120
-            comp_tasks.update()
-            .where(
-                and_(
-                    comp_tasks.c.node_id == node_id,
-                    comp_tasks.c.project_id == project_id,
+        async with connection.begin():
+            await connection.execute(
+                # FIXME: E1120:No value for argument 'dml' in method call
+                # pylint: disable=E1120
+                comp_tasks.update()
+                .where(
+                    and_(
+                        comp_tasks.c.node_id == node_id,
+                        comp_tasks.c.project_id == project_id,
+                    )
                 )
+                .values(state=run_result, end=datetime.utcnow())
             )
-            .values(state=run_result, end=datetime.utcnow())
-        )
+            if run_result != StateType.SUCCESS or not successors:
+                return []
+
+            result = await connection.execute(
+                # pylint: disable=no-value-for-parameter
+                comp_tasks.update()
+                .where(
+                    (comp_tasks.c.node_id.in_(successors))
+                    & (comp_tasks.c.project_id == project_id)
+                    & (comp_tasks.c.remaining_dependencies > 0)
+                )
+                .values(remaining_dependencies=comp_tasks.c.remaining_dependencies - 1)
+                .returning(comp_tasks.c.node_id, comp_tasks.c.remaining_dependencies)
+            )
+            remaining_dependencies = {
+                row.node_id: row.remaining_dependencies
+                for row in await result.fetchall()
+            }
+
+    return [
+        successor
+        for successor in successors
+        if remaining_dependencies.get(successor, 0) == 0
+    ]
 
 
 async def _set_pipeline_tasks_as_pending(
-    conn: SAConnection, graph: nx.DiGraph, project_id: str
+    conn: SAConnection, graph: ExecutionGraph, project_id: str
 ):
-    node_ids = list(graph.nodes)
-    for node_id in node_ids:
+    node_ids_per_num_dependencies: Dict[int, List[str]] = defaultdict(list)
+    for node_id in graph.nodes:
+        node_ids_per_num_dependencies[len(graph.predecessors(node_id))].append(node_id)
+    for num_dependencies, node_ids in node_ids_per_num_dependencies.items():
         await conn.execute(
             # pylint: disable=no-value-for-parameter
             comp_tasks.update()
             .where(
-                (comp_tasks.c.node_id == node_id)
+                (comp_tasks.c.node_id.in_(node_ids))
                 & (comp_tasks.c.project_id == project_id)
                 & (comp_tasks.c.state != StateType.ABORTED)
             )
-            .values(state=StateType.PENDING)
+            .values(state=StateType.PENDING, remaining_dependencies=num_dependencies)
         )
 
 
@@ -188,10 +287,9 @@ async def inspect(
         )
 
         task: Optional[RowProxy] = None
-        graph: Optional[nx.DiGraph] = None
+        graph: Optional[ExecutionGraph] = None
         async with db_engine.acquire() as connection:
-            pipeline: RowProxy = await _get_pipeline_from_db(connection, project_id)
-            graph = execution_graph(pipeline)
+            graph = await _get_execution_graph(connection, project_id)
             if not node_id:
                 log.debug("NODE id was zero, this was the entry node id")
                 await _set_pipeline_tasks_as_pending(connection, graph, project_id)
@@ -236,7 +334,6 @@ async def inspect(
             user_id=user_id,
         )
         await executor.run()
-        next_task_nodes = list(graph.successors(node_id))
         run_result = StateType.SUCCESS
     except asyncio.CancelledError:
         log.warning("Task has been cancelled")
@@ -252,6 +349,13 @@ async def inspect(
                 node_id,
                 f"[sidecar]Task completed with result: {run_result.name}",
             )
-            await _set_task_status(db_engine, project_id, node_id, run_result)
+            # only the successors without remaining dependencies are dispatched
+            next_task_nodes = await _set_task_status(
+                db_engine,
+                project_id,
+                node_id,
+                run_result,
+                successors=list(graph.successors(node_id)),
+            )
 
     return next_task_nodes
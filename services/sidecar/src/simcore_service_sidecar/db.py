@@ -1,8 +1,13 @@
 """ database submodule associated to the postgres uservice
 
+    The engine is created once per worker process and reused across tasks.
 """
+import asyncio
 import logging
+import os
 import socket
+import time
+from typing import Optional, Tuple
 
 import tenacity
 from aiopg.sa import Engine
@@ -10,46 +15,84 @@ from servicelib.aiopg_utils import (
     DataSourceName,
     PostgresRetryPolicyUponInitialization,
     create_pg_engine,
-    is_postgres_responsive,
+    is_pg_responsive,
+    raise_if_not_responsive,
 )
 
-from .config import POSTGRES_DB, POSTGRES_ENDPOINT, POSTGRES_PW, POSTGRES_USER
+from . import config
 
 log = logging.getLogger(__name__)
 
+# a reused engine is checked at most once in this interval
+DB_HEALTH_CHECK_INTERVAL_S: float = 30
 
-@tenacity.retry(**PostgresRetryPolicyUponInitialization().kwargs)
-async def wait_till_postgres_responsive(dsn: DataSourceName) -> None:
-    if not is_postgres_responsive(dsn):
-        raise Exception
+_engine: Optional[Engine] = None
+# the engine is bound to the process and to the event loop that created it
+_engine_key: Optional[Tuple[int, asyncio.AbstractEventLoop]] = None
+_engine_checked_at: float = 0
 
 
-class DBContextManager:
-    def __init__(self):
-        self._db_engine: Engine = None
+def _create_dsn() -> DataSourceName:
+    return DataSourceName(
+        application_name=f"{__name__}_{id(socket.gethostname())}",
+        database=config.POSTGRES_DB,
+        user=config.POSTGRES_USER,
+        password=config.POSTGRES_PW,
+        host=config.POSTGRES_ENDPOINT.split(":")[0],
+        port=config.POSTGRES_ENDPOINT.split(":")[1],
+    )
+
+
+@tenacity.retry(**PostgresRetryPolicyUponInitialization(log).kwargs)
+async def _create_db_engine(dsn: DataSourceName) -> Engine:
+    engine = await create_pg_engine(dsn, minsize=1, maxsize=4)
+    try:
+        await raise_if_not_responsive(engine)
+    except Exception:
+        engine.close()
+        await engine.wait_closed()
+        raise
+    return engine
+
+
+async def get_db_engine() -> Engine:
+    """ Returns the engine of this worker process, (re)connects if needed """
+    global _engine, _engine_key, _engine_checked_at  # pylint: disable=global-statement
+
+    key = (os.getpid(), asyncio.get_event_loop())
+    if _engine is not None and _engine_key == key and not _engine.closed:
+        if time.monotonic() - _engine_checked_at < DB_HEALTH_CHECK_INTERVAL_S:
+            return _engine
+        if await is_pg_responsive(_engine):
+            _engine_checked_at = time.monotonic()
+            return _engine
+        log.warning("Database connection lost, reconnecting...")
+        await close_db_engine()
+
+    dsn = _create_dsn()
+    log.info("Creating pg engine for %s", dsn)
+    # NOTE: an engine inherited from the parent process or bound to another loop
+    # cannot be closed from here, it is dropped
+    _engine = await _create_db_engine(dsn)
+    _engine_key = key
+    _engine_checked_at = time.monotonic()
+    return _engine
 
-    async def __aenter__(self):
-        dsn = DataSourceName(
-            application_name=f"{__name__}_{id(socket.gethostname())}",
-            database=POSTGRES_DB,
-            user=POSTGRES_USER,
-            password=POSTGRES_PW,
-            host=POSTGRES_ENDPOINT.split(":")[0],
-            port=POSTGRES_ENDPOINT.split(":")[1],
-        )
 
-        log.info("Creating pg engine for %s", dsn)
-        await wait_till_postgres_responsive(dsn)
-        engine = await create_pg_engine(dsn, minsize=1, maxsize=4)
-        self._db_engine = engine
-        return self._db_engine
+async def close_db_engine() -> None:
+    global _engine, _engine_key  # pylint: disable=global-statement
 
-    async def __aexit__(self, exc_type, exc, tb):
-        self._db_engine.close()
-        await self._db_engine.wait_closed()
+    if _engine is not None and _engine_key == (
+        os.getpid(),
+        asyncio.get_event_loop(),
+    ):
+        _engine.close()
+        await _engine.wait_closed()
         log.debug(
             "engine '%s' after shutdown: closed=%s, size=%d",
-            self._db_engine.dsn,
-            self._db_engine.closed,
-            self._db_engine.size,
+            _engine.dsn,
+            _engine.closed,
+            _engine.size,
         )
+    _engine = None
+    _engine_key = None
@@ -6,7 +6,7 @@ import shutil
 import time
 import zipfile
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Awaitable, Dict, List, Optional, Union
 
 import aiopg
 import attr
@@ -17,7 +17,9 @@ from celery.utils.log import get_task_logger
 from packaging import version
 from servicelib.utils import fire_and_forget_task, logged_gather
 from simcore_sdk import node_data, node_ports
+from simcore_sdk.node_ports import filemanager
 from simcore_sdk.node_ports.dbmanager import DBManager
+from simcore_sdk.node_ports.download_cache import link_or_copy
 
 from . import config, exceptions
 from .boot_mode import get_boot_mode
@@ -33,6 +35,7 @@ class TaskSharedVolumes:
     input_folder: Optional[Path] = None
     output_folder: Optional[Path] = None
     log_folder: Optional[Path] = None
+    download_folder: Optional[Path] = None
 
     @classmethod
     def from_task(cls, task: aiopg.sa.result.RowProxy):
@@ -40,6 +43,7 @@ class TaskSharedVolumes:
             config.SIDECAR_INPUT_FOLDER / f"{task.job_id}",
             config.SIDECAR_OUTPUT_FOLDER / f"{task.job_id}",
             config.SIDECAR_LOG_FOLDER / f"{task.job_id}",
+            config.SIDECAR_INPUT_DOWNLOAD_FOLDER / f"{task.job_id}",
         )
 
     def create(self) -> None:
@@ -47,6 +51,7 @@ class TaskSharedVolumes:
             self.input_folder,
             self.output_folder,
             self.log_folder,
+            self.download_folder,
         ]:
             if folder.exists():
                 shutil.rmtree(str(folder))
@@ -57,6 +62,7 @@ class TaskSharedVolumes:
             self.input_folder,
             self.output_folder,
             self.log_folder,
+            self.download_folder,
         ]:
             if folder.exists():
 
@@ -80,6 +86,8 @@ class Executor:
     stack_name: str = config.SWARM_STACK_NAME
     shared_folders: TaskSharedVolumes = None
     integration_version: version.Version = version.parse("0.0.0")
+    # duration in seconds of the pull, inputs, run, outputs and logs phases
+    phase_durations: Dict[str, float] = attr.Factory(dict)
 
     async def run(self):
         log.debug(
@@ -109,29 +117,56 @@ class Executor:
             ) from exc
         finally:
             await self.cleanup()
+            if self.phase_durations:
+                try:
+                    await self.rabbit_mq.post_instrumentation_message(
+                        {
+                            "metrics": "service_phases",
+                            "user_id": self.user_id,
+                            "project_id": self.task.project_id,
+                            "service_uuid": self.task.node_id,
+                            "service_type": "COMPUTATIONAL",
+                            "service_key": self.task.image["name"],
+                            "service_tag": self.task.image["tag"],
+                            "phases": self.phase_durations,
+                        }
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    # the metrics must not hide the outcome of the task
+                    log.warning(
+                        "Failed to publish the service phases of %s",
+                        self.task.node_id,
+                        exc_info=True,
+                    )
 
     async def preprocess(self):
         await self._post_messages(LogType.LOG, "[sidecar]Preprocessing...")
         log.debug("Pre-Processing...")
         self.shared_folders = TaskSharedVolumes.from_task(self.task)
         self.shared_folders.create()
+        node_ports.node_config.DOWNLOAD_FOLDER = str(
+            self.shared_folders.download_folder
+        )
         host_name = config.SIDECAR_HOST_HOSTNAME_PATH.read_text()
         await self._post_messages(LogType.LOG, f"[sidecar]Running on {host_name}")
-        results = await logged_gather(self._process_task_inputs(), self._pull_image())
+        results = await logged_gather(
+            self._timed("inputs", self._process_task_inputs()),
+            self._timed("pull", self._pull_image()),
+        )
         await self._write_input_file(results[0])
         log.debug("Pre-Processing Pipeline DONE")
 
     async def process(self):
         log.debug("Processing...")
         await self._post_messages(LogType.LOG, "[sidecar]Processing...")
-        await self._run_container()
+        await self._timed("run", self._run_container())
         log.debug("Processing DONE")
 
     async def postprocess(self):
         log.debug("Post-Processing...")
         await self._post_messages(LogType.LOG, "[sidecar]Postprocessing...")
-        await self._process_task_output()
-        await self._process_task_log()
+        await self._timed("outputs", self._process_task_output())
+        await self._timed("logs", self._process_task_log())
         log.debug("Post-Processing DONE")
 
     async def cleanup(self):
@@ -142,6 +177,14 @@ class Executor:
         await self._post_messages(LogType.LOG, "[sidecar]Cleaning completed")
         log.debug("Cleaning DONE")
 
+    async def _timed(self, phase: str, coro: Awaitable):
+        start_time = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.phase_durations[phase] = time.perf_counter() - start_time
+            log.debug("%s phase took %ss", phase, self.phase_durations[phase])
+
     async def _get_node_ports(self):
         if self.db_manager is None:
             # Keeps single db engine: simcore_sdk.node_ports.dbmanager_{id}
@@ -158,7 +201,7 @@ class Executor:
                 mapped_filename = Path(path).name
                 input_ports[port.key] = str(port_value)
                 final_path = self.shared_folders.input_folder / mapped_filename
-                shutil.copy(str(path), str(final_path))
+                link_or_copy(Path(path), final_path)
                 log.debug(
                     "DOWNLOAD successfull from %s to %s via %s",
                     port.key,
@@ -200,6 +243,9 @@ class Executor:
                 for port in (await PORTS.inputs)
             ]
         )
+        download_cache = filemanager.get_download_cache()
+        if download_cache:
+            log.info("Input cache statistics: %s", download_cache.stats)
         log.debug("Inputs parsing DONE")
         return input_ports
 
@@ -344,24 +390,21 @@ class Executor:
                 )
 
                 # wait until the container finished, either success or fail or timeout
-                container_data = await container.show()
-                TIME_TO_NEXT_PERDIODIC_CHECK_SECS = 2
-                while container_data["State"]["Running"]:
-                    await asyncio.sleep(TIME_TO_NEXT_PERDIODIC_CHECK_SECS)
-                    # reload container data
-                    container_data = await container.show()
-                    if (
-                        (time.perf_counter() - start_time)
-                        > config.SERVICES_TIMEOUT_SECONDS
-                        and config.SERVICES_TIMEOUT_SECONDS > 0
-                    ):
-                        log.error(
-                            "Running container timed-out after %ss and will be stopped now\nlogs: %s",
-                            config.SERVICES_TIMEOUT_SECONDS,
-                            container.log(stdout=True, stderr=True),
-                        )
-                        await container.stop()
-                        break
+                # NOTE: docker answers the wait request as soon as the container stops
+                try:
+                    await container.wait(
+                        timeout=config.SERVICES_TIMEOUT_SECONDS
+                        if config.SERVICES_TIMEOUT_SECONDS > 0
+                        else None
+                    )
+                except asyncio.TimeoutError:
+                    logs = await container.log(stdout=True, stderr=True, tail=10)
+                    log.error(
+                        "Running container timed-out after %ss and will be stopped now\nlogs: %s",
+                        config.SERVICES_TIMEOUT_SECONDS,
+                        logs,
+                    )
+                    await container.stop()
 
                 # reload container data to check the error code with latest info
                 container_data = await container.show()
@@ -375,8 +418,6 @@ class Executor:
                     raise exc
                 # clean up the container
                 await container.delete(force=True)
-                # ensure progress 1.0 is sent
-                await self._post_messages(LogType.PROGRESS, "1.0")
                 result = "SUCCESS"
                 log.info("%s completed with successfully!", docker_image)
         except DockerContainerError:
@@ -404,6 +445,9 @@ class Executor:
             if log_processor_task:
                 log_processor_task.cancel()
                 await log_processor_task
+            if result == "SUCCESS":
+                # ensure progress 1.0 is sent after the last logs of the service
+                await self._post_messages(LogType.PROGRESS, "1.0")
             # instrumentation
             await self.rabbit_mq.post_instrumentation_message(
                 {
@@ -439,25 +483,25 @@ class Executor:
                 if self.integration_version == version.parse("0.0.0")
                 else "outputs"
             )
-            file_upload_tasks = []
-            for file_path in self.shared_folders.output_folder.rglob("*"):
-                if file_path.name == f"{stem}.json":
-                    log.debug("POSTPRO found %s.json", stem)
-                    # parse and compare/update with the tasks output ports from db
-                    with file_path.open() as fp:
-                        output_ports = json.load(fp)
-                        task_outputs = await PORTS.outputs
-                        for port in task_outputs:
-                            if port.key in output_ports.keys():
-                                await port.set(output_ports[port.key])
-                else:
-                    log.debug("POSTPRO found %s", file_path)
-                    file_upload_tasks.append(PORTS.set_file_by_keymap(file_path))
-            if file_upload_tasks:
-                log.debug("POSTPRO uploading %d files...", len(file_upload_tasks))
-                # WARNING: nodeports is NOT concurrent-safe, dont' use gather here
-                for coro in file_upload_tasks:
-                    await coro
+            # the ports are written once in the DB, when all outputs are set
+            async with PORTS.write_batch():
+                file_upload_tasks = []
+                for file_path in self.shared_folders.output_folder.rglob("*"):
+                    if file_path.name == f"{stem}.json":
+                        log.debug("POSTPRO found %s.json", stem)
+                        # parse and compare/update with the tasks output ports from db
+                        with file_path.open() as fp:
+                            output_ports = json.load(fp)
+                            task_outputs = await PORTS.outputs
+                            for port in task_outputs:
+                                if port.key in output_ports.keys():
+                                    await port.set(output_ports[port.key])
+                    else:
+                        log.debug("POSTPRO found %s", file_path)
+                        file_upload_tasks.append(PORTS.set_file_by_keymap(file_path))
+                if file_upload_tasks:
+                    log.debug("POSTPRO uploading %d files...", len(file_upload_tasks))
+                    await logged_gather(*file_upload_tasks, log=log)
         except node_ports.exceptions.NodeNotFound:
             await self._error_message_to_ui_and_logs(
                 "Error: no ports info found in the database."
@@ -486,7 +530,7 @@ class Executor:
             )
         log.debug("Processing Logs DONE")
 
-    async def _post_messages(self, log_type: LogType, message: str):
+    async def _post_messages(self, log_type: LogType, message: Union[str, List[str]]):
         if log_type == LogType.LOG:
             await self.rabbit_mq.post_log_message(
                 self.user_id,
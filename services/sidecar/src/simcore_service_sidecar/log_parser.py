@@ -2,9 +2,11 @@ import asyncio
 import logging
 import re
 import tempfile
+import time
+from contextlib import suppress
 from enum import Enum
 from pathlib import Path
-from typing import Awaitable, Callable, Optional, Tuple, Union
+from typing import Awaitable, Callable, List, Optional, Tuple, Union
 
 import aiofiles
 from aiodocker.containers import DockerContainer
@@ -15,6 +17,15 @@ from . import exceptions
 
 log = logging.getLogger(__name__)
 
+# a log file is polled more and more slowly while it does not grow
+LOG_FILE_POLL_MIN_INTERVAL_S: float = 0.05
+LOG_FILE_POLL_MAX_INTERVAL_S: float = 1.0
+# the log lines are published in batches, at least once per interval
+LOG_PUBLISH_INTERVAL_S: float = 0.5
+LOG_PUBLISH_MAX_LINES: int = 1000
+# the docker logs are written in chunks of this size
+LOG_FILE_WRITE_CHUNK_SIZE: int = 64 * 1024
+
 
 class LogType(Enum):
     LOG = 1
@@ -59,22 +70,86 @@ async def parse_line(line: str) -> Tuple[LogType, str]:
         return (LogType.LOG, f"[task] {line}")
 
 
+class LogPublisher:
+    """Publishes the log lines of a service in batches
+
+    The lines gathered during LOG_PUBLISH_INTERVAL_S are published at once in
+    a single log message and only the latest progress is published.
+    """
+
+    def __init__(
+        self,
+        log_cb: Awaitable[Callable[[LogType, Union[str, List[str]]], None]],
+        interval: float = LOG_PUBLISH_INTERVAL_S,
+        max_lines: int = LOG_PUBLISH_MAX_LINES,
+    ):
+        self.log_cb = log_cb
+        self.interval = interval
+        self.max_lines = max_lines
+        self._lines: List[str] = []
+        self._progress: Optional[str] = None
+        self._last_flush_time = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        # keeps the batches in order
+        self._flush_lock = asyncio.Lock()
+
+    async def publish(self, log_type: LogType, message: str) -> None:
+        if log_type == LogType.PROGRESS:
+            self._progress = message
+        else:
+            self._lines.append(message)
+        if len(self._lines) >= self.max_lines:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            lines, self._lines = self._lines, []
+            progress, self._progress = self._progress, None
+            self._last_flush_time = time.monotonic()
+            if lines:
+                await self.log_cb(LogType.LOG, lines)
+            if progress is not None:
+                await self.log_cb(LogType.PROGRESS, progress)
+
+    async def _periodic_flush(self) -> None:
+        while True:
+            await asyncio.sleep(
+                self._last_flush_time + self.interval - time.monotonic()
+            )
+            if time.monotonic() - self._last_flush_time >= self.interval:
+                await asyncio.shield(self.flush())
+
+    async def __aenter__(self):
+        self._flush_task = asyncio.ensure_future(self._periodic_flush())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._flush_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._flush_task
+        # the last lines are always published
+        await self.flush()
+
+
 async def monitor_logs_task(
     mon_log_file_or_container: Union[Path, DockerContainer],
-    log_cb: Awaitable[Callable[[LogType, str], None]],
+    log_cb: Awaitable[Callable[[LogType, Union[str, List[str]]], None]],
     out_log_file: Optional[Path] = None,
 ) -> None:
     try:
-        if isinstance(mon_log_file_or_container, Path):
-            log.debug("start monitoring log in %s", mon_log_file_or_container)
-            await _monitor_log_file(mon_log_file_or_container, log_cb)
-        elif isinstance(mon_log_file_or_container, DockerContainer):
-            log.debug("start monitoring docker logs of %s", mon_log_file_or_container)
-            await _monitor_docker_container(
-                mon_log_file_or_container, log_cb, out_log_file
-            )
-        else:
-            raise exceptions.SidecarException("Invalid log type")
+        async with LogPublisher(log_cb) as publisher:
+            if isinstance(mon_log_file_or_container, Path):
+                log.debug("start monitoring log in %s", mon_log_file_or_container)
+                await _monitor_log_file(mon_log_file_or_container, publisher.publish)
+            elif isinstance(mon_log_file_or_container, DockerContainer):
+                log.debug(
+                    "start monitoring docker logs of %s", mon_log_file_or_container
+                )
+                await _monitor_docker_container(
+                    mon_log_file_or_container, publisher.publish, out_log_file
+                )
+            else:
+                raise exceptions.SidecarException("Invalid log type")
 
     except asyncio.CancelledError:
         # user cancels
@@ -97,10 +172,20 @@ async def _monitor_docker_container(
     try:
         async with AIOFile(str(log_file), "w+") as afp:
             writer = Writer(afp)
-            async for line in container.log(stdout=True, stderr=True, follow=True):
-                log_type, parsed_line = await parse_line(line)
-                await log_cb(log_type, parsed_line)
-                await writer(f"{log_type.name}: {parsed_line}")
+            chunk: List[str] = []
+            chunk_size = 0
+            try:
+                async for line in container.log(stdout=True, stderr=True, follow=True):
+                    log_type, parsed_line = await parse_line(line)
+                    await log_cb(log_type, parsed_line)
+                    chunk.append(f"{log_type.name}: {parsed_line}")
+                    chunk_size += len(chunk[-1])
+                    if chunk_size >= LOG_FILE_WRITE_CHUNK_SIZE:
+                        await writer("".join(chunk))
+                        chunk, chunk_size = [], 0
+            finally:
+                if chunk:
+                    await writer("".join(chunk))
     except DockerError as e:
         log_type, parsed_line = await parse_line(f"Could not recover logs because: {e}")
         await log_cb(log_type, parsed_line)
@@ -113,16 +198,29 @@ async def _monitor_docker_container(
 async def _monitor_log_file(
     log_file, log_cb: Awaitable[Callable[[LogType, str], None]]
 ) -> None:
+    async def _process_line(line: str) -> None:
+        log.debug("log monitoring: found log %s", line)
+        log_type, parsed_line = await parse_line(line)
+        await log_cb(log_type, parsed_line)
+
     async with aiofiles.open(log_file, mode="r") as file_pointer:
         log.debug("log monitoring: opened %s", log_file)
         await file_pointer.seek(0, 2)
-        while True:
-            # try to read line
+        poll_interval = LOG_FILE_POLL_MIN_INTERVAL_S
+        try:
+            while True:
+                # try to read line
+                line = await file_pointer.readline()
+                if not line:
+                    await asyncio.sleep(poll_interval)
+                    poll_interval = min(2 * poll_interval, LOG_FILE_POLL_MAX_INTERVAL_S)
+                    continue
+                poll_interval = LOG_FILE_POLL_MIN_INTERVAL_S
+                await _process_line(line)
+        except asyncio.CancelledError:
+            # the monitoring stops when the container stopped, its last lines are still processed
             line = await file_pointer.readline()
-            if not line:
-                asyncio.sleep(1)
-                continue
-            log.debug("log monitoring: found log %s", line)
-            log_type, parsed_line = await parse_line(line)
-
-            await log_cb(log_type, parsed_line)
+            while line:
+                await _process_line(line)
+                line = await file_pointer.readline()
+            raise
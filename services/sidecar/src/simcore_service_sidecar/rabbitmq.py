@@ -1,8 +1,10 @@
+import asyncio
 import json
 import logging
+import os
 import socket
 from asyncio.futures import CancelledError
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import aio_pika
 import tenacity
@@ -14,6 +16,9 @@ from . import config
 
 log = logging.getLogger(__file__)
 
+# a reused connection must answer within this time
+RABBIT_HEALTH_CHECK_TIMEOUT_S: float = 5
+
 
 def _close_callback(sender: Any, exc: Optional[BaseException]):
     if exc:
@@ -81,6 +86,39 @@ class RabbitMQ(BaseModel):
             aio_pika.ExchangeType.FANOUT,
         )
 
+    @property
+    def is_connected(self) -> bool:
+        return bool(
+            self.connection
+            and not self.connection.is_closed
+            and self.channel
+            and not self.channel.is_closed
+        )
+
+    async def is_responsive(self) -> bool:
+        """Checks the connection with a round trip to the broker
+
+        NOTE: the is_closed flags are only updated while the event loop runs, i.e.
+        a connection dropped by the broker between two tasks still looks connected
+        """
+        if not self.is_connected:
+            return False
+        try:
+            await asyncio.wait_for(
+                self.channel.declare_exchange(
+                    self.celery_config.rabbit.channels["log"],
+                    aio_pika.ExchangeType.FANOUT,
+                    passive=True,
+                ),
+                timeout=RABBIT_HEALTH_CHECK_TIMEOUT_S,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            log.warning("Rabbit connection is not responsive", exc_info=True)
+            return False
+        return self.is_connected
+
     async def close(self):
         log.debug("Closing channel...")
         await self.channel.close()
@@ -143,6 +181,43 @@ class RabbitMQ(BaseModel):
         await self.close()
 
 
+_rabbit_mq: Optional[RabbitMQ] = None
+# the connection is bound to the process and to the event loop that created it
+_rabbit_mq_key: Optional[Tuple[int, asyncio.AbstractEventLoop]] = None
+
+
+async def get_rabbitmq() -> RabbitMQ:
+    """ Returns the connection of this worker process, (re)connects if needed """
+    global _rabbit_mq, _rabbit_mq_key  # pylint: disable=global-statement
+
+    key = (os.getpid(), asyncio.get_event_loop())
+    if _rabbit_mq is not None and _rabbit_mq_key == key:
+        if await _rabbit_mq.is_responsive():
+            return _rabbit_mq
+        log.warning("Rabbit connection lost, reconnecting...")
+        await close_rabbitmq()
+
+    rabbit_mq = RabbitMQ()
+    await rabbit_mq.connect()
+    _rabbit_mq, _rabbit_mq_key = rabbit_mq, key
+    return _rabbit_mq
+
+
+async def close_rabbitmq() -> None:
+    global _rabbit_mq, _rabbit_mq_key  # pylint: disable=global-statement
+
+    if _rabbit_mq is not None and _rabbit_mq_key == (
+        os.getpid(),
+        asyncio.get_event_loop(),
+    ):
+        try:
+            await _rabbit_mq.close()
+        except Exception:  # pylint: disable=broad-except
+            log.warning("Failed to close rabbit connection", exc_info=True)
+    _rabbit_mq = None
+    _rabbit_mq_key = None
+
+
 @tenacity.retry(**RabbitMQRetryPolicyUponInitialization().kwargs)
 async def _wait_till_rabbit_responsive(url: str):
     connection = await aio_pika.connect(url)
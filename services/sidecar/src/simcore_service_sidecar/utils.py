@@ -1,10 +1,11 @@
 import asyncio
 import logging
+import os
 import uuid
-from typing import Awaitable, List
+from typing import Awaitable, Dict, List, Optional, Tuple
 
 import aiodocker
-import networkx as nx
+import attr
 from aiodocker.volumes import DockerVolume
 from aiopg.sa import SAConnection
 from aiopg.sa.result import RowProxy
@@ -18,21 +19,58 @@ from .mpi_lock import acquire_mpi_lock
 logger = logging.getLogger(__name__)
 
 
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+
+
+def get_worker_event_loop() -> asyncio.AbstractEventLoop:
+    """Returns the event loop of this process, it persists across tasks
+
+    NOTE: celery forks the worker processes, a loop inherited from the parent
+    process (and the connections bound to it) must not be used
+    """
+    global _loop, _loop_pid  # pylint: disable=global-statement
+
+    if _loop is None or _loop_pid != os.getpid() or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
 def wrap_async_call(fct: Awaitable):
-    return asyncio.get_event_loop().run_until_complete(fct)
+    return get_worker_event_loop().run_until_complete(fct)
 
 
-def find_entry_point(g: nx.DiGraph) -> List:
+@attr.s(auto_attribs=True, frozen=True)
+class ExecutionGraph:
+    """ Adjacency lists of the pipeline's dag in both directions """
+
+    _successors: Dict[str, Tuple[str, ...]]
+    _predecessors: Dict[str, Tuple[str, ...]]
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._successors)
+
+    def successors(self, node: str) -> Tuple[str, ...]:
+        return self._successors[node]
+
+    def predecessors(self, node: str) -> Tuple[str, ...]:
+        return self._predecessors[node]
+
+
+def find_entry_point(g: ExecutionGraph) -> List:
     result = []
     for node in g.nodes:
-        if len(list(g.predecessors(node))) == 0:
+        if len(g.predecessors(node)) == 0:
             result.append(node)
     return result
 
 
 async def is_node_ready(
     task: RowProxy,
-    graph: nx.DiGraph,
+    graph: ExecutionGraph,
     db_connection: SAConnection,
     _logger: logging.Logger,
 ) -> bool:
@@ -62,17 +100,24 @@ async def is_node_ready(
     return True
 
 
-def execution_graph(pipeline: RowProxy) -> nx.DiGraph:
+def execution_graph(pipeline: RowProxy) -> ExecutionGraph:
     d = pipeline.dag_adjacency_list
-    G = nx.DiGraph()
-
-    for node in d.keys():
-        nodes = d[node]
-        if len(nodes) == 0:
-            G.add_node(node)
-            continue
-        G.add_edges_from([(node, n) for n in nodes])
-    return G
+    successors: Dict[str, List[str]] = {}
+    predecessors: Dict[str, List[str]] = {}
+
+    for node, next_nodes in d.items():
+        successors.setdefault(node, [])
+        predecessors.setdefault(node, [])
+        for next_node in next_nodes:
+            if next_node in successors[node]:
+                continue
+            successors[node].append(next_node)
+            successors.setdefault(next_node, [])
+            predecessors.setdefault(next_node, []).append(node)
+    return ExecutionGraph(
+        {node: tuple(nodes) for node, nodes in successors.items()},
+        {node: tuple(nodes) for node, nodes in predecessors.items()},
+    )
 
 
 def is_gpu_node() -> bool:
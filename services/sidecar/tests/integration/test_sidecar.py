@@ -139,9 +139,9 @@ async def _assert_incoming_data_logs(
                 progress_logs[message["Node"]].append(float(message["Progress"]))
 
     for task in tasks:
-        # the instrumentation should have 2 messages, start and stop
+        # the instrumentation should have 3 messages, start, stop and phases
         assert instrumentation_messages[task], f"{instrumentation_messages}"
-        assert len(instrumentation_messages[task]) == 2, f"{instrumentation_messages}"
+        assert len(instrumentation_messages[task]) == 3, f"{instrumentation_messages}"
         assert instrumentation_messages[task][0]["metrics"] == "service_started"
         assert instrumentation_messages[task][0]["user_id"] == user_id
         assert instrumentation_messages[task][0]["project_id"] == project_id
@@ -167,6 +167,16 @@ async def _assert_incoming_data_logs(
         assert instrumentation_messages[task][1]["service_tag"] == service_tag
         assert instrumentation_messages[task][1]["result"] == "SUCCESS"
 
+        assert instrumentation_messages[task][2]["metrics"] == "service_phases"
+        assert instrumentation_messages[task][2]["service_uuid"] == task
+        assert set(instrumentation_messages[task][2]["phases"]) == {
+            "pull",
+            "inputs",
+            "run",
+            "outputs",
+            "logs",
+        }
+
         # the sidecar should have a fixed amount of logs
         assert sidecar_logs[task], f"No sidecar logs for {task}"
         # the tasks should have a variable amount of logs
@@ -407,8 +417,13 @@ async def test_run_services(
         service_tag,
     )
 
-    # check input/output/log folder is empty
-    assert not list(config.SIDECAR_INPUT_FOLDER.glob("**/*"))
+    # check input/output/log folder is empty (the inputs cache is kept)
+    assert not [
+        path
+        for path in config.SIDECAR_INPUT_FOLDER.glob("**/*")
+        if not path.relative_to(config.SIDECAR_INPUT_FOLDER).parts[0].startswith(".")
+    ]
+    assert not list(config.SIDECAR_INPUT_DOWNLOAD_FOLDER.glob("*"))
     assert not list(config.SIDECAR_OUTPUT_FOLDER.glob("**/*"))
     assert not list(config.SIDECAR_LOG_FOLDER.glob("**/*"))
 
@@ -0,0 +1,84 @@
+# pylint: disable=unused-argument
+# pylint: disable=redefined-outer-name
+import statistics
+import time
+from typing import Dict
+
+import pytest
+from models_library.settings.celery import CeleryConfig
+from models_library.settings.rabbit import RabbitConfig
+from simcore_service_sidecar import cli, config, db, rabbitmq
+
+core_services = ["postgres", "rabbit"]
+
+NUM_TASKS = 20
+
+
+@pytest.fixture
+async def worker_config(
+    loop, postgres_host_config: Dict[str, str], rabbit_service: RabbitConfig
+) -> None:
+    config.POSTGRES_DB = postgres_host_config["database"]
+    config.POSTGRES_ENDPOINT = (
+        f"{postgres_host_config['host']}:{postgres_host_config['port']}"
+    )
+    config.POSTGRES_USER = postgres_host_config["user"]
+    config.POSTGRES_PW = postgres_host_config["password"]
+    config.CELERY_CONFIG = CeleryConfig.create_from_env()
+
+    yield
+
+    await cli.close_worker_connections()
+
+
+async def _get_task_connections():
+    return await db.get_db_engine(), await rabbitmq.get_rabbitmq()
+
+
+async def test_connections_overhead_per_task(worker_config):
+    start = time.perf_counter()
+    engine, rabbit_mq = await _get_task_connections()
+    first_task_overhead = time.perf_counter() - start
+
+    overheads = []
+    for _ in range(NUM_TASKS):
+        start = time.perf_counter()
+        assert await _get_task_connections() == (engine, rabbit_mq)
+        overheads.append(time.perf_counter() - start)
+
+    print(
+        f"connections overhead: first task {first_task_overhead * 1000:.1f}ms, "
+        f"next tasks {statistics.median(overheads) * 1000:.3f}ms (median)"
+    )
+    assert max(overheads) < first_task_overhead
+
+
+async def test_connections_are_restored(worker_config):
+    engine, rabbit_mq = await _get_task_connections()
+
+    await rabbit_mq.connection.close()
+    new_rabbit_mq = await rabbitmq.get_rabbitmq()
+    assert new_rabbit_mq is not rabbit_mq
+    assert new_rabbit_mq.is_connected
+
+    engine.close()
+    await engine.wait_closed()
+    new_engine = await db.get_db_engine()
+    assert new_engine is not engine
+    assert not new_engine.closed
+
+
+async def test_connection_dropped_while_idle_is_restored(worker_config):
+    rabbit_mq = await rabbitmq.get_rabbitmq()
+
+    # the broker drops the connection of an idle worker, e.g. missed heartbeats.
+    # Between two tasks the event loop does not run, so nothing notices it
+    rabbit_mq.connection.connection.writer.transport.abort()
+    assert rabbit_mq.is_connected
+
+    new_rabbit_mq = await rabbitmq.get_rabbitmq()
+    assert new_rabbit_mq is not rabbit_mq
+    assert new_rabbit_mq.is_connected
+    await new_rabbit_mq.post_log_message(
+        "some_user", "some_project", "some_node", "a log"
+    )
@@ -0,0 +1,48 @@
+# pylint: disable=unused-argument,redefined-outer-name,no-member
+from typing import Dict, List
+
+from simcore_service_sidecar import celery_task, config
+
+
+def test_post_tasks_to_next_workers(mocker):
+    required_resources = {
+        "cpu_node_1": {"requires_gpu": False, "requires_mpi": False},
+        "gpu_node": {"requires_gpu": True, "requires_mpi": False},
+        "mpi_node": {"requires_gpu": True, "requires_mpi": True},
+        "cpu_node_2": {"requires_gpu": False, "requires_mpi": False},
+    }
+    queried_node_ids: List[List[str]] = []
+
+    async def fake_tasks_required_resources(
+        project_id: str, node_ids: List[str]
+    ) -> Dict[str, Dict[str, bool]]:
+        queried_node_ids.append(node_ids)
+        return required_resources
+
+    mocker.patch.object(
+        celery_task, "tasks_required_resources", fake_tasks_required_resources
+    )
+    app = mocker.MagicMock()
+
+    celery_task.post_tasks_to_next_workers(
+        app, "some_user", "some_project", [*required_resources, "missing_node"]
+    )
+
+    # the resources are fetched at once
+    assert queried_node_ids == [[*required_resources, "missing_node"]]
+    # a single producer is used for all tasks
+    app.producer_or_acquire.assert_called_once()
+    producer = app.producer_or_acquire.return_value.__enter__.return_value
+    dispatched = [
+        (args[0], kwargs["kwargs"]["node_id"])
+        for args, kwargs in app.send_task.call_args_list
+    ]
+    assert all(
+        kwargs["producer"] is producer for _, kwargs in app.send_task.call_args_list
+    )
+    assert dispatched == [
+        (config.CPU_QUEUE_NAME, "cpu_node_1"),
+        (config.CPU_QUEUE_NAME, "cpu_node_2"),
+        (config.GPU_QUEUE_NAME, "gpu_node"),
+        (config.MPI_QUEUE_NAME, "mpi_node"),
+    ]
@@ -0,0 +1,33 @@
+# pylint: disable=unused-argument,redefined-outer-name
+from types import SimpleNamespace
+
+from simcore_service_sidecar.utils import execution_graph, find_entry_point
+
+
+def test_execution_graph():
+    pipeline = SimpleNamespace(
+        dag_adjacency_list={
+            "node_1": ["node_3", "node_4"],
+            "node_2": ["node_4"],
+            "node_3": ["node_5"],
+            "node_4": ["node_5", "node_5"],
+            "node_6": [],
+        }
+    )
+    graph = execution_graph(pipeline)
+
+    assert graph.nodes == [
+        "node_1",
+        "node_3",
+        "node_4",
+        "node_2",
+        "node_5",
+        "node_6",
+    ]
+    assert find_entry_point(graph) == ["node_1", "node_2", "node_6"]
+    assert graph.successors("node_1") == ("node_3", "node_4")
+    assert graph.successors("node_4") == ("node_5",)
+    assert graph.successors("node_5") == ()
+    assert graph.predecessors("node_4") == ("node_1", "node_2")
+    assert graph.predecessors("node_5") == ("node_3", "node_4")
+    assert graph.predecessors("node_6") == ()
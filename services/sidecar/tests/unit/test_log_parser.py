@@ -2,7 +2,12 @@ from asyncio import Future, ensure_future, sleep
 from pathlib import Path
 
 import pytest
-from simcore_service_sidecar.log_parser import LogType, monitor_logs_task, parse_line
+from simcore_service_sidecar.log_parser import (
+    LogPublisher,
+    LogType,
+    monitor_logs_task,
+    parse_line,
+)
 
 
 @pytest.mark.parametrize(
@@ -60,3 +65,42 @@ async def test_monitor_log_task(temp_folder: Path, mocker):
     await sleep(2)
     mock_cb.assert_called_once()
     assert task.cancel()
+
+
+async def test_monitor_log_task_processes_last_lines(temp_folder: Path, mocker):
+    mock_cb = mocker.Mock(return_value=future_with_result(""))
+    log_file = temp_folder / "test_log.txt"
+    log_file.touch()
+    task = ensure_future(monitor_logs_task(log_file, mock_cb))
+    await sleep(1)
+    # the monitoring is stopped right after the container wrote its last logs
+    log_file.write_text("this is a test\n[progress] 1.0\n")
+    assert task.cancel()
+    await task
+    assert [call[0] for call in mock_cb.call_args_list] == [
+        (LogType.LOG, ["[task] this is a test\n"]),
+        (LogType.PROGRESS, "1.0"),
+    ]
+
+
+async def test_log_publisher_batches_messages(mocker):
+    mock_cb = mocker.Mock(return_value=future_with_result(""))
+    async with LogPublisher(mock_cb, interval=0.5, max_lines=3) as publisher:
+        await publisher.publish(LogType.LOG, "line 1")
+        await publisher.publish(LogType.PROGRESS, "0.1")
+        await publisher.publish(LogType.PROGRESS, "0.2")
+        mock_cb.assert_not_called()
+        await sleep(1)
+        # the lines of the interval are published at once with the latest progress
+        assert [call[0] for call in mock_cb.call_args_list] == [
+            (LogType.LOG, ["line 1"]),
+            (LogType.PROGRESS, "0.2"),
+        ]
+        mock_cb.reset_mock()
+
+        for n in range(2, 6):
+            await publisher.publish(LogType.LOG, f"line {n}")
+        # a full batch does not wait for the interval
+        mock_cb.assert_called_once_with(LogType.LOG, ["line 2", "line 3", "line 4"])
+    # the remaining lines are published when leaving
+    mock_cb.assert_called_with(LogType.LOG, ["line 5"])
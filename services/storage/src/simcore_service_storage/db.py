@@ -1,6 +1,9 @@
 import logging
+from typing import List
 
 from aiohttp import web
+from aiopg.sa.connection import SAConnection
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from tenacity import Retrying
 
 from servicelib.aiopg_utils import (
@@ -12,13 +15,16 @@ from servicelib.aiopg_utils import (
     raise_if_not_responsive,
 )
 
-from .models import metadata
+from .models import FileMetaData, file_meta_data, metadata
 from .settings import APP_CONFIG_KEY, APP_DB_ENGINE_KEY
 
 log = logging.getLogger(__name__)
 
 THIS_SERVICE_NAME = "postgres"
 
+# maximum number of rows per INSERT statement in bulk operations
+BULK_INSERT_CHUNK_SIZE = 500
+
 
 async def pg_engine(app: web.Application):
     pg_cfg = app[APP_CONFIG_KEY][THIS_SERVICE_NAME]
@@ -63,13 +69,35 @@ async def pg_engine(app: web.Application):
 
 
 async def is_service_responsive(app: web.Application):
-    """ Returns true if the app can connect to db service
-
-    """
+    """Returns true if the app can connect to db service"""
     is_responsive = await is_pg_responsive(engine=app[APP_DB_ENGINE_KEY])
     return is_responsive
 
 
+async def upsert_file_meta_data(
+    conn: SAConnection,
+    fmds: List[FileMetaData],
+    chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+):
+    """Inserts or replaces the metadata of many files in a single transaction
+
+    Rows are written with chunked multi-row INSERT ... ON CONFLICT (file_uuid) DO UPDATE
+    """
+    rows = [vars(fmd) for fmd in fmds]
+    async with conn.begin():
+        for i in range(0, len(rows), chunk_size):
+            insert_stmt = pg_insert(file_meta_data).values(rows[i : i + chunk_size])
+            upsert_stmt = insert_stmt.on_conflict_do_update(
+                index_elements=[file_meta_data.c.file_uuid],
+                set_={
+                    c.name: insert_stmt.excluded[c.name]
+                    for c in file_meta_data.columns
+                    if not c.primary_key
+                },
+            )
+            await conn.execute(upsert_stmt)
+
+
 def setup_db(app: web.Application):
     disable_services = app[APP_CONFIG_KEY].get("main", {}).get("disable_services", [])
 
@@ -1,12 +1,13 @@
 import asyncio
 import logging
+import math
 import os
 import re
 import shutil
 import tempfile
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from collections import deque
 
 import aiobotocore
@@ -27,6 +28,7 @@ from servicelib.utils import fire_and_forget_task
 
 from .utils import expo
 from .datcore_wrapper import DatcoreWrapper
+from .db import upsert_file_meta_data
 from .models import (
     DatasetMetaData,
     FileMetaData,
@@ -62,6 +64,15 @@ FileMetaDataVec = List[FileMetaData]
 FileMetaDataExVec = List[FileMetaDataEx]
 DatasetMetaDataVec = List[DatasetMetaData]
 
+# maximum number of concurrent copies when deep-copying a project
+MAX_CONCURRENT_COPIES = 10
+# S3 copy_object is limited to 5GB, larger objects are copied in parts
+MULTIPART_COPY_THRESHOLD = 5 * 1024 ** 3
+MULTIPART_COPY_PART_SIZE = 512 * 1024 ** 2
+# uploads are split in parts of at least this size, S3 allows at most 10000 parts
+MULTIPART_UPLOAD_PART_SIZE = 64 * 1024 ** 2
+MULTIPART_UPLOAD_MAX_PARTS = 10000
+
 
 async def _setup_dsm(app: web.Application):
     cfg = app[APP_CONFIG_KEY]
@@ -191,7 +202,13 @@ class DataStorageManager:
     # pylint: disable=too-many-branches
     # pylint: disable=too-many-statements
     async def list_files(
-        self, user_id: str, location: str, uuid_filter: str = "", regex: str = ""
+        self,
+        user_id: str,
+        location: str,
+        uuid_filter: str = "",
+        regex: str = "",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> FileMetaDataExVec:
         """ Returns a list of file paths
 
@@ -200,67 +217,66 @@ class DataStorageManager:
             Can filter on uuid: useful to filter on project_id/node_id
 
             Can filter upon regular expression (for now only on key: value pairs of the FileMetaData)
+
+            For simcore.s3, files are sorted by file_uuid and can be paginated with limit/cursor,
+            where cursor is the file_uuid of the last file of the previous page
         """
         data = deque()
         if location == SIMCORE_S3_STR:
-            async with self.engine.acquire() as conn:
-                query = sa.select([file_meta_data]).where(
-                    file_meta_data.c.user_id == user_id
+            query = sa.select([file_meta_data])
+            conditions = [file_meta_data.c.user_id == user_id]
+            if self.has_project_db:
+                # only files from non-deleted projects with their project/node names
+                # NOTE: only the node label is taken from the workbench
+                node_label = (
+                    projects.c.workbench.op("->")(file_meta_data.c.node_id)
+                    .op("->>", return_type=sa.String)("label")
+                    .label("node_label")
                 )
+                query = sa.select(
+                    [file_meta_data, projects.c.name.label("prj_name"), node_label]
+                ).select_from(
+                    file_meta_data.join(
+                        projects, projects.c.uuid == file_meta_data.c.project_id
+                    )
+                )
+                conditions += [
+                    projects.c.prj_owner == user_id,
+                    projects.c.name != "",
+                    node_label != "",
+                ]
+            if uuid_filter:
+                # case insensitive regex as in the datcore location
+                conditions.append(
+                    file_meta_data.c.file_uuid.op("~*", is_comparison=True)(uuid_filter)
+                )
+            if cursor:
+                conditions.append(file_meta_data.c.file_uuid > cursor)
+            query = query.where(and_(*conditions)).order_by(file_meta_data.c.file_uuid)
+            if limit:
+                query = query.limit(limit)
+
+            async with self.engine.acquire() as conn:
                 async for row in conn.execute(query):
                     result_dict = dict(zip(row._result_proxy.keys, row._row))
+                    project_name = result_dict.pop("prj_name", None)
+                    node_name = result_dict.pop("node_label", None)
                     d = FileMetaData(**result_dict)
-                    parent_id = str(Path(d.object_name).parent)
-                    dex = FileMetaDataEx(fmd=d, parent_id=parent_id)
-                    data.append(dex)
-
-            if self.has_project_db:
-                uuid_name_dict = {}
-                # now parse the project to search for node/project names
-                try:
-                    async with self.engine.acquire() as conn:
-                        query = sa.select([projects]).where(
-                            projects.c.prj_owner == user_id
+                    if self.has_project_db:
+                        d.project_name = project_name
+                        d.node_name = node_name
+                        d.raw_file_path = str(
+                            Path(d.project_id) / Path(d.node_id) / Path(d.file_name)
                         )
-
-                        async for row in conn.execute(query):
-                            proj_data = dict(row.items())
-
-                            uuid_name_dict[proj_data["uuid"]] = proj_data["name"]
-                            wb = proj_data["workbench"]
-                            for node in wb.keys():
-                                uuid_name_dict[node] = wb[node]["label"]
-                except DBAPIError as _err:
-                    logger.exception("Error querying database for project names")
-
-                if not uuid_name_dict:
-                    # there seems to be no project whatsoever for user_id
-                    return []
-
-                # only keep files from non-deleted project
-                clean_data = deque()
-                for dx in data:
-                    d = dx.fmd
-                    if d.project_id not in uuid_name_dict:
-                        continue
-
-                    d.project_name = uuid_name_dict[d.project_id]
-                    if d.node_id in uuid_name_dict:
-                        d.node_name = uuid_name_dict[d.node_id]
-
-                    d.raw_file_path = str(
-                        Path(d.project_id) / Path(d.node_id) / Path(d.file_name)
-                    )
-                    d.display_file_path = d.raw_file_path
-                    d.file_id = d.file_uuid
-                    if d.node_name and d.project_name:
+                        d.file_id = d.file_uuid
                         d.display_file_path = str(
                             Path(d.project_name) / Path(d.node_name) / Path(d.file_name)
                         )
-                        # once the data was sync to postgres metadata table at this point
-                        clean_data.append(dx)
+                    parent_id = str(Path(d.object_name).parent)
+                    data.append(FileMetaDataEx(fmd=d, parent_id=parent_id))
 
-                data = clean_data
+            # already filtered
+            uuid_filter = ""
 
         elif location == DATCORE_STR:
             api_token, api_secret = self._get_datcore_tokens(user_id)
@@ -484,7 +500,7 @@ class DataStorageManager:
             if not update_succeeded:
                 logger.error("Could not update file metadata for '%s'", file_uuid)
 
-    async def upload_link(self, user_id: str, file_uuid: str):
+    async def _prepare_upload(self, user_id: str, file_uuid: str):
         @retry(**postgres_service_retry_policy_kwargs)
         async def _execute_query() -> Tuple[int, str]:
             async with self.engine.acquire() as conn:
@@ -518,7 +534,79 @@ class DataStorageManager:
                 last_modified=last_modified,
             )
         )
-        return self.s3_client.create_presigned_put_url(bucket_name, object_name)
+
+    async def upload_link(self, user_id: str, file_uuid: str):
+        await self._prepare_upload(user_id, file_uuid)
+        return self.s3_client.create_presigned_put_url(
+            self.simcore_bucket_name, file_uuid
+        )
+
+    async def upload_links_multipart(
+        self, user_id: str, file_uuid: str, file_size: int
+    ) -> Dict:
+        """ Starts a multipart upload, the client uploads every part to its presigned link
+            and completes the upload with the ETags of the parts
+        """
+        part_size = max(
+            MULTIPART_UPLOAD_PART_SIZE,
+            math.ceil(file_size / MULTIPART_UPLOAD_MAX_PARTS),
+        )
+        num_parts = max(1, math.ceil(file_size / part_size))
+
+        await self._prepare_upload(user_id, file_uuid)
+
+        session = aiobotocore.get_session()
+        async with session.create_client(
+            "s3",
+            endpoint_url=self.s3_client.endpoint_url,
+            aws_access_key_id=self.s3_client.access_key,
+            aws_secret_access_key=self.s3_client.secret_key,
+        ) as client:
+            upload = await client.create_multipart_upload(
+                Bucket=self.simcore_bucket_name, Key=file_uuid
+            )
+        upload_id = upload["UploadId"]
+        links = [
+            self.s3_client.create_presigned_upload_part_url(
+                self.simcore_bucket_name, file_uuid, upload_id, part_number
+            )
+            for part_number in range(1, num_parts + 1)
+        ]
+        return {"upload_id": upload_id, "part_size": part_size, "links": links}
+
+    async def complete_upload_multipart(
+        self, file_uuid: str, upload_id: str, parts: List[Dict]
+    ):
+        session = aiobotocore.get_session()
+        async with session.create_client(
+            "s3",
+            endpoint_url=self.s3_client.endpoint_url,
+            aws_access_key_id=self.s3_client.access_key,
+            aws_secret_access_key=self.s3_client.secret_key,
+        ) as client:
+            await client.complete_multipart_upload(
+                Bucket=self.simcore_bucket_name,
+                Key=file_uuid,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"ETag": part["e_tag"], "PartNumber": part["number"]}
+                        for part in sorted(parts, key=lambda p: p["number"])
+                    ]
+                },
+            )
+
+    async def abort_upload_multipart(self, file_uuid: str, upload_id: str):
+        session = aiobotocore.get_session()
+        async with session.create_client(
+            "s3",
+            endpoint_url=self.s3_client.endpoint_url,
+            aws_access_key_id=self.s3_client.access_key,
+            aws_secret_access_key=self.s3_client.secret_key,
+        ) as client:
+            await client.abort_multipart_upload(
+                Bucket=self.simcore_bucket_name, Key=file_uuid, UploadId=upload_id
+            )
 
     async def copy_file_s3_s3(self, user_id: str, dest_uuid: str, source_uuid: str):
         # source is s3, location is s3
@@ -536,8 +624,7 @@ class DataStorageManager:
             fmd = FileMetaData()
             fmd.simcore_from_uuid(dest_uuid, self.simcore_bucket_name)
             fmd.user_id = user_id
-            ins = file_meta_data.insert().values(**vars(fmd))
-            await conn.execute(ins)
+            await upsert_file_meta_data(conn, [fmd])
 
     async def copy_file_s3_datcore(
         self, user_id: str, dest_uuid: str, source_uuid: str
@@ -632,6 +719,81 @@ class DataStorageManager:
         link, filename = await dcw.download_link_by_id(file_id)
         return link, filename
 
+    async def download_links(
+        self, user_id: str, location: str, file_uuids: List[str]
+    ) -> List[Dict[str, str]]:
+        """ Returns the download links of several files at once """
+        if location == SIMCORE_S3_STR:
+            links = [await self.download_link_s3(file_uuid) for file_uuid in file_uuids]
+        else:
+            results = await asyncio.gather(
+                *[
+                    self.download_link_datcore(user_id, file_uuid)
+                    for file_uuid in file_uuids
+                ]
+            )
+            links = [link for link, _filename in results]
+        return [
+            {"file_id": file_uuid, "link": link}
+            for file_uuid, link in zip(file_uuids, links)
+        ]
+
+    async def _list_objects(self, client, prefix: str) -> AsyncIterator[Dict]:
+        """ Lists all objects under prefix (list_objects_v2 returns at most 1000 per call) """
+        paginator = client.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(
+            Bucket=self.simcore_bucket_name, Prefix=prefix
+        ):
+            for f in page.get("Contents", []):
+                yield f
+
+    async def _copy_object(
+        self, client, source_object_name: str, dest_object_name: str, size: int
+    ):
+        copy_source = {"Bucket": self.simcore_bucket_name, "Key": source_object_name}
+        if size <= MULTIPART_COPY_THRESHOLD:
+            await client.copy_object(
+                CopySource=copy_source,
+                Bucket=self.simcore_bucket_name,
+                Key=dest_object_name,
+            )
+            return
+
+        upload = await client.create_multipart_upload(
+            Bucket=self.simcore_bucket_name, Key=dest_object_name
+        )
+        upload_id = upload["UploadId"]
+        try:
+            parts = []
+            for part_number, start in enumerate(
+                range(0, size, MULTIPART_COPY_PART_SIZE), start=1
+            ):
+                end = min(start + MULTIPART_COPY_PART_SIZE, size) - 1
+                part = await client.upload_part_copy(
+                    Bucket=self.simcore_bucket_name,
+                    Key=dest_object_name,
+                    CopySource=copy_source,
+                    CopySourceRange=f"bytes={start}-{end}",
+                    PartNumber=part_number,
+                    UploadId=upload_id,
+                )
+                parts.append(
+                    {"ETag": part["CopyPartResult"]["ETag"], "PartNumber": part_number}
+                )
+            await client.complete_multipart_upload(
+                Bucket=self.simcore_bucket_name,
+                Key=dest_object_name,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            await client.abort_multipart_upload(
+                Bucket=self.simcore_bucket_name,
+                Key=dest_object_name,
+                UploadId=upload_id,
+            )
+            raise
+
     async def deep_copy_project_simcore_s3(
         self, user_id: str, source_project, destination_project, node_mapping
     ):
@@ -664,6 +826,7 @@ class DataStorageManager:
                 uuid_name_dict[new_node_id] = src_node["label"]
 
         # Step 1: List all objects for this project replace them with the destination object name and do a copy at the same time collect some names
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_COPIES)
         session = aiobotocore.get_session()
         async with session.create_client(
             "s3",
@@ -671,53 +834,67 @@ class DataStorageManager:
             aws_access_key_id=self.s3_client.access_key,
             aws_secret_access_key=self.s3_client.secret_key,
         ) as client:
-            response = await client.list_objects_v2(
-                Bucket=self.simcore_bucket_name, Prefix=source_folder
-            )
+            copies: List[Tuple[str, str, int]] = []
+            async for f in self._list_objects(client, prefix=source_folder):
+                source_object_name = f["Key"]
+                source_object_parts = Path(source_object_name).parts
+
+                if len(source_object_parts) == 3:
+                    old_node_id = source_object_parts[1]
+                    new_node_id = node_mapping.get(old_node_id)
+                    if new_node_id is not None:
+                        old_filename = source_object_parts[2]
+                        dest_object_name = str(
+                            Path(dest_folder) / new_node_id / old_filename
+                        )
+                        copies.append((source_object_name, dest_object_name, f["Size"]))
+                else:
+                    # This may happen once we have shared/home folders
+                    logger.info("len(object.parts != 3")
+
+            total_size = sum(size for _, _, size in copies)
+            copied = {"files": 0, "bytes": 0}
+
+            async def _copy(source_object_name: str, dest_object_name: str, size: int):
+                async with semaphore:
+                    await self._copy_object(
+                        client, source_object_name, dest_object_name, size
+                    )
+                copied["files"] += 1
+                copied["bytes"] += size
+                logger.info(
+                    "Deep copy of project %s: %d/%d files, %d/%d bytes copied",
+                    source_folder,
+                    copied["files"],
+                    len(copies),
+                    copied["bytes"],
+                    total_size,
+                )
 
-            if "Contents" in response:
-                for f in response["Contents"]:
-                    source_object_name = f["Key"]
-                    source_object_parts = Path(source_object_name).parts
-
-                    if len(source_object_parts) == 3:
-                        old_node_id = source_object_parts[1]
-                        new_node_id = node_mapping.get(old_node_id)
-                        if new_node_id is not None:
-                            old_filename = source_object_parts[2]
-                            dest_object_name = str(
-                                Path(dest_folder) / new_node_id / old_filename
-                            )
-                            copy_source = {
-                                "Bucket": self.simcore_bucket_name,
-                                "Key": source_object_name,
-                            }
-                            response = await client.copy_object(
-                                CopySource=copy_source,
-                                Bucket=self.simcore_bucket_name,
-                                Key=dest_object_name,
-                            )
-                    else:
-                        # This may happen once we have shared/home folders
-                        logger.info("len(object.parts != 3")
+            await asyncio.gather(*[_copy(*copy_args) for copy_args in copies])
 
             # Step 2: List all references in outputs that point to datcore and copy over
+            async def _copy_from_datcore(node_id: str, output: Dict):
+                src = output["path"]
+                dest = str(Path(dest_folder) / node_id)
+                logger.info("Need to copy %s to %s", src, dest)
+                async with semaphore:
+                    dest = await self.copy_file_datcore_s3(
+                        user_id=user_id,
+                        dest_uuid=dest,
+                        source_uuid=src,
+                        filename_missing=True,
+                    )
+                # and change the dest project accordingly
+                output["store"] = SIMCORE_S3_ID
+                output["path"] = dest
+
+            datcore_copies = []
             for node_id, node in destination_project["workbench"].items():
                 outputs: Dict = node.get("outputs", {})
                 for _output_key, output in outputs.items():
                     if "store" in output and output["store"] == DATCORE_ID:
-                        src = output["path"]
-                        dest = str(Path(dest_folder) / node_id)
-                        logger.info("Need to copy %s to %s", src, dest)
-                        dest = await self.copy_file_datcore_s3(
-                            user_id=user_id,
-                            dest_uuid=dest,
-                            source_uuid=src,
-                            filename_missing=True,
-                        )
-                        # and change the dest project accordingly
-                        output["store"] = SIMCORE_S3_ID
-                        output["path"] = dest
+                        datcore_copies.append(_copy_from_datcore(node_id, output))
                     elif "store" in output and output["store"] == SIMCORE_S3_ID:
                         source = output["path"]
                         dest = dest = str(
@@ -725,6 +902,7 @@ class DataStorageManager:
                         )
                         output["store"] = SIMCORE_S3_ID
                         output["path"] = dest
+            await asyncio.gather(*datcore_copies)
 
         # step 3: list files first to create fmds
         session = aiobotocore.get_session()
@@ -735,40 +913,23 @@ class DataStorageManager:
             aws_access_key_id=self.s3_client.access_key,
             aws_secret_access_key=self.s3_client.secret_key,
         ) as client:
-            response = await client.list_objects_v2(
-                Bucket=self.simcore_bucket_name, Prefix=dest_folder + "/"
-            )
-            if "Contents" in response:
-                for f in response["Contents"]:
-                    fmd = FileMetaData()
-                    fmd.simcore_from_uuid(f["Key"], self.simcore_bucket_name)
-                    fmd.project_name = uuid_name_dict.get(dest_folder, "Untitled")
-                    fmd.node_name = uuid_name_dict.get(fmd.node_id, "Untitled")
-                    fmd.raw_file_path = fmd.file_uuid
-                    fmd.display_file_path = str(
-                        Path(fmd.project_name) / fmd.node_name / fmd.file_name
-                    )
-                    fmd.user_id = user_id
-                    fmd.file_size = f["Size"]
-                    fmd.last_modified = str(f["LastModified"])
-                    fmds.append(fmd)
+            async for f in self._list_objects(client, prefix=dest_folder + "/"):
+                fmd = FileMetaData()
+                fmd.simcore_from_uuid(f["Key"], self.simcore_bucket_name)
+                fmd.project_name = uuid_name_dict.get(dest_folder, "Untitled")
+                fmd.node_name = uuid_name_dict.get(fmd.node_id, "Untitled")
+                fmd.raw_file_path = fmd.file_uuid
+                fmd.display_file_path = str(
+                    Path(fmd.project_name) / fmd.node_name / fmd.file_name
+                )
+                fmd.user_id = user_id
+                fmd.file_size = f["Size"]
+                fmd.last_modified = str(f["LastModified"])
+                fmds.append(fmd)
 
         # step 4 sync db
         async with self.engine.acquire() as conn:
-            for fmd in fmds:
-                query = sa.select([file_meta_data]).where(
-                    file_meta_data.c.file_uuid == fmd.file_uuid
-                )
-                # if file already exists, we might w
-                rows = await conn.execute(query)
-                exists = await rows.scalar()
-                if exists:
-                    delete_me = file_meta_data.delete().where(
-                        file_meta_data.c.file_uuid == fmd.file_uuid
-                    )
-                    await conn.execute(delete_me)
-                ins = file_meta_data.insert().values(**vars(fmd))
-                await conn.execute(ins)
+            await upsert_file_meta_data(conn, fmds)
 
     async def delete_project_simcore_s3(
         self, user_id: str, project_id: str, node_id: Optional[str] = None
@@ -3,6 +3,7 @@ import logging
 
 import attr
 from aiohttp import web
+from servicelib.rest_responses import create_data_response
 from servicelib.rest_utils import extract_and_validate
 
 from .db_tokens import get_api_token_and_secret
@@ -104,6 +105,8 @@ async def get_files_metadata(request: web.Request):
     location_id = params["location_id"]
     user_id = query["user_id"]
     uuid_filter = query.get("uuid_filter", "")
+    limit = int(query["limit"]) if query.get("limit") else None
+    cursor = query.get("cursor")
 
     dsm = await _prepare_storage_manager(params, query, request)
     location = dsm.location_from_id(location_id)
@@ -111,16 +114,28 @@ async def get_files_metadata(request: web.Request):
     log.debug("list files %s %s %s", user_id, location, uuid_filter)
 
     data = await dsm.list_files(
-        user_id=user_id, location=location, uuid_filter=uuid_filter
+        user_id=user_id,
+        location=location,
+        uuid_filter=uuid_filter,
+        limit=limit,
+        cursor=cursor,
     )
 
     data_as_dict = []
     for d in data:
-        log.info("DATA %s", attr.asdict(d.fmd))
+        log.debug("DATA %s", attr.asdict(d.fmd))
         data_as_dict.append({**attr.asdict(d.fmd), "parent_id": d.parent_id})
 
     envelope = {"error": None, "data": data_as_dict}
 
+    # NOTE: only simcore.s3 paginates, datcore ignores limit and cursor
+    if location == SIMCORE_S3_STR and limit and len(data_as_dict) == limit:
+        # there might be more files: next page starts after the last one
+        response = create_data_response(envelope)
+        next_url = request.url.update_query(cursor=data_as_dict[-1]["file_uuid"])
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return response
+
     return envelope
 
 
@@ -233,6 +248,26 @@ async def download_file(request: web.Request):
     return {"error": None, "data": {"link": link}}
 
 
+async def download_files(request: web.Request):
+    params, query, _body = await extract_and_validate(request)
+
+    assert params, "params %s" % params  # nosec
+    assert query, "query %s" % query  # nosec
+
+    location_id = params["location_id"]
+    user_id = query["user_id"]
+    # NOTE: the body is validated above, the raw json is easier to handle than the openapi-core model
+    body = await request.json()
+
+    dsm = await _prepare_storage_manager(params, query, request)
+    location = dsm.location_from_id(location_id)
+    links = await dsm.download_links(
+        user_id=user_id, location=location, file_uuids=body["file_ids"]
+    )
+
+    return {"error": None, "data": links}
+
+
 async def upload_file(request: web.Request):
     params, query, body = await extract_and_validate(request)
 
@@ -264,6 +299,73 @@ async def upload_file(request: web.Request):
     return {"error": None, "data": {"link": link}}
 
 
+def _check_multipart_location(dsm: DataStorageManager, location_id: str) -> None:
+    if dsm.location_from_id(location_id) != SIMCORE_S3_STR:
+        raise web.HTTPUnprocessableEntity(
+            reason=f"Multipart uploads are only supported in {SIMCORE_S3_STR}"
+        )
+
+
+async def upload_file_multipart(request: web.Request):
+    params, query, body = await extract_and_validate(request)
+
+    assert params, "params %s" % params  # nosec
+    assert query, "query %s" % query  # nosec
+    assert not body, "body %s" % body  # nosec
+
+    location_id = params["location_id"]
+    user_id = query["user_id"]
+    file_uuid = params["fileId"]
+    file_size = query["file_size"]
+
+    dsm = await _prepare_storage_manager(params, query, request)
+    _check_multipart_location(dsm, location_id)
+    data = await dsm.upload_links_multipart(
+        user_id=user_id, file_uuid=file_uuid, file_size=file_size
+    )
+
+    return {"error": None, "data": data}
+
+
+async def complete_upload_file_multipart(request: web.Request):
+    params, query, _body = await extract_and_validate(request)
+
+    assert params, "params %s" % params  # nosec
+    assert query, "query %s" % query  # nosec
+
+    location_id = params["location_id"]
+    file_uuid = params["fileId"]
+    upload_id = params["upload_id"]
+    # NOTE: the body is validated above, the raw json is easier to handle than the openapi-core model
+    body = await request.json()
+
+    dsm = await _prepare_storage_manager(params, query, request)
+    _check_multipart_location(dsm, location_id)
+    await dsm.complete_upload_multipart(
+        file_uuid=file_uuid, upload_id=upload_id, parts=body["parts"]
+    )
+
+    return {"error": None, "data": None}
+
+
+async def abort_upload_file_multipart(request: web.Request):
+    params, query, body = await extract_and_validate(request)
+
+    assert params, "params %s" % params  # nosec
+    assert query, "query %s" % query  # nosec
+    assert not body, "body %s" % body  # nosec
+
+    location_id = params["location_id"]
+    file_uuid = params["fileId"]
+    upload_id = params["upload_id"]
+
+    dsm = await _prepare_storage_manager(params, query, request)
+    _check_multipart_location(dsm, location_id)
+    await dsm.abort_upload_multipart(file_uuid=file_uuid, upload_id=upload_id)
+
+    return {"error": None, "data": None}
+
+
 async def delete_file(request: web.Request):
     params, query, body = await extract_and_validate(request)
 
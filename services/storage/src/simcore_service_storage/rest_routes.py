@@ -69,6 +69,13 @@ def create(specs: OpenApiSpec) -> List[web.RouteDef]:
     # operation_id = specs.paths[path].operations['patch'].operation_id
     # routes.append( web.patch(BASEPATH+path, handle, name=operation_id) )
 
+    path, handle = (
+        "/locations/{location_id}/files/download-links",
+        handlers.download_files,
+    )
+    operation_id = specs.paths[path].operations["post"].operation_id
+    routes.append(web.post(BASEPATH + path, handle, name=operation_id))
+
     path, handle = "/locations/{location_id}/files/{fileId}", handlers.download_file
     operation_id = specs.paths[path].operations["get"].operation_id
     routes.append(web.get(BASEPATH + path, handle, name=operation_id))
@@ -81,6 +88,27 @@ def create(specs: OpenApiSpec) -> List[web.RouteDef]:
     operation_id = specs.paths[path].operations["put"].operation_id
     routes.append(web.put(BASEPATH + path, handle, name=operation_id))
 
+    path, handle = (
+        "/locations/{location_id}/files/{fileId}/multipart",
+        handlers.upload_file_multipart,
+    )
+    operation_id = specs.paths[path].operations["put"].operation_id
+    routes.append(web.put(BASEPATH + path, handle, name=operation_id))
+
+    path, handle = (
+        "/locations/{location_id}/files/{fileId}/multipart/{upload_id}",
+        handlers.complete_upload_file_multipart,
+    )
+    operation_id = specs.paths[path].operations["post"].operation_id
+    routes.append(web.post(BASEPATH + path, handle, name=operation_id))
+
+    path, handle = (
+        "/locations/{location_id}/files/{fileId}/multipart/{upload_id}",
+        handlers.abort_upload_file_multipart,
+    )
+    operation_id = specs.paths[path].operations["delete"].operation_id
+    routes.append(web.delete(BASEPATH + path, handle, name=operation_id))
+
     path, handle = "/simcore-s3/folders", handlers.create_folders_from_project
     operation_id = specs.paths[path].operations["post"].operation_id
     routes.append(web.post(BASEPATH + path, handle, name=operation_id))
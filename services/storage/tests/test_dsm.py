@@ -12,13 +12,17 @@ import filecmp
 import io
 import json
 import os
+import time
 import urllib
+import uuid
 from pathlib import Path
 from shutil import copyfile
 
 import attr
 import pytest
 import utils
+from simcore_service_storage.db import upsert_file_meta_data
+from simcore_service_storage.dsm import MULTIPART_UPLOAD_PART_SIZE
 from simcore_service_storage.models import FileMetaData
 from simcore_service_storage.settings import DATCORE_STR, SIMCORE_S3_ID, SIMCORE_S3_STR
 from utils import BUCKET_NAME, USER_ID, has_datcore_tokens
@@ -176,6 +180,63 @@ async def test_links_s3(
     assert filecmp.cmp(tmp_file2, tmp_file)
 
 
+async def test_links_s3_multipart(
+    postgres_service_url, s3_client, tmp_path: Path, dsm_fixture
+):
+    utils.create_tables(url=postgres_service_url)
+
+    tmp_file = tmp_path / "big_file.bin"
+    file_size = MULTIPART_UPLOAD_PART_SIZE + 1024
+    tmp_file.write_bytes(os.urandom(file_size))
+    fmd = _create_file_meta_for_s3(postgres_service_url, s3_client, str(tmp_file))
+
+    dsm = dsm_fixture
+
+    upload = await dsm.upload_links_multipart(fmd.user_id, fmd.file_uuid, file_size)
+    assert upload["part_size"] == MULTIPART_UPLOAD_PART_SIZE
+    assert len(upload["links"]) == 2
+
+    parts = []
+    with tmp_file.open("rb") as fp:
+        for number, link in enumerate(upload["links"], start=1):
+            req = urllib.request.Request(
+                link, data=fp.read(upload["part_size"]), method="PUT"
+            )
+            with urllib.request.urlopen(req) as f:
+                parts.append({"number": number, "e_tag": f.headers["ETag"]})
+    await dsm.complete_upload_multipart(fmd.file_uuid, upload["upload_id"], parts)
+
+    tmp_file2 = tmp_path / "big_file.bin.rec"
+    down_url = await dsm.download_link_s3(fmd.file_uuid)
+    urllib.request.urlretrieve(down_url, tmp_file2)
+
+    assert filecmp.cmp(tmp_file2, tmp_file)
+
+
+async def test_download_links_s3(
+    postgres_service_url, s3_client, mock_files_factory, dsm_fixture
+):
+    utils.create_tables(url=postgres_service_url)
+
+    dsm = dsm_fixture
+    tmp_files = mock_files_factory(3)
+    fmds = [
+        _create_file_meta_for_s3(postgres_service_url, s3_client, tmp_file)
+        for tmp_file in tmp_files
+    ]
+    for tmp_file, fmd in zip(tmp_files, fmds):
+        s3_client.upload_file(BUCKET_NAME, fmd.file_uuid, tmp_file)
+
+    links = await dsm.download_links(
+        USER_ID, SIMCORE_S3_STR, [fmd.file_uuid for fmd in fmds]
+    )
+    assert [link["file_id"] for link in links] == [fmd.file_uuid for fmd in fmds]
+    for tmp_file, link in zip(tmp_files, links):
+        tmp_file2 = tmp_file + ".rec"
+        urllib.request.urlretrieve(link["link"], tmp_file2)
+        assert filecmp.cmp(tmp_file2, tmp_file)
+
+
 async def test_copy_s3_s3(
     postgres_service_url, s3_client, mock_files_factory, dsm_fixture
 ):
@@ -585,6 +646,81 @@ async def test_deep_copy_project_simcore_s3(
     assert len(files) == 0
 
 
+async def test_deep_copy_project_simcore_s3_many_files(
+    dsm_fixture, s3_client, postgres_service_url
+):
+    dsm = dsm_fixture
+    utils.create_full_tables(url=postgres_service_url)
+    user_id = USER_ID
+
+    bucket_name = BUCKET_NAME
+    s3_client.create_bucket(bucket_name, delete_contents_if_exists=True)
+
+    source_project_id = str(uuid.uuid4())
+    source_node_id = str(uuid.uuid4())
+    source_project = {
+        "uuid": source_project_id,
+        "name": "many files",
+        "workbench": {source_node_id: {"label": "node", "outputs": {}}},
+    }
+    destination_project = copy.deepcopy(source_project)
+    destination_project["uuid"] = str(uuid.uuid4())
+    destination_node_id = str(uuid.uuid4())
+    destination_project["workbench"] = {
+        destination_node_id: source_project["workbench"][source_node_id]
+    }
+    node_mapping = {source_node_id: destination_node_id}
+
+    # more than a single page of list_objects_v2
+    num_files = 1200
+    content = b"some content"
+    for i in range(num_files):
+        s3_client.client.put_object(
+            bucket_name,
+            f"{source_project_id}/{source_node_id}/file_{i}.dat",
+            io.BytesIO(content),
+            len(content),
+        )
+
+    start = time.monotonic()
+    await dsm.deep_copy_project_simcore_s3(
+        user_id, source_project, destination_project, node_mapping
+    )
+    print(f"Deep copy of {num_files} files took {time.monotonic() - start:.2f}s")
+
+    copied = s3_client.list_objects(
+        bucket_name, prefix=f"{destination_project['uuid']}/", recursive=True
+    )
+    assert len(list(copied)) == num_files
+
+    files = await dsm.list_files(user_id=user_id, location=SIMCORE_S3_STR)
+    assert len(files) == num_files
+    assert all(f.fmd.node_id == destination_node_id for f in files)
+
+
+async def test_upsert_file_meta_data(dsm_fixture, postgres_service_url):
+    utils.create_tables(url=postgres_service_url)
+
+    fmds = []
+    for i in range(1200):
+        fmd = FileMetaData()
+        fmd.simcore_from_uuid(f"project_id/node_id/file_{i}.dat", BUCKET_NAME)
+        fmd.user_id = USER_ID
+        fmd.file_size = i
+        fmds.append(fmd)
+
+    async with dsm_fixture.engine.acquire() as conn:
+        await upsert_file_meta_data(conn, fmds)
+        # upserting again updates the existing rows
+        for fmd in fmds:
+            fmd.file_size += 1
+        await upsert_file_meta_data(conn, fmds)
+
+    files = await dsm_fixture.list_files(user_id=USER_ID, location=SIMCORE_S3_STR)
+    assert len(files) == len(fmds)
+    assert sorted(f.fmd.file_size for f in files) == list(range(1, len(fmds) + 1))
+
+
 async def test_dsm_list_datasets_s3(dsm_fixture, dsm_mockup_complete_db):
     dsm_fixture.has_project_db = True
 
@@ -144,6 +144,32 @@ async def test_s3_files_metadata(client, dsm_mockup_db):
             assert os.path.join(d["project_id"], d["node_id"]) == uuid_filter
 
 
+async def test_s3_files_metadata_pagination(client, dsm_mockup_db):
+    id_file_count, _id_name_map = parse_db(dsm_mockup_db)
+
+    for _id in id_file_count:
+        file_uuids = []
+        url = "/v0/locations/0/files/metadata?user_id={}&limit=2".format(_id)
+        while url:
+            resp = await client.get(url)
+            payload = await resp.json()
+            assert resp.status == 200, str(payload)
+
+            data, error = tuple(payload.get(k) for k in ("data", "error"))
+            assert not error
+            assert len(data) <= 2
+            file_uuids.extend(d["file_uuid"] for d in data)
+
+            url = resp.links.get("next", {}).get("url")
+            if url:
+                assert len(data) == 2
+                url = url.relative()
+
+        # all files listed once and sorted
+        assert len(file_uuids) == id_file_count[_id]
+        assert file_uuids == sorted(set(file_uuids))
+
+
 async def test_s3_file_metadata(client, dsm_mockup_db):
     # go through all files and get them
     for d in dsm_mockup_db.keys():
@@ -368,3 +394,17 @@ async def test_s3_files_datasets_metadata(client):
     assert resp.status == 200, str(payload)
     data, error = tuple(payload.get(k) for k in ("data", "error"))
     assert not error
+
+
+async def test_multipart_upload_only_in_simcore_s3(client):
+    file_uuid = quote("some_project/some_node/some_file.bin", safe="")
+    # 1 is the datcore location
+    url = (
+        f"/v0/locations/1/files/{file_uuid}/multipart/some_upload_id?user_id={USER_ID}"
+    )
+
+    resp = await client.post(url, json={"parts": [{"number": 1, "e_tag": '"etag"'}]})
+    assert resp.status == 422, await resp.text()
+
+    resp = await client.delete(url)
+    assert resp.status == 422, await resp.text()
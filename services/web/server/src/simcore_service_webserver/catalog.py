@@ -59,6 +59,12 @@ async def _request_catalog(
 
     try:
         async with session.request(method, url, headers=headers, data=data) as resp:
+            # catalog supports conditional requests on some resources
+            etag_headers = (
+                {"ETag": resp.headers["ETag"]} if "ETag" in resp.headers else {}
+            )
+            if resp.status == web.HTTPNotModified.status_code:
+                return web.Response(status=resp.status, headers=etag_headers)
 
             is_error = resp.status >= 400
             # catalog backend sometimes sends error in plan=in text
@@ -75,7 +81,7 @@ async def _request_catalog(
             else:
                 data = wrap_as_envelope(data=payload)
 
-            return web.json_response(data, status=resp.status)
+            return web.json_response(data, status=resp.status, headers=etag_headers)
 
     except (CancelledError, TimeoutError) as err:
         raise web.HTTPServiceUnavailable(reason="unavailable catalog service") from err
@@ -10,7 +10,9 @@ from servicelib.application_setup import ModuleCategory, app_module_setup
 from .computation_comp_tasks_listening_task import setup as setup_comp_tasks_listener
 from .computation_config import CONFIG_SECTION_NAME
 from .computation_config import create_settings as create_computation_settings
-from .computation_subscribe import subscribe
+from .computation_logs import log_batcher_ctx
+from .computation_progress import progress_coalescer_ctx
+from .computation_subscribe import stop_rabbit_message_workers, subscribe
 
 log = logging.getLogger(__file__)
 
@@ -22,8 +24,14 @@ def setup_computation(app: web.Application):
     # create settings and injects in app
     create_computation_settings(app)
 
+    # coalesces nodes progress updates
+    app.cleanup_ctx.append(progress_coalescer_ctx)
+    # batches log messages to the users
+    app.cleanup_ctx.append(log_batcher_ctx)
+
     # subscribe to rabbit upon startup
     app.on_startup.append(subscribe)
+    app.on_cleanup.append(stop_rabbit_message_workers)
 
     # setup comp_task listener
     setup_comp_tasks_listener(app)
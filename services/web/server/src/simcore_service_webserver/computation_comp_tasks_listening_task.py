@@ -1,16 +1,24 @@
 """this module creates a background task that monitors changes in the database.
 First a procedure is registered in postgres that gets triggered whenever the outputs
 of a record in comp_task table is changed.
+
+Notifications are received on a dedicated connection (i.e. outside of the engine's pool)
+and dispatched concurrently, although notifications of the same project are always
+processed one after the other in the order they were received.
 """
 import asyncio
 import json
 import logging
+from collections import defaultdict, deque
 from pprint import pformat
-from typing import Dict, List
+from typing import Deque, Dict, List, Set
 
+import aiopg
+import attr
 from aiohttp import web
 from aiopg.sa import Engine
 from aiopg.sa.connection import SAConnection
+from expiringdict import ExpiringDict
 from models_library.projects import ProjectID
 from models_library.projects_nodes import NodeID
 from models_library.projects_state import RunningState
@@ -21,10 +29,15 @@ from simcore_postgres_database.webserver_models import DB_CHANNEL_NAME, projects
 from sqlalchemy.sql import select
 
 from .computation_api import convert_state_from_db
+from .db import get_dsn
 from .projects import projects_api, projects_exceptions
 
 log = logging.getLogger(__name__)
 
+MAX_CONCURRENT_PROJECTS = 10
+# notifications of a project received within this window are merged into a single update
+DEBOUNCE_WINDOW_SECS = 0.5
+
 
 @log_decorator(logger=log)
 async def _get_project_owner(
@@ -39,123 +52,203 @@ async def _get_project_owner(
 
 
 @log_decorator(logger=log)
-async def _update_project_state(
+async def _update_project_nodes(
     app: web.Application,
     user_id: PositiveInt,
     project_uuid: ProjectID,
-    node_uuid: NodeID,
-    new_state: RunningState,
+    node_states: Dict[NodeID, RunningState],
+    node_outputs: Dict[NodeID, Dict],
 ) -> None:
-    project = await projects_api.update_project_node_state(
-        app, user_id, project_uuid, node_uuid, new_state
+    project = await projects_api.update_project_nodes(
+        app, user_id, project_uuid, states=node_states, outputs=node_outputs
     )
-    await projects_api.notify_project_node_update(app, project, node_uuid)
-    await projects_api.notify_project_state_update(app, project)
 
+    for node_uuid in set(node_states) | set(node_outputs):
+        await projects_api.notify_project_node_update(app, project, node_uuid)
+    for node_uuid, outputs in node_outputs.items():
+        await projects_api.trigger_connected_service_retrieve(
+            app, project, node_uuid, list(outputs.keys())
+        )
+    if node_states:
+        await projects_api.notify_project_state_update(app, project)
 
-@log_decorator(logger=log)
-async def _update_project_outputs(
+
+async def _handle_db_notifications(
     app: web.Application,
-    user_id: PositiveInt,
     project_uuid: ProjectID,
-    node_uuid: NodeID,
-    outputs: Dict,
+    payloads: List[Dict],
+    project_owners: ExpiringDict,
 ) -> None:
-    changed_keys: List[str] = list(outputs.keys())
-    if not changed_keys:
-        return
-
-    project = await projects_api.update_project_node_outputs(
-        app,
-        user_id,
-        project_uuid,
-        node_uuid,
-        data=outputs,
-    )
+    """Merges all the notifications of a project in a single update"""
+    node_states: Dict[NodeID, RunningState] = {}
+    node_outputs: Dict[NodeID, Dict] = defaultdict(dict)
+    for payload in payloads:
+        # FIXME: this part should be replaced by a pydantic CompTaskAtDB once it moves to director-v2
+        task_data = payload.get("data", {})
+        task_changes = payload.get("changes", [])
+
+        if not task_data:
+            log.error("task data invalid: %s", pformat(payload))
+            continue
+
+        if not task_changes:
+            log.error("no changes but still triggered: %s", pformat(payload))
 
-    await projects_api.notify_project_node_update(app, project, node_uuid)
-    await projects_api.trigger_connected_service_retrieve(
-        app, project, node_uuid, changed_keys
+        node_uuid = task_data.get("node_id", None)
+        if "outputs" in task_changes and task_data.get("outputs"):
+            node_outputs[node_uuid].update(task_data["outputs"])
+        if "state" in task_changes:
+            # latest state wins
+            node_states[node_uuid] = convert_state_from_db(task_data.get("state")).value
+
+    # FIXME: we do not know who triggered these changes. we assume the user had the rights to do so
+    # therefore we'll use the prj_owner user id. This should be fixed when the new sidecar comes in
+    # and comp_tasks/comp_pipeline get deprecated.
+    while node_states or node_outputs:
+        try:
+            # find the user(s) linked to that project
+            the_project_owner = project_owners.get(project_uuid)
+            if the_project_owner is None:
+                db_engine: Engine = app[APP_DB_ENGINE_KEY]
+                async with db_engine.acquire() as conn:
+                    the_project_owner = await _get_project_owner(conn, project_uuid)
+                project_owners[project_uuid] = the_project_owner
+
+            await _update_project_nodes(
+                app, the_project_owner, project_uuid, node_states, dict(node_outputs)
+            )
+            return
+
+        except projects_exceptions.ProjectNotFoundError as exc:
+            log.warning(
+                "Project %s was not found and cannot be updated. Maybe was it deleted?",
+                exc.project_uuid,
+            )
+            project_owners.pop(project_uuid, None)
+            return
+        except projects_exceptions.ProjectOwnerNotFoundError as exc:
+            log.warning(
+                "Project owner of project %s could not be found, is the project valid?",
+                exc.project_uuid,
+            )
+            return
+        except projects_exceptions.NodeNotFoundError as exc:
+            log.warning(
+                "Node %s of project %s not found and cannot be updated. Maybe was it deleted?",
+                exc.node_uuid,
+                exc.project_uuid,
+            )
+            # the other nodes are still updated
+            node_states.pop(exc.node_uuid, None)
+            node_outputs.pop(exc.node_uuid, None)
+
+
+@attr.s(auto_attribs=True)
+class _NotificationsDispatcher:
+    """Processes notifications concurrently but serialized per project
+
+    Notifications of a project are debounced, i.e. all those received within
+    debounce_window are merged and result in a single project update
+    """
+
+    app: web.Application
+    max_concurrency: int = MAX_CONCURRENT_PROJECTS
+    debounce_window: float = DEBOUNCE_WINDOW_SECS
+
+    _pending: Dict[str, Deque[Dict]] = attr.Factory(dict)
+    _tasks: Set[asyncio.Task] = attr.Factory(set)
+    _semaphore: asyncio.Semaphore = attr.ib(init=False)
+    # the owner of a project does not change, caching it saves a query per notification
+    _project_owners: ExpiringDict = attr.Factory(
+        lambda: ExpiringDict(max_len=1000, max_age_seconds=3600)
     )
 
+    # counters
+    num_notifications: int = 0
+    num_updates: int = 0
+
+    def __attrs_post_init__(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def dispatch(self, payload: Dict) -> None:
+        self.num_notifications += 1
+        project_uuid = payload.get("data", {}).get("project_id")
+        if project_uuid in self._pending:
+            # a task is already processing this project, it will take it
+            self._pending[project_uuid].append(payload)
+            return
+        self._pending[project_uuid] = deque([payload])
+        task = asyncio.get_event_loop().create_task(self._process(project_uuid))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, project_uuid: str) -> None:
+        pending = self._pending[project_uuid]
+        try:
+            while pending:
+                # gives a chance to gather bursts (e.g. many tasks completing at once)
+                await asyncio.sleep(self.debounce_window)
+                payloads = list(pending)
+                pending.clear()
+                async with self._semaphore:
+                    await self._handle(project_uuid, payloads)
+        finally:
+            del self._pending[project_uuid]
 
-async def listen(app: web.Application):
+    async def _handle(self, project_uuid: str, payloads: List[Dict]) -> None:
+        self.num_updates += 1
+        try:
+            await _handle_db_notifications(
+                self.app, project_uuid, payloads, self._project_owners
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Unexpected error while handling %s", pformat(payloads))
+
+    async def close(self) -> None:
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        log.info(
+            "comp_tasks notifications dispatcher handled %d notifications in %d updates",
+            self.num_notifications,
+            self.num_updates,
+        )
+
+
+async def listen(app: web.Application, dispatcher: _NotificationsDispatcher):
     listen_query = f"LISTEN {DB_CHANNEL_NAME};"
-    db_engine: Engine = app[APP_DB_ENGINE_KEY]
-    async with db_engine.acquire() as conn:
-        await conn.execute(listen_query)
+    dsn = get_dsn(app)
+    # NOTE: this connection is locked waiting for notifications, therefore
+    # it is created apart from the engine's pool
+    async with aiopg.connect(
+        dsn.to_uri(), application_name=f"{dsn.application_name}_comp_tasks_listener"
+    ) as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(listen_query)
 
         while True:
-            # NOTE: this waits for a new notification so the engine is locked here
-            notification = await conn.connection.notifies.get()
+            notification = await conn.notifies.get()
             log.debug(
                 "received update from database: %s", pformat(notification.payload)
             )
             # get the data and the info on what changed
             payload: Dict = json.loads(notification.payload)
-
-            # FIXME: this part should be replaced by a pydantic CompTaskAtDB once it moves to director-v2
-            task_data = payload.get("data", {})
-            task_changes = payload.get("changes", [])
-
-            if not task_data:
-                log.error("task data invalid: %s", pformat(payload))
-                continue
-
-            if not task_changes:
-                log.error("no changes but still triggered: %s", pformat(payload))
-
-            project_uuid = task_data.get("project_id", None)
-            node_uuid = task_data.get("node_id", None)
-            outputs = task_data.get("outputs", {})
-            state = convert_state_from_db(task_data.get("state")).value
-
-            # FIXME: we do not know who triggered these changes. we assume the user had the rights to do so
-            # therefore we'll use the prj_owner user id. This should be fixed when the new sidecar comes in
-            # and comp_tasks/comp_pipeline get deprecated.
-            try:
-                # find the user(s) linked to that project
-                the_project_owner = await _get_project_owner(conn, project_uuid)
-
-                if "outputs" in task_changes:
-                    await _update_project_outputs(
-                        app, the_project_owner, project_uuid, node_uuid, outputs
-                    )
-
-                if "state" in task_changes:
-                    await _update_project_state(
-                        app, the_project_owner, project_uuid, node_uuid, state
-                    )
-
-            except projects_exceptions.ProjectNotFoundError as exc:
-                log.warning(
-                    "Project %s was not found and cannot be updated. Maybe was it deleted?",
-                    exc.project_uuid,
-                )
-                continue
-            except projects_exceptions.ProjectOwnerNotFoundError as exc:
-                log.warning(
-                    "Project owner of project %s could not be found, is the project valid?",
-                    exc.project_uuid,
-                )
-                continue
-            except projects_exceptions.NodeNotFoundError as exc:
-                log.warning(
-                    "Node %s of project %s not found and cannot be updated. Maybe was it deleted?",
-                    exc.node_uuid,
-                    exc.project_uuid,
-                )
-                continue
+            dispatcher.dispatch(payload)
 
 
 async def comp_tasks_listening_task(app: web.Application) -> None:
     log.info("starting comp_task db listening task...")
+    dispatcher = _NotificationsDispatcher(app)
     while True:
         try:
             log.info("listening to comp_task events...")
-            await listen(app)
+            await listen(app, dispatcher)
         except asyncio.CancelledError:
             # we are closing the app..
+            await dispatcher.close()
             return
         except Exception:  # pylint: disable=broad-except
             log.exception(
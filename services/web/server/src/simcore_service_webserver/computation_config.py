@@ -6,6 +6,7 @@
 from typing import Dict
 
 from aiohttp.web import Application
+from pydantic import Field, PositiveInt
 
 from models_library.settings.celery import CeleryConfig
 from servicelib.application_keys import APP_CONFIG_KEY
@@ -14,11 +15,46 @@ SERVICE_NAME = "computation"
 CONFIG_SECTION_NAME = SERVICE_NAME
 APP_CLIENT_RABBIT_DECORATED_HANDLERS_KEY: str = f"{__name__}.rabbit_handlers"
 APP_COMP_TASKS_LISTENING_KEY: str = f"{__name__}.comp_tasks_listening_key"
+APP_RABBIT_MESSAGE_WORKERS_KEY: str = f"{__name__}.rabbit_message_workers"
+APP_PROGRESS_COALESCER_KEY: str = f"{__name__}.progress_coalescer"
+APP_LOG_BATCHER_KEY: str = f"{__name__}.log_batcher"
 
 
 class ComputationSettings(CeleryConfig):
     enabled: bool = True
 
+    # log/progress messages consumption
+    messages_prefetch_count: PositiveInt = Field(
+        100,
+        description="Maximum number of unacknowledged log/progress messages delivered by rabbitMQ",
+        env="WEBSERVER_COMPUTATION_MESSAGES_PREFETCH_COUNT",
+    )
+    messages_workers: PositiveInt = Field(
+        4,
+        description="Number of concurrent log/progress messages handlers. Messages of a given node are always handled by the same worker",
+        env="WEBSERVER_COMPUTATION_MESSAGES_WORKERS",
+    )
+    messages_queue_size: PositiveInt = Field(
+        250,
+        description="Size of the per-worker queue of pending messages. When full, progress messages are dropped and log messages wait (i.e. backpressure on rabbitMQ)",
+        env="WEBSERVER_COMPUTATION_MESSAGES_QUEUE_SIZE",
+    )
+    progress_flush_interval_ms: PositiveInt = Field(
+        500,
+        description="Progress updates of computational nodes are coalesced and written to the projects' workbench at most once per interval",
+        env="WEBSERVER_COMPUTATION_PROGRESS_FLUSH_INTERVAL_MS",
+    )
+    logs_batch_window_ms: PositiveInt = Field(
+        250,
+        description="Log messages sent to a user are batched and emitted at most once per window",
+        env="WEBSERVER_COMPUTATION_LOGS_BATCH_WINDOW_MS",
+    )
+    logs_batch_max_size: PositiveInt = Field(
+        200,
+        description="Maximum number of log messages in a batch, a full batch is emitted right away",
+        env="WEBSERVER_COMPUTATION_LOGS_BATCH_MAX_SIZE",
+    )
+
 
 def get_config(app: Application) -> Dict:
     return app[APP_CONFIG_KEY][CONFIG_SECTION_NAME]
@@ -0,0 +1,134 @@
+""" Batches log messages of computational nodes before sending them to the users
+
+    Computational services can be very chatty. Instead of emitting a socket.io event
+    per log message, messages are buffered per user and emitted once per window (or
+    as soon as the batch is full). All the messages of a node within a batch are merged
+    in a single 'logger' event keeping their order.
+
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import attr
+from aiohttp import web
+from prometheus_client import Counter
+
+from .computation_config import APP_LOG_BATCHER_KEY, ComputationSettings
+from .computation_config import get_settings as get_computation_settings
+from .diagnostics_monitoring import kCOLLECTOR_REGISTRY
+from .socketio.events import post_messages
+
+log = logging.getLogger(__name__)
+
+SOCKET_IO_LOG_EVENT: str = "logger"
+
+
+def merge_log_messages(messages: List[Dict]) -> List[Dict]:
+    """Merges the messages of the same (project, node) keeping their order"""
+    merged: Dict[Tuple[str, str], Dict] = {}
+    for message in messages:
+        lines = message.get("Messages", [])
+        if not isinstance(lines, list):
+            lines = [lines]
+        key = (message.get("project_id"), message.get("Node"))
+        if key not in merged:
+            merged[key] = {**message, "Messages": list(lines)}
+        else:
+            merged[key]["Messages"].extend(lines)
+    return list(merged.values())
+
+
+@attr.s(auto_attribs=True)
+class LogBatcher:
+    app: web.Application
+    window: float
+    max_batch_size: int
+
+    _batches: Dict[int, List[Dict]] = attr.Factory(lambda: defaultdict(list))
+    _flush_task: Optional[asyncio.Task] = None
+    # keeps the order of the batches of a node (size and periodic flushes)
+    _lock: asyncio.Lock = attr.Factory(asyncio.Lock)
+
+    # counters (emitted events vs received messages = frames saved)
+    num_messages: int = 0
+    num_events: int = 0
+    _prometheus_counter: Optional[Counter] = None
+
+    async def add(self, user_id: int, message: Dict) -> None:
+        self.num_messages += 1
+        self._count("received")
+        batch = self._batches[user_id]
+        batch.append(message)
+        if len(batch) >= self.max_batch_size:
+            await self.flush(user_id)
+
+    async def flush(self, user_id: Optional[int] = None) -> None:
+        """Emits the batched messages (of a given user or of all users)"""
+        async with self._lock:
+            user_ids = [user_id] if user_id is not None else list(self._batches)
+            for uid in user_ids:
+                batch = self._batches.pop(uid, None)
+                if not batch:
+                    continue
+                for message in merge_log_messages(batch):
+                    self.num_events += 1
+                    self._count("emitted")
+                    await post_messages(self.app, uid, {SOCKET_IO_LOG_EVENT: message})
+
+    def _count(self, what: str) -> None:
+        if self._prometheus_counter:
+            self._prometheus_counter.labels(what).inc()
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.window)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Unexpected error while emitting log messages")
+
+    def start(self) -> None:
+        if kCOLLECTOR_REGISTRY in self.app:
+            self._prometheus_counter = Counter(
+                name="computation_log_messages_total",
+                documentation="Counts the log messages received from the computational backend and emitted to the users",
+                labelnames=["direction"],
+                namespace="simcore",
+                subsystem="webserver",
+                registry=self.app[kCOLLECTOR_REGISTRY],
+            )
+        self._flush_task = asyncio.get_event_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        await self.flush()
+        log.info(
+            "Log batcher emitted %d events for %d messages",
+            self.num_events,
+            self.num_messages,
+        )
+
+
+async def log_batcher_ctx(app: web.Application):
+    comp_settings: ComputationSettings = get_computation_settings(app)
+    batcher = LogBatcher(
+        app,
+        window=comp_settings.logs_batch_window_ms / 1000.0,
+        max_batch_size=comp_settings.logs_batch_max_size,
+    )
+    app[APP_LOG_BATCHER_KEY] = batcher
+    batcher.start()
+
+    yield
+
+    await batcher.stop()
+
+
+def get_log_batcher(app: web.Application) -> LogBatcher:
+    return app[APP_LOG_BATCHER_KEY]
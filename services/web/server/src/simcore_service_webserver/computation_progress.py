@@ -0,0 +1,157 @@
+""" Coalesces progress updates of computational nodes
+
+    Computational services emit progress messages at a high rate. Instead of
+    rewriting the project's workbench for every single message, the latest progress
+    per (project, node) is kept in memory and written at most once per flush interval
+    (or right away when a node completes) with a single write per project.
+
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+import attr
+from aiohttp import web
+from expiringdict import ExpiringDict
+
+from .computation_config import APP_PROGRESS_COALESCER_KEY, ComputationSettings
+from .computation_config import get_settings as get_computation_settings
+from .projects import projects_api
+from .projects.projects_exceptions import ProjectNotFoundError
+from .socketio.events import post_messages
+
+log = logging.getLogger(__name__)
+
+NodeKey = Tuple[str, str]  # (project_id, node_id)
+
+COMPLETED_PROGRESS = 1.0
+
+# nodes that never complete (failed, aborted, deleted) are forgotten after a while
+WRITTEN_PROGRESS_MAX_NODES = 10000
+WRITTEN_PROGRESS_MAX_AGE_SECS = 3600
+
+
+def _to_percent(progress: float) -> int:
+    # same rounding as in the workbench
+    return int(100.0 * float(progress) + 0.5)
+
+
+@attr.s(auto_attribs=True)
+class ProgressCoalescer:
+    app: web.Application
+    flush_interval: float
+
+    # latest not yet written progress per node and the user that reported it
+    _pending: Dict[NodeKey, Tuple[int, float]] = attr.Factory(dict)
+    # last progress written per node, to skip writes that would not change anything
+    _written: ExpiringDict = attr.Factory(
+        lambda: ExpiringDict(
+            max_len=WRITTEN_PROGRESS_MAX_NODES,
+            max_age_seconds=WRITTEN_PROGRESS_MAX_AGE_SECS,
+        )
+    )
+    _flush_task: Optional[asyncio.Task] = None
+    _lock: asyncio.Lock = attr.Factory(asyncio.Lock)
+
+    # counters
+    num_updates: int = 0
+    num_writes: int = 0
+
+    async def update(
+        self, user_id: int, project_id: str, node_id: str, progress: float
+    ) -> None:
+        self.num_updates += 1
+        key = (project_id, node_id)
+        if self._written.get(key) == _to_percent(progress):
+            self._pending.pop(key, None)
+            return
+
+        self._pending[key] = (user_id, progress)
+        if progress >= COMPLETED_PROGRESS:
+            await self.flush(project_id)
+
+    async def flush(self, project_id: Optional[str] = None) -> None:
+        """Writes pending progress updates (of a given project or of all projects)"""
+        async with self._lock:
+            updates_per_project: Dict[Tuple[int, str], Dict[str, float]] = defaultdict(
+                dict
+            )
+            for key in list(self._pending):
+                if project_id and key[0] != project_id:
+                    continue
+                user_id, progress = self._pending.pop(key)
+                updates_per_project[(user_id, key[0])][key[1]] = progress
+
+            for (user_id, prj_id), progress_per_node in updates_per_project.items():
+                await self._write(user_id, prj_id, progress_per_node)
+
+    async def _write(
+        self, user_id: int, project_id: str, progress_per_node: Dict[str, float]
+    ) -> None:
+        try:
+            project = await projects_api.update_project_nodes_progress(
+                self.app, user_id, project_id, progress_per_node
+            )
+        except ProjectNotFoundError:
+            log.warning(
+                "Project %s not found, discarding progress of nodes %s",
+                project_id,
+                list(progress_per_node),
+            )
+            return
+        self.num_writes += 1
+
+        for node_id, progress in progress_per_node.items():
+            if node_id not in project["workbench"]:
+                continue
+            if progress >= COMPLETED_PROGRESS:
+                self._written.pop((project_id, node_id), None)
+            else:
+                self._written[(project_id, node_id)] = _to_percent(progress)
+            messages = {
+                "nodeUpdated": {"Node": node_id, "Data": project["workbench"][node_id]}
+            }
+            await post_messages(self.app, user_id, messages)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Unexpected error while flushing progress updates")
+
+    def start(self) -> None:
+        self._flush_task = asyncio.get_event_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        # writes what is left
+        await self.flush()
+        log.info(
+            "Progress coalescer wrote %d times for %d updates",
+            self.num_writes,
+            self.num_updates,
+        )
+
+
+async def progress_coalescer_ctx(app: web.Application):
+    comp_settings: ComputationSettings = get_computation_settings(app)
+    coalescer = ProgressCoalescer(
+        app, flush_interval=comp_settings.progress_flush_interval_ms / 1000.0
+    )
+    app[APP_PROGRESS_COALESCER_KEY] = coalescer
+    coalescer.start()
+
+    yield
+
+    await coalescer.stop()
+
+
+def get_progress_coalescer(app: web.Application) -> ProgressCoalescer:
+    return app[APP_PROGRESS_COALESCER_KEY]
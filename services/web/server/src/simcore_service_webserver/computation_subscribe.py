@@ -3,7 +3,7 @@ import json
 import logging
 from functools import wraps
 from pprint import pformat
-from typing import Callable, Coroutine, Dict
+from typing import Callable, Coroutine, Dict, List, Optional, Tuple
 
 import aio_pika
 from aiohttp import web
@@ -19,11 +19,11 @@ from tenacity import retry
 from .computation_config import get_settings as get_computation_settings
 from .computation_config import (
     APP_CLIENT_RABBIT_DECORATED_HANDLERS_KEY,
+    APP_RABBIT_MESSAGE_WORKERS_KEY,
     ComputationSettings,
 )
-from .projects import projects_api
-from .projects.projects_exceptions import NodeNotFoundError, ProjectNotFoundError
-from .socketio.events import post_messages
+from .computation_logs import get_log_batcher
+from .computation_progress import get_progress_coalescer
 
 log = logging.getLogger(__file__)
 
@@ -51,35 +51,95 @@ async def parse_rabbit_message_data(app: web.Application, data: Dict) -> None:
     project_id = data["project_id"]
     node_id = data["Node"]
 
-    try:
-        messages = {}
-        if data["Channel"] == "Progress":
-            # update corresponding project, node, progress value
-            project = await projects_api.update_project_node_progress(
-                app, user_id, project_id, node_id, progress=data["Progress"]
-            )
-            messages["nodeUpdated"] = {
-                "Node": node_id,
-                "Data": project["workbench"][node_id],
-            }
-        elif data["Channel"] == "Log":
-            messages["logger"] = data
-        if messages:
-            await post_messages(app, user_id, messages)
-    except ProjectNotFoundError:
-        log.exception("parsed rabbit message invalid")
-    except NodeNotFoundError:
-        log.exception("parsed rabbit message invalid")
+    if data["Channel"] == "Progress":
+        # update corresponding project, node, progress value
+        # NOTE: updates are coalesced and nodeUpdated is emitted upon writing
+        await get_progress_coalescer(app).update(
+            user_id, project_id, node_id, progress=data["Progress"]
+        )
+    elif data["Channel"] == "Log":
+        # NOTE: logs are batched per user and emitted by the log batcher
+        await get_log_batcher(app).add(user_id, data)
+
+
+def _get_progress_key(data: Dict) -> Optional[Tuple[str, str]]:
+    if data.get("Channel") != "Progress":
+        return None
+    return (data.get("project_id"), data.get("Node"))
+
+
+async def rabbit_message_worker(app: web.Application, queue: asyncio.Queue) -> None:
+    queued_progress: Dict[Tuple[str, str], Dict] = app[APP_RABBIT_MESSAGE_WORKERS_KEY][
+        "queued_progress"
+    ]
+    while True:
+        data = await queue.get()
+        progress_key = _get_progress_key(data)
+        if progress_key:
+            # from now on, newer progress of this node is queued again
+            queued_progress.pop(progress_key, None)
+        try:
+            await parse_rabbit_message_data(app, data)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Unexpected error while handling rabbit message")
+        finally:
+            queue.task_done()
+
+
+def _get_worker_queue(app: web.Application, data: Dict) -> asyncio.Queue:
+    # messages of the same node always go to the same worker to keep their order
+    queues: List[asyncio.Queue] = app[APP_RABBIT_MESSAGE_WORKERS_KEY]["queues"]
+    return queues[hash(data.get("Node")) % len(queues)]
 
 
 async def rabbit_message_handler(
     message: aio_pika.IncomingMessage, app: web.Application
 ) -> None:
-    data = json.loads(message.body)
-    # TODO: create a task here instead of blocking
-    await parse_rabbit_message_data(app, data)
-    # NOTE: this allows the webserver to breath if a lot of messages are entering
-    await asyncio.sleep(1)
+    async with message.process():
+        data = json.loads(message.body)
+        progress_key = _get_progress_key(data)
+        if progress_key:
+            queued_progress: Dict[Tuple[str, str], Dict] = app[
+                APP_RABBIT_MESSAGE_WORKERS_KEY
+            ]["queued_progress"]
+            if progress_key in queued_progress:
+                # progress is a state, the one still queued for this node is
+                # replaced by this newer one (e.g. the final 1.0 is never lost)
+                queued_progress[progress_key].update(data)
+                return
+            queued_progress[progress_key] = data
+        queue = _get_worker_queue(app, data)
+        # NOTE: the message is acknowledged once queued. While waiting here
+        # rabbitMQ stops delivering beyond prefetch_count (i.e. backpressure)
+        await queue.put(data)
+
+
+async def start_rabbit_message_workers(app: web.Application) -> None:
+    comp_settings: ComputationSettings = get_computation_settings(app)
+    queues = [
+        asyncio.Queue(maxsize=comp_settings.messages_queue_size)
+        for _ in range(comp_settings.messages_workers)
+    ]
+    app[APP_RABBIT_MESSAGE_WORKERS_KEY] = {
+        "queues": queues,
+        # progress message queued per (project, node), not yet handled by a worker
+        "queued_progress": {},
+        "tasks": [
+            asyncio.get_event_loop().create_task(rabbit_message_worker(app, queue))
+            for queue in queues
+        ],
+    }
+
+
+async def stop_rabbit_message_workers(app: web.Application) -> None:
+    workers = app.get(APP_RABBIT_MESSAGE_WORKERS_KEY)
+    if not workers:
+        return
+    for task in workers["tasks"]:
+        task.cancel()
+    await asyncio.gather(*workers["tasks"], return_exceptions=True)
 
 
 async def instrumentation_message_handler(
@@ -110,7 +170,7 @@ async def subscribe(app: web.Application) -> None:
     )
 
     channel = await connection.channel()
-    await channel.set_qos(prefetch_count=1)
+    await channel.set_qos(prefetch_count=comp_settings.messages_prefetch_count)
 
     pika_log_channel = comp_settings.rabbit.channels["log"]
     logs_exchange = await channel.declare_exchange(
@@ -128,11 +188,12 @@ async def subscribe(app: web.Application) -> None:
     await logs_progress_queue.bind(logs_exchange)
 
     # Start listening the queue with name 'task_queue'
+    await start_rabbit_message_workers(app)
     partial_rabbit_message_handler = rabbit_adapter(app)(rabbit_message_handler)
     # TODO: Why are we saving this in the app??
     app[APP_CLIENT_RABBIT_DECORATED_HANDLERS_KEY] = [partial_rabbit_message_handler]
     await logs_progress_queue.consume(
-        partial_rabbit_message_handler, exclusive=True, no_ack=True
+        partial_rabbit_message_handler, exclusive=True, no_ack=False
     )
 
     # instrumentation
@@ -24,12 +24,14 @@ THIS_SERVICE_NAME = "postgres"
 
 log = logging.getLogger(__name__)
 
+APP_DB_DSN_KEY = f"{__name__}.dsn"
+
 
 async def pg_engine(app: web.Application):
     cfg = app[APP_CONFIG_KEY][CONFIG_SECTION_NAME]
     pg_cfg = cfg["postgres"]
 
-    app[f"{__name__}.dsn"] = dsn = DataSourceName(
+    app[APP_DB_DSN_KEY] = dsn = DataSourceName(
         application_name=f"{__name__}_{id(app)}",
         database=pg_cfg["database"],
         user=pg_cfg["user"],
@@ -64,6 +66,10 @@ async def pg_engine(app: web.Application):
     )
 
 
+def get_dsn(app: web.Application) -> DataSourceName:
+    return app[APP_DB_DSN_KEY]
+
+
 def is_service_enabled(app: web.Application):
     return app.get(APP_DB_ENGINE_KEY) is not None
 
@@ -286,73 +286,46 @@ async def delete_project_node(
     )
 
 
-async def update_project_node_state(
-    app: web.Application, user_id: int, project_id: str, node_id: str, new_state: str
-) -> Dict:
-    log.debug(
-        "updating node %s state in project %s for user %s", node_id, project_id, user_id
-    )
-    project = await get_project_for_user(app, project_id, user_id)
-    if not node_id in project["workbench"]:
-        raise NodeNotFoundError(project_id, node_id)
-    project["workbench"][node_id]["state"] = new_state
-    db = app[APP_PROJECT_DBAPI]
-    updated_project = await db.update_user_project(project, user_id, project_id)
-    updated_project["state"] = await get_project_state_for_user(
-        user_id, project_id, app
-    )
-    return updated_project
-
-
-async def update_project_node_progress(
-    app: web.Application, user_id: int, project_id: str, node_id: str, progress: float
-) -> Optional[Dict]:
-    log.debug(
-        "updating node %s progress in project %s for user %s with %s",
-        node_id,
-        project_id,
-        user_id,
-        progress,
-    )
-    project = await get_project_for_user(app, project_id, user_id)
-    if not node_id in project["workbench"]:
-        raise NodeNotFoundError(project_id, node_id)
-
-    project["workbench"][node_id]["progress"] = int(100.0 * float(progress) + 0.5)
-    db = app[APP_PROJECT_DBAPI]
-    updated_project = await db.update_user_project(project, user_id, project_id)
-    updated_project["state"] = await get_project_state_for_user(
-        user_id, project_id, app
-    )
-    return updated_project
-
-
-async def update_project_node_outputs(
+async def update_project_nodes_progress(
     app: web.Application,
     user_id: int,
     project_id: str,
-    node_id: str,
-    data: Optional[Dict],
+    progress_per_node: Dict[str, float],
 ) -> Dict:
-    """
-    Updates outputs of a given node in a project with 'data'
+    """Updates the progress of several nodes of a project with a single write
+
+    Nodes that are not in the project's workbench are ignored
+    NOTE: the returned project does not include its state
     """
     log.debug(
-        "updating node %s outputs in project %s for user %s with %s",
-        node_id,
+        "updating nodes progress in project %s for user %s with %s",
         project_id,
         user_id,
-        pformat(data),
+        progress_per_node,
     )
-    data: Dict[str, Any] = data or {}
     project = await get_project_for_user(app, project_id, user_id)
+    num_updated_nodes = 0
+    for node_id, progress in progress_per_node.items():
+        if not node_id in project["workbench"]:
+            log.warning(
+                "Node %s not found in project %s, skipping progress update",
+                node_id,
+                project_id,
+            )
+            continue
+        project["workbench"][node_id]["progress"] = int(100.0 * float(progress) + 0.5)
+        num_updated_nodes += 1
+    if not num_updated_nodes:
+        return project
+    db = app[APP_PROJECT_DBAPI]
+    updated_project = await db.update_user_project(project, user_id, project_id)
+    return updated_project
 
-    if not node_id in project["workbench"]:
-        raise NodeNotFoundError(project_id, node_id)
 
+def _update_node_outputs(node: Dict[str, Any], data: Dict[str, Any]) -> None:
     # NOTE: update outputs (not required) if necessary as the UI expects a
     # dataset/label field that is missing
-    outputs: Dict[str, Any] = project["workbench"][node_id].setdefault("outputs", {})
+    outputs: Dict[str, Any] = node.setdefault("outputs", {})
     outputs.update(data)
 
     for output_key in outputs.keys():
@@ -365,6 +338,38 @@ async def update_project_node_outputs(
             outputs[output_key]["dataset"] = study_id
             outputs[output_key]["label"] = file_ext
 
+
+async def update_project_nodes(
+    app: web.Application,
+    user_id: int,
+    project_id: str,
+    states: Optional[Dict[str, str]] = None,
+    outputs: Optional[Dict[str, Dict]] = None,
+) -> Dict:
+    """
+    Updates states and/or outputs of several nodes of a project with a single write
+
+    Raises NodeNotFoundError if any of the nodes is not in the project
+    """
+    log.debug(
+        "updating nodes in project %s for user %s with states %s and outputs %s",
+        project_id,
+        user_id,
+        states,
+        pformat(outputs),
+    )
+    states = states or {}
+    outputs = outputs or {}
+    project = await get_project_for_user(app, project_id, user_id)
+
+    for node_id in set(states) | set(outputs):
+        if not node_id in project["workbench"]:
+            raise NodeNotFoundError(project_id, node_id)
+    for node_id, data in outputs.items():
+        _update_node_outputs(project["workbench"][node_id], data)
+    for node_id, new_state in states.items():
+        project["workbench"][node_id]["state"] = new_state
+
     db = app[APP_PROJECT_DBAPI]
     updated_project = await db.update_user_project(project, user_id, project_id)
     updated_project["state"] = await get_project_state_for_user(
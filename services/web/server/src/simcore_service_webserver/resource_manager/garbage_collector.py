@@ -168,8 +168,16 @@ async def remove_disconnected_user_resources(
     alive_keys, dead_keys = await registry.get_all_resource_keys()
     logger.debug("potential dead keys: %s", dead_keys)
 
+    # hashable view of alive keys for fast membership tests
+    alive_hash_keys = {
+        RedisResourceRegistry._hash_key(k)  # pylint: disable=protected-access
+        for k in alive_keys
+    }
+    # fetches all resources of the dead keys at once
+    all_dead_keys_resources = await registry.get_resources_of_keys(dead_keys)
+
     # clean up all resources of expired keys
-    for dead_key in dead_keys:
+    for dead_key, dead_key_resources in zip(dead_keys, all_dead_keys_resources):
 
         # Skip locked keys for the moment
         user_id = int(dead_key["user_id"])
@@ -183,7 +191,6 @@ async def remove_disconnected_user_resources(
             continue
 
         # (0) If key has no resources => remove from registry and continue
-        dead_key_resources = await registry.get_resources(dead_key)
         if not dead_key_resources:
             await registry.remove_key(dead_key)
             continue
@@ -216,7 +223,9 @@ async def remove_disconnected_user_resources(
                 if k != dead_key
             ]
             is_resource_still_in_use: bool = any(
-                k in alive_keys for k in other_keys_with_this_resource
+                RedisResourceRegistry._hash_key(k)  # pylint: disable=protected-access
+                in alive_hash_keys
+                for k in other_keys_with_this_resource
             )
 
             if not is_resource_still_in_use:
@@ -333,8 +342,7 @@ async def remove_orphaned_services(
 
     currently_opened_projects_node_ids = set()
     alive_keys, _ = await registry.get_all_resource_keys()
-    for alive_key in alive_keys:
-        resources = await registry.get_resources(alive_key)
+    for resources in await registry.get_resources_of_keys(alive_keys):
         if "project_id" not in resources:
             continue
 
@@ -18,7 +18,7 @@ from .config import (
 )
 from .garbage_collector import setup_garbage_collector
 from .redis import setup_redis_client
-from .registry import RedisResourceRegistry
+from .registry import RedisResourceRegistry, registry_index_ctx
 
 logger = logging.getLogger(__name__)
 
@@ -38,5 +38,6 @@ def setup_resource_manager(app: web.Application) -> bool:
     app[APP_RESOURCE_MANAGER_TASKS_KEY] = []
     setup_redis_client(app)
     app[APP_CLIENT_SOCKET_REGISTRY_KEY] = RedisResourceRegistry(app)
+    app.cleanup_ctx.append(registry_index_ctx)
     setup_garbage_collector(app)
     return True
@@ -10,6 +10,9 @@
     A key can be set as "alive". This creates a secondary key (e.g. "user_id=a_user_id:some_other_id=123:alive").
     This key can have a timeout value. When the key times out then the key disappears from Redis automatically.
 
+    Every resource (resource_name, resource_value) is also indexed in a Redis set (e.g. "project_id=some_uuid:index")
+    holding the hash names that own it. The index is updated atomically with the hashes (via lua scripts) so that
+    looking up which keys hold a given resource does not require scanning the whole keyspace.
 
 """
 
@@ -27,6 +30,33 @@ log = logging.getLogger(__name__)
 
 RESOURCE_SUFFIX = "resources"
 ALIVE_SUFFIX = "alive"
+INDEX_SUFFIX = "index"
+
+# NOTE: index keys are built inside the scripts as "{field}={value}:index", keep in sync with _index_key
+_SET_RESOURCE_SCRIPT = """
+local old_value = redis.call('HGET', KEYS[1], ARGV[1])
+if old_value then
+    redis.call('SREM', ARGV[1] .. '=' .. old_value .. ':' .. ARGV[3], KEYS[1])
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('SADD', ARGV[1] .. '=' .. ARGV[2] .. ':' .. ARGV[3], KEYS[1])
+"""
+
+_REMOVE_RESOURCE_SCRIPT = """
+local old_value = redis.call('HGET', KEYS[1], ARGV[1])
+if old_value then
+    redis.call('SREM', ARGV[1] .. '=' .. old_value .. ':' .. ARGV[2], KEYS[1])
+end
+return redis.call('HDEL', KEYS[1], ARGV[1])
+"""
+
+_REMOVE_KEY_SCRIPT = """
+local fields = redis.call('HGETALL', KEYS[1])
+for i = 1, #fields, 2 do
+    redis.call('SREM', fields[i] .. '=' .. fields[i + 1] .. ':' .. ARGV[1], KEYS[1])
+end
+return redis.call('DEL', KEYS[1], KEYS[2])
+"""
 
 
 @attr.s(auto_attribs=True)
@@ -54,6 +84,11 @@ class RedisResourceRegistry:
         key = dict(x.split("=") for x in tmp_key.split(":"))
         return key
 
+    @classmethod
+    def _index_key(cls, resource: Tuple[str, str]) -> str:
+        field, value = resource
+        return f"{field}={value}:{INDEX_SUFFIX}"
+
     @property
     def client(self) -> aioredis.Redis:
         return get_redis_client(self.app)
@@ -63,7 +98,11 @@ class RedisResourceRegistry:
     ) -> None:
         hash_key = f"{self._hash_key(key)}:{RESOURCE_SUFFIX}"
         field, value = resource
-        await self.client.hmset_dict(hash_key, **{field: value})
+        await self.client.eval(
+            _SET_RESOURCE_SCRIPT,
+            keys=[hash_key],
+            args=[field, value, INDEX_SUFFIX],
+        )
 
     async def get_resources(self, key: Dict[str, str]) -> Dict[str, str]:
         hash_key = f"{self._hash_key(key)}:{RESOURCE_SUFFIX}"
@@ -71,7 +110,11 @@ class RedisResourceRegistry:
 
     async def remove_resource(self, key: Dict[str, str], resource_name: str) -> None:
         hash_key = f"{self._hash_key(key)}:{RESOURCE_SUFFIX}"
-        await self.client.hdel(hash_key, resource_name)
+        await self.client.eval(
+            _REMOVE_RESOURCE_SCRIPT,
+            keys=[hash_key],
+            args=[resource_name, INDEX_SUFFIX],
+        )
 
     async def find_resources(
         self, key: Dict[str, str], resource_name: str
@@ -79,9 +122,17 @@ class RedisResourceRegistry:
         resources = []
         # the key might only be partialy complete
         partial_hash_key = f"{self._hash_key(key)}:{RESOURCE_SUFFIX}"
-        async for key in self.client.iscan(match=partial_hash_key):
-            if await self.client.hexists(key, resource_name):
-                resources.append(await self.client.hget(key, resource_name))
+        hash_keys = [
+            hash_key async for hash_key in self.client.iscan(match=partial_hash_key)
+        ]
+        if not hash_keys:
+            return resources
+
+        # one round trip for all the matching hashes
+        pipe = self.client.pipeline()
+        for hash_key in hash_keys:
+            pipe.hget(hash_key, resource_name)
+        resources = [value for value in await pipe.execute() if value is not None]
         return resources
 
     async def find_keys(self, resource: Tuple[str, str]) -> List[Dict[str, str]]:
@@ -89,11 +140,8 @@ class RedisResourceRegistry:
         if not resource:
             return keys
 
-        field, value = resource
-
-        async for hash_key in self.client.iscan(match=f"*:{RESOURCE_SUFFIX}"):
-            if value == await self.client.hget(hash_key, field):
-                keys.append(self._decode_hash_key(hash_key))
+        hash_keys = await self.client.smembers(self._index_key(resource))
+        keys = [self._decode_hash_key(hash_key) for hash_key in hash_keys]
         return keys
 
     async def set_key_alive(self, key: Dict[str, str], timeout: int) -> None:
@@ -107,26 +155,90 @@ class RedisResourceRegistry:
         return await self.client.exists(hash_key) > 0
 
     async def remove_key(self, key: Dict[str, str]) -> None:
-        await self.client.delete(
-            f"{self._hash_key(key)}:{RESOURCE_SUFFIX}",
-            f"{self._hash_key(key)}:{ALIVE_SUFFIX}",
+        await self.client.eval(
+            _REMOVE_KEY_SCRIPT,
+            keys=[
+                f"{self._hash_key(key)}:{RESOURCE_SUFFIX}",
+                f"{self._hash_key(key)}:{ALIVE_SUFFIX}",
+            ],
+            args=[INDEX_SUFFIX],
         )
 
+    async def rebuild_index(self) -> None:
+        """Synchronizes the resources index with the resources hashes
+
+        Removes index entries pointing to hashes that do not hold the resource anymore
+        and indexes resources that were stored without index (e.g. by a previous version)
+        """
+        # drop stale entries
+        async for index_key in self.client.iscan(match=f"*:{INDEX_SUFFIX}"):
+            field, value = index_key[: -len(f":{INDEX_SUFFIX}")].split("=", 1)
+            hash_keys = await self.client.smembers(index_key)
+            if not hash_keys:
+                continue
+            pipe = self.client.pipeline()
+            for hash_key in hash_keys:
+                pipe.hget(hash_key, field)
+            stale_hash_keys = [
+                hash_key
+                for hash_key, current_value in zip(hash_keys, await pipe.execute())
+                if current_value != value
+            ]
+            if stale_hash_keys:
+                await self.client.srem(index_key, *stale_hash_keys)
+
+        # index all existing resources
+        async for hash_key in self.client.iscan(match=f"*:{RESOURCE_SUFFIX}"):
+            resources = await self.client.hgetall(hash_key)
+            if not resources:
+                continue
+            pipe = self.client.pipeline()
+            for resource in resources.items():
+                pipe.sadd(self._index_key(resource), hash_key)
+            await pipe.execute()
+
     async def get_all_resource_keys(
         self,
     ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
-        alive_keys = [
-            self._decode_hash_key(hash_key)
+        alive_hash_keys = {
+            hash_key[: -len(f":{ALIVE_SUFFIX}")]
             async for hash_key in self.client.iscan(match=f"*:{ALIVE_SUFFIX}")
+        }
+        resource_hash_keys = {
+            hash_key[: -len(f":{RESOURCE_SUFFIX}")]
+            async for hash_key in self.client.iscan(match=f"*:{RESOURCE_SUFFIX}")
+        }
+        alive_keys = [
+            self._decode_hash_key(f"{hash_key}:{ALIVE_SUFFIX}")
+            for hash_key in alive_hash_keys
         ]
         dead_keys = [
-            self._decode_hash_key(hash_key)
-            async for hash_key in self.client.iscan(match=f"*:{RESOURCE_SUFFIX}")
-            if self._decode_hash_key(hash_key) not in alive_keys
+            self._decode_hash_key(f"{hash_key}:{RESOURCE_SUFFIX}")
+            for hash_key in resource_hash_keys - alive_hash_keys
         ]
 
         return (alive_keys, dead_keys)
 
+    async def get_resources_of_keys(
+        self, keys: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """Same as get_resources for many keys in a single round trip"""
+        if not keys:
+            return []
+        pipe = self.client.pipeline()
+        for key in keys:
+            pipe.hgetall(f"{self._hash_key(key)}:{RESOURCE_SUFFIX}")
+        return await pipe.execute()
+
 
 def get_registry(app: web.Application) -> RedisResourceRegistry:
     return app[APP_CLIENT_SOCKET_REGISTRY_KEY]
+
+
+async def registry_index_ctx(app: web.Application):
+    """Rebuilds the resources index upon startup, e.g. after upgrading from an index-less registry"""
+    if get_redis_client(app) is not None:
+        log.info("Rebuilding resource registry index ...")
+        await get_registry(app).rebuild_index()
+        log.info("Resource registry index rebuilt")
+    yield
@@ -5,7 +5,7 @@
 import json
 import time
 from asyncio import sleep
-from typing import Any, Callable, Dict, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 from uuid import uuid4
 
 import aio_pika
@@ -16,6 +16,7 @@ from models_library.settings.rabbit import RabbitConfig
 from servicelib.application import create_safe_application
 from servicelib.application_keys import APP_CONFIG_KEY
 from simcore_service_webserver.computation import setup_computation
+from simcore_service_webserver.computation_logs import merge_log_messages
 from simcore_service_webserver.director_v2 import setup_director_v2
 from simcore_service_webserver.computation_config import CONFIG_SECTION_NAME
 from simcore_service_webserver.db import setup_db
@@ -231,7 +232,9 @@ async def test_rabbit_websocket_computation(
         return mock_log_handler_fct.call_count == (NUMBER_OF_MESSAGES)
 
     await _wait_until(predicate, TIMEOUT_S)
-    log_calls = [call(json.dumps(message)) for message in log_messages]
+    log_calls = [
+        call(json.dumps(message)) for message in merge_log_messages(log_messages)
+    ]
     mock_log_handler_fct.assert_has_calls(log_calls, any_order=True)
     mock_node_update_handler_fct.assert_not_called()
     # publish message with correct user id, project but not node
@@ -244,7 +247,9 @@ async def test_rabbit_websocket_computation(
         rabbit_exchange,
     )
     await _wait_until(predicate, TIMEOUT_S)
-    log_calls = [call(json.dumps(message)) for message in log_messages]
+    log_calls = [
+        call(json.dumps(message)) for message in merge_log_messages(log_messages)
+    ]
     mock_log_handler_fct.assert_has_calls(log_calls, any_order=True)
     mock_node_update_handler_fct.assert_not_called()
     mock_log_handler_fct.reset_mock()
@@ -266,7 +271,52 @@ async def test_rabbit_websocket_computation(
         ) and mock_node_update_handler_fct.call_count == (NUMBER_OF_MESSAGES)
 
     await _wait_until(predicate2, TIMEOUT_S)
-    log_calls = [call(json.dumps(message)) for message in log_messages]
+    log_calls = [
+        call(json.dumps(message)) for message in merge_log_messages(log_messages)
+    ]
     mock_log_handler_fct.assert_has_calls(log_calls, any_order=True)
     mock_node_update_handler_fct.assert_called()
     assert mock_node_update_handler_fct.call_count == (NUMBER_OF_MESSAGES)
+
+
+async def test_rabbit_websocket_computation_throughput(
+    director_v2_subsystem_mock,
+    mock_orphaned_services,
+    logged_user,
+    user_project,
+    socketio_client,
+    client_session_id: str,
+    mocker,
+    rabbit_exchange: Tuple[aio_pika.Exchange, aio_pika.Exchange],
+):
+    sio = await socketio_client(client_session_id)
+    mock_log_handler_fct = mocker.Mock()
+    sio.on("logger", handler=mock_log_handler_fct)
+
+    # messages are no longer handled one per second
+    NUMBER_OF_MESSAGES = 100
+    TIMEOUT_S = 20
+
+    node_uuid = list(user_project["workbench"])[0]
+    log_messages, _, _ = await _publish_messages(
+        NUMBER_OF_MESSAGES,
+        node_uuid,
+        logged_user["id"],
+        user_project["uuid"],
+        rabbit_exchange,
+    )
+
+    def _received_lines() -> List[str]:
+        return [
+            line
+            for args in mock_log_handler_fct.call_args_list
+            for line in json.loads(args[0][0])["Messages"]
+        ]
+
+    def predicate() -> bool:
+        return len(_received_lines()) == NUMBER_OF_MESSAGES
+
+    await _wait_until(predicate, TIMEOUT_S)
+    # messages of a node keep their order and are batched in fewer events
+    assert _received_lines() == [message["Messages"] for message in log_messages]
+    assert mock_log_handler_fct.call_count < NUMBER_OF_MESSAGES
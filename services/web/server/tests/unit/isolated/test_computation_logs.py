@@ -0,0 +1,99 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+
+import asyncio
+
+import pytest
+
+from pytest_simcore.helpers.utils_mock import future_with_result
+from simcore_service_webserver.computation_logs import LogBatcher, merge_log_messages
+
+USER_ID = 3
+
+
+def _log(node_id: str, line: str, project_id: str = "some_project"):
+    return {
+        "Channel": "Log",
+        "Node": node_id,
+        "project_id": project_id,
+        "user_id": USER_ID,
+        "Messages": [line],
+    }
+
+
+def test_merge_log_messages():
+    messages = [
+        _log("node_1", "line 1"),
+        _log("node_2", "line 1"),
+        _log("node_1", "line 2"),
+        {**_log("node_2", ""), "Messages": "line 2"},
+        _log("node_1", "line 1", project_id="other_project"),
+    ]
+    assert merge_log_messages(messages) == [
+        {**_log("node_1", "line 1"), "Messages": ["line 1", "line 2"]},
+        {**_log("node_2", "line 1"), "Messages": ["line 1", "line 2"]},
+        _log("node_1", "line 1", project_id="other_project"),
+    ]
+    # inputs are not modified
+    assert messages[0]["Messages"] == ["line 1"]
+
+
+@pytest.fixture
+def mocked_post_messages(loop, mocker):
+    return mocker.patch(
+        "simcore_service_webserver.computation_logs.post_messages",
+        return_value=future_with_result(None),
+    )
+
+
+async def test_log_batcher(mocked_post_messages):
+    batcher = LogBatcher(app={}, window=1, max_batch_size=10)
+
+    for n in range(9):
+        await batcher.add(USER_ID, _log("node_1", f"line {n}"))
+    mocked_post_messages.assert_not_called()
+
+    # full batch is emitted right away
+    await batcher.add(USER_ID, _log("node_1", "line 9"))
+    mocked_post_messages.assert_called_once_with(
+        {},
+        USER_ID,
+        {
+            "logger": {
+                **_log("node_1", ""),
+                "Messages": [f"line {n}" for n in range(10)],
+            }
+        },
+    )
+
+    await batcher.add(USER_ID, _log("node_1", "line 10"))
+    await batcher.flush()
+    assert mocked_post_messages.call_count == 2
+    assert batcher.num_messages == 11
+    assert batcher.num_events == 2
+
+
+async def test_log_batcher_keeps_order_of_concurrent_flushes(loop, mocker):
+    emitted = []
+    delays = iter([0.2, 0])
+
+    async def slow_post_messages(app, user_id, messages):
+        await asyncio.sleep(next(delays))
+        emitted.extend(messages["logger"]["Messages"])
+
+    mocker.patch(
+        "simcore_service_webserver.computation_logs.post_messages",
+        side_effect=slow_post_messages,
+    )
+    batcher = LogBatcher(app={}, window=1, max_batch_size=2)
+
+    await batcher.add(USER_ID, _log("node_1", "line 0"))
+    periodic_flush = asyncio.ensure_future(batcher.flush())
+    await asyncio.sleep(0)
+    # a full batch while the periodic flush is still emitting
+    await batcher.add(USER_ID, _log("node_1", "line 1"))
+    await batcher.add(USER_ID, _log("node_1", "line 2"))
+    await periodic_flush
+
+    assert emitted == ["line 0", "line 1", "line 2"]
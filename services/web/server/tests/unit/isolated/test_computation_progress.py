@@ -0,0 +1,91 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+
+from typing import Dict
+
+import pytest
+
+from pytest_simcore.helpers.utils_mock import future_with_result
+from simcore_service_webserver.computation_progress import ProgressCoalescer
+
+USER_ID = 3
+PROJECT_ID = "some_project"
+
+
+@pytest.fixture
+def mocked_projects_api(loop, mocker):
+    def _fake_update(app, user_id, project_id, progress_per_node: Dict):
+        return future_with_result(
+            {
+                "workbench": {
+                    node_id: {"progress": int(100.0 * progress + 0.5)}
+                    for node_id, progress in progress_per_node.items()
+                }
+            }
+        )
+
+    return mocker.patch(
+        "simcore_service_webserver.computation_progress.projects_api.update_project_nodes_progress",
+        side_effect=_fake_update,
+    )
+
+
+@pytest.fixture
+def mocked_post_messages(loop, mocker):
+    return mocker.patch(
+        "simcore_service_webserver.computation_progress.post_messages",
+        return_value=future_with_result(None),
+    )
+
+
+async def test_progress_updates_are_coalesced(
+    mocked_projects_api, mocked_post_messages
+):
+    coalescer = ProgressCoalescer(app={}, flush_interval=1)
+
+    for n in range(100):
+        await coalescer.update(USER_ID, PROJECT_ID, "node_1", progress=n / 1000)
+        await coalescer.update(USER_ID, PROJECT_ID, "node_2", progress=n / 1000)
+    mocked_projects_api.assert_not_called()
+
+    await coalescer.flush()
+    # only the latest progress of each node is written, in a single write
+    mocked_projects_api.assert_called_once_with(
+        {}, USER_ID, PROJECT_ID, {"node_1": 99 / 1000, "node_2": 99 / 1000}
+    )
+    assert mocked_post_messages.call_count == 2
+    mocked_post_messages.assert_called_with(
+        {}, USER_ID, {"nodeUpdated": {"Node": "node_2", "Data": {"progress": 10}}}
+    )
+
+    # same percentage as written does not trigger writes
+    await coalescer.update(USER_ID, PROJECT_ID, "node_1", progress=0.1)
+    await coalescer.flush()
+    assert mocked_projects_api.call_count == 1
+
+    # completion is written right away
+    await coalescer.update(USER_ID, PROJECT_ID, "node_1", progress=1.0)
+    assert mocked_projects_api.call_count == 2
+    mocked_post_messages.assert_called_with(
+        {}, USER_ID, {"nodeUpdated": {"Node": "node_1", "Data": {"progress": 100}}}
+    )
+
+    assert coalescer.num_updates == 202
+    assert coalescer.num_writes == 2
+
+
+async def test_written_progress_is_bounded(
+    mocked_projects_api, mocked_post_messages, monkeypatch
+):
+    monkeypatch.setattr(
+        "simcore_service_webserver.computation_progress.WRITTEN_PROGRESS_MAX_NODES", 10
+    )
+    coalescer = ProgressCoalescer(app={}, flush_interval=1)
+
+    # e.g. nodes that fail and never reach completion
+    for n in range(100):
+        await coalescer.update(USER_ID, PROJECT_ID, f"node_{n}", progress=0.5)
+        await coalescer.flush()
+
+    assert len(coalescer._written) == 10  # pylint: disable=protected-access
@@ -0,0 +1,87 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+
+import asyncio
+import json
+from typing import Dict
+
+import pytest
+
+from pytest_simcore.helpers.utils_mock import future_with_result
+from simcore_service_webserver.computation_config import (
+    APP_RABBIT_MESSAGE_WORKERS_KEY,
+)
+from simcore_service_webserver.computation_subscribe import (
+    rabbit_message_handler,
+    rabbit_message_worker,
+)
+
+
+class FakeIncomingMessage:
+    def __init__(self, data: Dict):
+        self.body = json.dumps(data).encode()
+
+    def process(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+def _progress(node_id: str, progress: float) -> Dict:
+    return {
+        "Channel": "Progress",
+        "Node": node_id,
+        "project_id": "some_project",
+        "user_id": 3,
+        "Progress": progress,
+    }
+
+
+@pytest.fixture
+def app(loop) -> Dict:
+    # no worker is running, the messages stay queued
+    return {
+        APP_RABBIT_MESSAGE_WORKERS_KEY: {
+            "queues": [asyncio.Queue(maxsize=10)],
+            "queued_progress": {},
+            "tasks": [],
+        }
+    }
+
+
+async def test_queued_progress_is_replaced(app: Dict, mocker):
+    mocked_parse = mocker.patch(
+        "simcore_service_webserver.computation_subscribe.parse_rabbit_message_data",
+        return_value=future_with_result(None),
+    )
+    queue = app[APP_RABBIT_MESSAGE_WORKERS_KEY]["queues"][0]
+
+    for progress in [0.1, 0.5, 1.0]:
+        await rabbit_message_handler(
+            FakeIncomingMessage(_progress("node_1", progress)), app=app
+        )
+    await rabbit_message_handler(FakeIncomingMessage(_progress("node_2", 0.3)), app=app)
+    # only the latest progress of each node is queued
+    assert queue.qsize() == 2
+
+    worker = asyncio.ensure_future(rabbit_message_worker(app, queue))
+    try:
+        await queue.join()
+        # once handled, the next progress of the node is queued again
+        await rabbit_message_handler(
+            FakeIncomingMessage(_progress("node_1", 0.0)), app=app
+        )
+        await queue.join()
+    finally:
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+    assert [
+        (args[1]["Node"], args[1]["Progress"])
+        for args, _ in mocked_parse.call_args_list
+    ] == [("node_1", 1.0), ("node_2", 0.3), ("node_1", 0.0)]
@@ -18,6 +18,7 @@ from servicelib.application_keys import APP_DB_ENGINE_KEY
 from simcore_postgres_database.models.comp_pipeline import StateType
 from simcore_postgres_database.models.comp_tasks import NodeClass, comp_tasks
 from simcore_service_webserver.computation_comp_tasks_listening_task import (
+    _NotificationsDispatcher,
     comp_tasks_listening_task,
 )
 from sqlalchemy.sql.elements import literal_column
@@ -36,12 +37,8 @@ async def mock_project_subsystem(mocker) -> Dict:
             "simcore_service_webserver.computation_comp_tasks_listening_task._get_project_owner",
             return_value=future_with_result(""),
         ),
-        "_update_project_state": mocker.patch(
-            "simcore_service_webserver.computation_comp_tasks_listening_task._update_project_state",
-            return_value=future_with_result(""),
-        ),
-        "_update_project_outputs": mocker.patch(
-            "simcore_service_webserver.computation_comp_tasks_listening_task._update_project_outputs",
+        "_update_project_nodes": mocker.patch(
+            "simcore_service_webserver.computation_comp_tasks_listening_task._update_project_nodes",
             return_value=future_with_result(""),
         ),
     }
@@ -51,13 +48,11 @@ async def mock_project_subsystem(mocker) -> Dict:
 async def test_mock_project_api(loop, mock_project_subsystem: Dict):
     from simcore_service_webserver.computation_comp_tasks_listening_task import (
         _get_project_owner,
-        _update_project_outputs,
-        _update_project_state,
+        _update_project_nodes,
     )
 
     assert isinstance(_get_project_owner, MagicMock)
-    assert isinstance(_update_project_state, MagicMock)
-    assert isinstance(_update_project_outputs, MagicMock)
+    assert isinstance(_update_project_nodes, MagicMock)
 
 
 @pytest.fixture
@@ -94,15 +89,15 @@ async def _wait_for_call(mock_fct):
     [
         (
             {"outputs": {"some new stuff": "it is new"}},
-            ["_get_project_owner", "_update_project_outputs"],
+            ["_get_project_owner", "_update_project_nodes"],
         ),
         (
             {"state": StateType.ABORTED},
-            ["_get_project_owner", "_update_project_state"],
+            ["_get_project_owner", "_update_project_nodes"],
         ),
         (
             {"outputs": {"some new stuff": "it is new"}, "state": StateType.ABORTED},
-            ["_get_project_owner", "_update_project_outputs", "_update_project_state"],
+            ["_get_project_owner", "_update_project_nodes"],
         ),
         (
             {"inputs": {"should not trigger": "right?"}},
@@ -140,3 +135,82 @@ async def test_listen_comp_tasks_task(
                 await _wait_for_call(mock_fct)
             else:
                 mock_fct.assert_not_called()
+
+
+async def test_notifications_dispatcher_keeps_order_per_project(loop, mocker):
+    handled: List[Dict] = []
+
+    async def _fake_handle(app, project_uuid, payloads, project_owners):
+        # slower projects shall not block the others
+        await asyncio.sleep(0.1 if project_uuid == "slow" else 0)
+        handled.extend(payloads)
+
+    mocker.patch(
+        "simcore_service_webserver.computation_comp_tasks_listening_task._handle_db_notifications",
+        side_effect=_fake_handle,
+    )
+    dispatcher = _NotificationsDispatcher(app={}, max_concurrency=2, debounce_window=0)
+    payloads = [
+        {"data": {"project_id": project_id, "node_id": f"{n}"}}
+        for n in range(5)
+        for project_id in ["slow", "fast"]
+    ]
+    for payload in payloads:
+        dispatcher.dispatch(payload)
+
+    await asyncio.sleep(1)
+    assert len(handled) == len(payloads)
+    for project_id in ["slow", "fast"]:
+        assert [p for p in handled if p["data"]["project_id"] == project_id] == [
+            p for p in payloads if p["data"]["project_id"] == project_id
+        ]
+    # the fast project was not waiting for the slow one
+    assert handled[0]["data"]["project_id"] == "fast"
+    await dispatcher.close()
+
+
+async def test_notifications_dispatcher_merges_project_notifications(loop, mocker):
+    mocked_update = mocker.patch(
+        "simcore_service_webserver.computation_comp_tasks_listening_task._update_project_nodes",
+        return_value=future_with_result(None),
+    )
+    dispatcher = _NotificationsDispatcher(app={}, debounce_window=0.1)
+    # the owner is already known
+    dispatcher._project_owners["some_project"] = 3  # pylint: disable=protected-access
+
+    NUM_NODES = 20
+    for n in range(NUM_NODES):
+        dispatcher.dispatch(
+            {
+                "data": {
+                    "project_id": "some_project",
+                    "node_id": f"node_{n}",
+                    "state": StateType.RUNNING.value,
+                    "outputs": {},
+                },
+                "changes": ["state"],
+            }
+        )
+        dispatcher.dispatch(
+            {
+                "data": {
+                    "project_id": "some_project",
+                    "node_id": f"node_{n}",
+                    "state": StateType.SUCCESS.value,
+                    "outputs": {"out_1": n},
+                },
+                "changes": ["state", "outputs"],
+            }
+        )
+
+    await asyncio.sleep(0.5)
+    # one single update for all the notifications
+    mocked_update.assert_called_once()
+    _app, user_id, project_uuid, node_states, node_outputs = mocked_update.call_args[0]
+    assert user_id == 3
+    assert project_uuid == "some_project"
+    assert node_states == {f"node_{n}": "SUCCESS" for n in range(NUM_NODES)}
+    assert node_outputs == {f"node_{n}": {"out_1": n} for n in range(NUM_NODES)}
+    assert dispatcher.num_notifications == 2 * NUM_NODES
+    assert dispatcher.num_updates == 1
+    await dispatcher.close()
@@ -129,6 +129,11 @@ async def test_redis_registry(loop, redis_registry):
     alive_keys, dead_keys = await redis_registry.get_all_resource_keys()
     assert alive_keys == [key]
     assert dead_keys == [second_key]
+    assert await redis_registry.get_resources_of_keys(alive_keys + dead_keys) == [
+        {x[0]: x[1] for x in resources},
+        {x[0]: x[1] for x in resources},
+    ]
+    assert await redis_registry.get_resources_of_keys([invalid_key]) == [{}]
 
     # clean up
     await redis_registry.remove_key(key)
@@ -164,6 +169,44 @@ async def test_redis_registry_key_will_always_expire(loop, redis_registry):
     assert len(dead_keys) == 2
 
 
+async def test_redis_registry_index(loop, redis_registry, redis_client):
+    key = {"user_id": "1", "client_session_id": "some_session"}
+    other_key = {"user_id": "2", "client_session_id": "other_session"}
+    resource = ("project_id", "some_project")
+
+    await redis_registry.set_resource(key, resource)
+    await redis_registry.set_resource(other_key, resource)
+    assert sorted(
+        await redis_registry.find_keys(resource), key=lambda k: k["user_id"]
+    ) == [key, other_key]
+
+    # overwriting a resource moves the key to the new index
+    await redis_registry.set_resource(other_key, ("project_id", "another_project"))
+    assert await redis_registry.find_keys(resource) == [key]
+    assert await redis_registry.find_keys(("project_id", "another_project")) == [
+        other_key
+    ]
+
+    await redis_registry.remove_resource(key, "project_id")
+    assert not await redis_registry.find_keys(resource)
+    await redis_registry.remove_key(other_key)
+    assert not await redis_registry.find_keys(("project_id", "another_project"))
+
+    # resources written without index (e.g. by a previous version) get indexed upon rebuild
+    # pylint: disable=protected-access
+    await redis_client.hmset_dict(
+        f"{RedisResourceRegistry._hash_key(key)}:{RESOURCE_SUFFIX}", **dict([resource])
+    )
+    await redis_client.sadd(
+        RedisResourceRegistry._index_key(("project_id", "stale_project")),
+        f"{RedisResourceRegistry._hash_key(other_key)}:{RESOURCE_SUFFIX}",
+    )
+    assert not await redis_registry.find_keys(resource)
+    await redis_registry.rebuild_index()
+    assert await redis_registry.find_keys(resource) == [key]
+    assert not await redis_registry.find_keys(("project_id", "stale_project"))
+
+
 async def test_websocket_manager(loop, redis_enabled_app, redis_registry, user_ids):
 
     # create some user ids and socket ids